@@ -0,0 +1,94 @@
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll(".driver-autocomplete").forEach(function (widget) {
+    var select = widget.querySelector("select");
+    var input = widget.querySelector("input[type=search]");
+    var chosen = widget.querySelector(".driver-autocomplete-selected");
+    var results = widget.querySelector(".driver-autocomplete-results");
+    var timer = null;
+
+    select.style.display = "none";
+
+    function renderChosen() {
+      chosen.innerHTML = "";
+      Array.from(select.options).forEach(function (option) {
+        if (!option.selected) {
+          return;
+        }
+        var item = document.createElement("li");
+        item.className = "list-inline-item badge badge-secondary p-2 mb-1";
+        item.textContent = option.textContent + " ";
+        var remove = document.createElement("a");
+        remove.href = "#";
+        remove.className = "text-white";
+        remove.textContent = "×";
+        remove.addEventListener("click", function (event) {
+          event.preventDefault();
+          option.remove();
+          renderChosen();
+        });
+        item.appendChild(remove);
+        chosen.appendChild(item);
+      });
+    }
+
+    function choose(driver) {
+      var option = select.querySelector('option[value="' + driver.id + '"]');
+      if (!option) {
+        option = new Option(driver.text, driver.id);
+        select.appendChild(option);
+      }
+      option.selected = true;
+      renderChosen();
+    }
+
+    function renderResults(data, append) {
+      if (!append) {
+        results.innerHTML = "";
+      }
+      data.results.forEach(function (driver) {
+        var item = document.createElement("li");
+        item.className = "list-group-item list-group-item-action";
+        item.textContent = driver.text;
+        item.addEventListener("click", function () {
+          choose(driver);
+        });
+        results.appendChild(item);
+      });
+      if (data.next) {
+        var more = document.createElement("li");
+        more.className = "list-group-item text-muted";
+        more.textContent = "More...";
+        more.addEventListener("click", function () {
+          more.remove();
+          search(data.next);
+        });
+        results.appendChild(more);
+      }
+    }
+
+    function search(cursor) {
+      var params = new URLSearchParams({q: input.value.trim()});
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+      fetch(widget.dataset.url + "?" + params.toString(), {credentials: "same-origin"})
+        .then(function (response) {
+          return response.json();
+        })
+        .then(function (data) {
+          renderResults(data, Boolean(cursor));
+        });
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      if (!input.value.trim()) {
+        results.innerHTML = "";
+        return;
+      }
+      timer = setTimeout(search, 250);
+    });
+
+    renderChosen();
+  });
+});
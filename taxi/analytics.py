@@ -0,0 +1,142 @@
+import itertools
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from taxi.models import Car, Driver, Manufacturer
+
+CACHE_KEY = "taxi:analytics:fleet"
+CHUNK_SIZE = 50000
+PERCENTILES = (50, 90, 99)
+HISTOGRAM_BINS = 10
+TOP_MANUFACTURERS = 10
+
+
+def analytics_timeout():
+    """Seconds a computed fleet report is served from the cache."""
+    return getattr(settings, "TAXI_ANALYTICS_TIMEOUT", 300)
+
+
+def int_columns(queryset, *fields, chunk_size=CHUNK_SIZE):
+    """Return the primary key and ``fields`` of every row as int64 columns.
+
+    Rows are read as tuples in primary key order, ``chunk_size`` at a
+    time, and packed straight into one NumPy array per chunk.
+    """
+    width = len(fields) + 1
+    queryset = queryset.order_by("pk").values_list("pk", *fields)
+    chunks = []
+    last = None
+    while True:
+        page = queryset if last is None else queryset.filter(pk__gt=last)
+        rows = list(page[:chunk_size])
+        if rows:
+            chunks.append(
+                np.fromiter(
+                    itertools.chain.from_iterable(rows),
+                    dtype=np.int64,
+                    count=len(rows) * width,
+                ).reshape(-1, width)
+            )
+            last = rows[-1][0]
+        if len(rows) < chunk_size:
+            break
+    if not chunks:
+        return tuple(np.empty((width, 0), dtype=np.int64))
+    return tuple(np.concatenate(chunks).T)
+
+
+def group_counts(keys, group_ids):
+    """Count ``keys`` per entry of sorted ``group_ids``, empty groups included.
+
+    Keys of groups that are not in ``group_ids``, such as rows deleted
+    between the reads, are left out.
+    """
+    positions = np.searchsorted(group_ids, keys)
+    found = positions < len(group_ids)
+    found[found] = group_ids[positions[found]] == keys[found]
+    return np.bincount(positions[found], minlength=len(group_ids))
+
+
+def distribution(counts):
+    """Summary statistics and a histogram of per-group counts."""
+    if not counts.size:
+        return {"groups": 0}
+    low, high = int(counts.min()), int(counts.max())
+    histogram, edges = np.histogram(
+        counts, bins=min(HISTOGRAM_BINS, high - low + 1), range=(low, high + 1)
+    )
+    return {
+        "groups": int(counts.size),
+        "total": int(counts.sum()),
+        "mean": round(float(counts.mean()), 3),
+        "min": low,
+        "max": high,
+        "percentiles": {
+            f"p{percentile}": float(value)
+            for percentile, value in zip(
+                PERCENTILES, np.percentile(counts, PERCENTILES)
+            )
+        },
+        "histogram": [
+            {"from": float(start), "to": float(end), "count": int(count)}
+            for start, end, count in zip(edges[:-1], edges[1:], histogram)
+        ],
+    }
+
+
+def fleet_report():
+    """Compute the fleet distributions from columnar reads of every table."""
+    manufacturers = list(
+        Manufacturer.objects.order_by("pk").values_list("pk", "name", "country")
+    )
+    manufacturer_ids = np.array([row[0] for row in manufacturers], dtype=np.int64)
+    car_ids, car_manufacturers = int_columns(Car.objects.all(), "manufacturer_id")
+    (driver_ids,) = int_columns(Driver.objects.all())
+    _, assigned_cars, assigned_drivers = int_columns(
+        Car.drivers.through.objects.all(), "car_id", "driver_id"
+    )
+
+    cars_per_manufacturer = group_counts(car_manufacturers, manufacturer_ids)
+    countries, country_index = np.unique(
+        np.array([row[2] for row in manufacturers], dtype=str), return_inverse=True
+    )
+    cars_per_country = np.bincount(
+        country_index, weights=cars_per_manufacturer, minlength=len(countries)
+    ).astype(np.int64)
+    top = np.argsort(-cars_per_manufacturer, kind="stable")[:TOP_MANUFACTURERS]
+
+    return {
+        "generated_at": timezone.now().isoformat(),
+        "totals": {
+            "manufacturers": len(manufacturers),
+            "cars": int(car_ids.size),
+            "drivers": int(driver_ids.size),
+            "assignments": int(assigned_cars.size),
+        },
+        "cars_per_manufacturer": distribution(cars_per_manufacturer),
+        "top_manufacturers": [
+            {"name": manufacturers[index][1], "cars": int(cars_per_manufacturer[index])}
+            for index in top
+        ],
+        "cars_per_country": sorted(
+            (
+                {"country": str(country), "cars": int(cars)}
+                for country, cars in zip(countries, cars_per_country)
+            ),
+            key=lambda row: (-row["cars"], row["country"]),
+        ),
+        "drivers_per_car": distribution(group_counts(assigned_cars, car_ids)),
+        "cars_per_driver": distribution(group_counts(assigned_drivers, driver_ids)),
+    }
+
+
+def get_fleet_report():
+    """Return the fleet report, computing it only when the cached one expired."""
+    report = cache.get(CACHE_KEY)
+    if report is None:
+        report = fleet_report()
+        cache.set(CACHE_KEY, report, analytics_timeout())
+    return report
@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.signals import m2m_changed
+
+from taxi import fragments
+from taxi.models import Car, Driver
+
+ADD = "add"
+REMOVE = "remove"
+# Pairs looked up per query of existing assignments
+BATCH_SIZE = 500
+
+
+def max_changes():
+    """Most add/remove pairs one bulk assignment request may carry."""
+    return getattr(settings, "TAXI_ASSIGNMENT_MAX_CHANGES", 10000)
+
+
+def toggle_assignment(driver, car_id):
+    """Assign ``driver`` to the car, or unassign if already assigned.
+
+    Works on the ``Car.drivers`` through table directly: the delete
+    doubles as the assignment probe and the insert ignores the conflict a
+    concurrent toggle may have created, so the number of queries does not
+    depend on how many cars the driver has. Returns ``True`` when the
+    driver ends up assigned and raises ``Car.DoesNotExist`` for unknown cars.
+    """
+    through = Car.drivers.through
+    try:
+        with transaction.atomic():
+            removed, _ = through.objects.filter(
+                car_id=car_id, driver_id=driver.id
+            ).delete()
+            if not removed:
+                if not Car.objects.filter(pk=car_id).exists():
+                    raise Car.DoesNotExist
+                through.objects.bulk_create(
+                    [through(car_id=car_id, driver_id=driver.id)],
+                    ignore_conflicts=True,
+                )
+    except IntegrityError:
+        raise Car.DoesNotExist
+
+    m2m_changed.send(
+        sender=through,
+        instance=driver,
+        action="post_remove" if removed else "post_add",
+        reverse=True,
+        model=Car,
+        pk_set={car_id},
+        using=through.objects.db,
+    )
+    return not removed
+
+
+def apply_assignments(changes):
+    """Apply many ``(action, driver_id, car_id)`` changes in one transaction.
+
+    ``action`` is ``"add"`` or ``"remove"``. Unknown drivers and cars are
+    found with one query each and existing assignments with one query per
+    ``BATCH_SIZE`` pairs; the removals are then made with one ``DELETE``
+    and the additions with one ``INSERT`` per batch. Returns one status
+    per change, in order: ``added``, ``removed``, ``unchanged`` (already
+    in the requested state), ``duplicate`` (pair already given earlier in
+    the batch), ``unknown_driver`` or ``unknown_car``.
+    """
+    changes = list(changes)
+    through = Car.drivers.through
+    statuses = [None] * len(changes)
+    with transaction.atomic():
+        known_drivers = set(
+            Driver.objects.filter(
+                pk__in={driver_id for _, driver_id, _ in changes}
+            ).order_by().values_list("pk", flat=True)
+        )
+        known_cars = set(
+            Car.objects.filter(
+                pk__in={car_id for _, _, car_id in changes}
+            ).order_by().values_list("pk", flat=True)
+        )
+
+        requested = {}
+        for position, (action, driver_id, car_id) in enumerate(changes):
+            if driver_id not in known_drivers:
+                statuses[position] = "unknown_driver"
+            elif car_id not in known_cars:
+                statuses[position] = "unknown_car"
+            elif (driver_id, car_id) in requested:
+                statuses[position] = "duplicate"
+            else:
+                requested[driver_id, car_id] = position
+
+        existing = {}
+        pairs = list(requested)
+        for start in range(0, len(pairs), BATCH_SIZE):
+            chunk = pairs[start:start + BATCH_SIZE]
+            rows = through.objects.filter(
+                driver_id__in={driver_id for driver_id, _ in chunk},
+                car_id__in={car_id for _, car_id in chunk},
+            ).values_list("pk", "driver_id", "car_id")
+            for pk, driver_id, car_id in rows:
+                if (driver_id, car_id) in requested:
+                    existing[driver_id, car_id] = pk
+
+        additions, removals = [], []
+        for pair, position in requested.items():
+            action = changes[position][0]
+            if action == ADD and pair not in existing:
+                additions.append(pair)
+                statuses[position] = "added"
+            elif action == REMOVE and pair in existing:
+                removals.append(pair)
+                statuses[position] = "removed"
+            else:
+                statuses[position] = "unchanged"
+
+        # Nothing listens to deletes of the through model, so each batch is
+        # a single DELETE rather than a fetch followed by per-row deletes.
+        for start in range(0, len(removals), BATCH_SIZE):
+            through.objects.filter(
+                pk__in=[existing[pair] for pair in removals[start:start + BATCH_SIZE]]
+            ).delete()
+        through.objects.bulk_create(
+            (
+                through(driver_id=driver_id, car_id=car_id)
+                for driver_id, car_id in additions
+            ),
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+        changed = additions + removals
+        fragments.touch("driver", {driver_id for driver_id, _ in changed})
+        fragments.touch("car", {car_id for _, car_id in changed})
+    return statuses
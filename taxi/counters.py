@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from taxi.models import Driver, Car, Manufacturer
+
+COUNTED_MODELS = {
+    "num_drivers": Driver,
+    "num_cars": Car,
+    "num_manufacturers": Manufacturer,
+}
+MODEL_COUNTERS = {model: name for name, model in COUNTED_MODELS.items()}
+
+
+def counter_key(name):
+    return f"taxi:counters:{name}"
+
+
+def counter_timeout():
+    """Seconds a cached total lives before it is recounted from the database."""
+    return getattr(settings, "TAXI_COUNTERS_TIMEOUT", 300)
+
+
+def reconcile(names=None):
+    """Recount totals from the database and store them in the cache."""
+    counts = {
+        name: COUNTED_MODELS[name].objects.count()
+        for name in (names or COUNTED_MODELS)
+    }
+    cache.set_many(
+        {counter_key(name): count for name, count in counts.items()},
+        counter_timeout(),
+    )
+    return counts
+
+
+def get_counts():
+    """Return the dashboard totals, counting only those missing from the cache."""
+    cached = cache.get_many([counter_key(name) for name in COUNTED_MODELS])
+    counts = {
+        name: cached[counter_key(name)]
+        for name in COUNTED_MODELS
+        if counter_key(name) in cached
+    }
+    missing = [name for name in COUNTED_MODELS if name not in counts]
+    if missing:
+        counts.update(reconcile(missing))
+    return counts
+
+
+def adjust(model, delta):
+    """Apply ``delta`` to the cached total of ``model`` once the transaction commits.
+
+    A total which is not cached is left alone; it is recounted on the next read.
+    """
+    name = MODEL_COUNTERS.get(model)
+    if name is None:
+        return
+
+    def apply():
+        try:
+            cache.incr(counter_key(name), delta)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
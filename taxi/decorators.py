@@ -0,0 +1,31 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.http import HttpResponseNotAllowed
+
+
+def async_login_required(view):
+    """``login_required`` for ``async def`` views.
+
+    The user is loaded in a thread, since the session and user lookups
+    go through the synchronous ORM.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        is_authenticated = await sync_to_async(
+            lambda: request.user.is_authenticated
+        )()
+        if not is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def async_require_POST(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "POST":
+            return HttpResponseNotAllowed(["POST"])
+        return await view(request, *args, **kwargs)
+    return wrapper
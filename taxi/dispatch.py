@@ -0,0 +1,373 @@
+import atexit
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import transaction
+
+from taxi.models import Driver, DriverLocation
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+LOCATION_FIELDS = ["latitude", "longitude", "is_available", "updated_at"]
+# Rows per upsert statement; keeps IN lists under SQLite's variable limit.
+BATCH_SIZE = 500
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def cell_degrees():
+    """Side of a spatial index cell in degrees; 0.01 is about 1.1 km."""
+    return getattr(settings, "TAXI_DISPATCH_CELL_DEGREES", 0.01)
+
+
+def flush_size():
+    """Buffered pings that trigger a write to the database."""
+    return getattr(settings, "TAXI_DISPATCH_FLUSH_SIZE", 500)
+
+
+def flush_seconds():
+    """Seconds a buffered ping may wait before it is written."""
+    return getattr(settings, "TAXI_DISPATCH_FLUSH_SECONDS", 2)
+
+
+def sync_seconds():
+    """Seconds between reads of the positions other processes wrote."""
+    return getattr(settings, "TAXI_DISPATCH_SYNC_SECONDS", 2)
+
+
+def stale_seconds():
+    """Seconds without a ping after which a driver is no longer dispatched."""
+    return getattr(settings, "TAXI_DISPATCH_STALE_SECONDS", 120)
+
+
+def max_km():
+    """Default search radius of ``nearest`` queries."""
+    return getattr(settings, "TAXI_DISPATCH_MAX_KM", 50)
+
+
+def parse_point(lat, lon):
+    """Return ``lat`` and ``lon`` as floats, raising ``ValueError`` if invalid."""
+    lat, lon = float(lat), float(lon)
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+        raise ValueError("Coordinates out of range")
+    return lat, lon
+
+
+def parse_available(available):
+    """Return ``available`` unchanged, raising ``ValueError`` unless a bool."""
+    if not isinstance(available, bool):
+        raise ValueError("Availability must be true or false")
+    return available
+
+
+def parse_radius(km):
+    """Return ``km`` as a float, or ``None`` if empty.
+
+    Raises ``ValueError`` unless it is a finite, positive number.
+    """
+    if not km:
+        return None
+    km = float(km)
+    if not (math.isfinite(km) and km > 0):
+        raise ValueError("Radius must be a positive number")
+    return km
+
+
+class GridIndex:
+    """Available drivers bucketed into square cells of latitude and longitude.
+
+    Pings move a driver between cells in place. ``nearest`` scans rings of
+    cells outwards from the point and stops as soon as no unscanned cell
+    can hold a driver closer than the n-th one found, so a query reads a
+    few cells rather than every driver.
+    """
+
+    def __init__(self, cell_degrees=0.01):
+        self.cell_degrees = cell_degrees
+        self._cells = {}
+        self._positions = {}
+        # Time of the latest ping per driver, kept after the driver went
+        # unavailable so older positions read back later are ignored.
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def cell(self, lat, lon):
+        return (
+            math.floor(lat / self.cell_degrees),
+            math.floor(lon / self.cell_degrees),
+        )
+
+    def apply(self, driver_id, lat, lon, available, seen):
+        """Record a position seen at ``seen`` unless a newer one is known."""
+        with self._lock:
+            if self._seen.get(driver_id, -math.inf) > seen:
+                return
+            self._seen[driver_id] = seen
+            self._discard(driver_id)
+            if available:
+                cell = self.cell(lat, lon)
+                self._cells.setdefault(cell, {})[driver_id] = (lat, lon, seen)
+                self._positions[driver_id] = cell
+
+    def prune(self, before):
+        """Drop drivers whose latest ping is older than ``before``."""
+        with self._lock:
+            for driver_id, seen in list(self._seen.items()):
+                if seen < before:
+                    del self._seen[driver_id]
+                    self._discard(driver_id)
+
+    def _discard(self, driver_id):
+        cell = self._positions.pop(driver_id, None)
+        if cell is not None:
+            bucket = self._cells[cell]
+            del bucket[driver_id]
+            if not bucket:
+                del self._cells[cell]
+
+    def nearest(self, lat, lon, n, max_km, fresh_after=-math.inf):
+        """Return up to ``n`` ``(distance km, driver id, lat, lon)``, closest first.
+
+        Drivers farther than ``max_km`` (at most 100 km) or last seen
+        before ``fresh_after`` are skipped.
+        """
+        row, col = self.cell(lat, lon)
+        # Smallest width of a cell in km anywhere within a degree of the
+        # point, where every driver within ``max_km`` lies.
+        cell_km = self.cell_degrees * KM_PER_DEGREE * math.cos(
+            math.radians(min(abs(lat) + 1, 89))
+        )
+        rings = math.ceil(max_km / cell_km) + 1
+        best = []
+
+        def visit(cell):
+            for driver_id, (d_lat, d_lon, seen) in self._cells.get(cell, {}).items():
+                if seen < fresh_after:
+                    continue
+                distance = haversine_km(lat, lon, d_lat, d_lon)
+                if distance > max_km:
+                    continue
+                entry = (-distance, driver_id, d_lat, d_lon)
+                if len(best) < n:
+                    heapq.heappush(best, entry)
+                elif entry > best[0]:
+                    heapq.heapreplace(best, entry)
+
+        with self._lock:
+            for ring in range(rings + 1):
+                # Drivers in this ring and beyond are at least this far away.
+                if len(best) == n and -best[0][0] <= (ring - 1) * cell_km:
+                    break
+                # Cells narrow towards the poles, where the rings could walk
+                # far more empty cells than are occupied; once they would,
+                # visit the occupied cells in the rows within ``max_km``.
+                if (2 * ring + 1) ** 2 > len(self._cells):
+                    best.clear()
+                    rows = math.ceil(max_km / KM_PER_DEGREE / self.cell_degrees)
+                    for cell in [c for c in self._cells if abs(c[0] - row) <= rows]:
+                        visit(cell)
+                    break
+                for cell in self._ring(row, col, ring):
+                    visit(cell)
+        return [
+            (-distance, driver_id, d_lat, d_lon)
+            for distance, driver_id, d_lat, d_lon in sorted(best, reverse=True)
+        ]
+
+    @staticmethod
+    def _ring(row, col, ring):
+        if ring == 0:
+            yield row, col
+            return
+        for offset in range(-ring, ring + 1):
+            yield row - ring, col + offset
+            yield row + ring, col + offset
+        for offset in range(-ring + 1, ring):
+            yield row + offset, col - ring
+            yield row + offset, col + ring
+
+
+class PingBuffer:
+    """Latest ping per driver waiting to be written to the database."""
+
+    def __init__(self):
+        self._pings = {}
+        self._since = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._pings)
+
+    def add(self, driver_id, lat, lon, available, seen):
+        """Buffer a ping and return the pings to write if a flush is due."""
+        with self._lock:
+            self._pings[driver_id] = (lat, lon, available, seen)
+            if self._since is None:
+                self._since = seen
+            if (
+                len(self._pings) < flush_size()
+                and seen - self._since < flush_seconds()
+            ):
+                return None
+            return self._drain()
+
+    def drain(self):
+        with self._lock:
+            return self._drain()
+
+    def drain_due(self, now):
+        """Return the buffered pings if the oldest waited ``flush_seconds()``."""
+        with self._lock:
+            if self._since is None or now - self._since < flush_seconds():
+                return None
+            return self._drain()
+
+    def _drain(self):
+        pings, self._pings, self._since = self._pings, {}, None
+        return pings
+
+
+def write_locations(pings):
+    """Upsert locations from ``{driver id: (lat, lon, available, seen)}``.
+
+    One query per batch finds which drivers exist and which already have
+    a row; rows are then updated and created in bulk. Pings of deleted
+    drivers are dropped.
+    """
+    driver_ids = list(pings)
+    written = 0
+    with transaction.atomic():
+        for start in range(0, len(driver_ids), BATCH_SIZE):
+            known = dict(
+                Driver.objects.filter(pk__in=driver_ids[start:start + BATCH_SIZE])
+                .values_list("pk", "location__driver_id")
+            )
+            updated, created = [], []
+            for driver_id, has_location in known.items():
+                lat, lon, available, seen = pings[driver_id]
+                location = DriverLocation(
+                    driver_id=driver_id,
+                    latitude=lat,
+                    longitude=lon,
+                    is_available=available,
+                    updated_at=datetime.fromtimestamp(seen, tz=timezone.utc),
+                )
+                (updated if has_location else created).append(location)
+            DriverLocation.objects.bulk_update(updated, LOCATION_FIELDS)
+            # Another process may have created the row meanwhile; its
+            # position is kept until this driver's next ping.
+            DriverLocation.objects.bulk_create(created, ignore_conflicts=True)
+            written += len(known)
+    return written
+
+
+index = GridIndex(cell_degrees())
+buffer = PingBuffer()
+_sync_lock = threading.Lock()
+_sync = {"at": None, "pruned": None}
+
+
+def reset():
+    """Empty the index and the ping buffer, e.g. after settings change."""
+    global index, buffer
+    index = GridIndex(cell_degrees())
+    buffer = PingBuffer()
+    _sync.update(at=None, pruned=None)
+
+
+def record_pings(pings):
+    """Apply ``(driver id, lat, lon, available)`` pings and buffer their writes.
+
+    The index of this process sees the pings at once; the database, and
+    through it the other processes, once the buffer is flushed. The flush
+    runs in the request that fills the buffer, in the next ``sync_index()``
+    once it is due, or at exit. Returns the rows written.
+    """
+    seen = time.time()
+    written = 0
+    for driver_id, lat, lon, available in pings:
+        index.apply(driver_id, lat, lon, available, seen)
+        due = buffer.add(driver_id, lat, lon, available, seen)
+        if due:
+            written += write_locations(due)
+    return written
+
+
+def flush_pings(force=False):
+    """Write the buffered pings if they are due, or at once with ``force``.
+
+    Pings only fill the buffer while drivers keep reporting, so reads of
+    the index flush what has waited long enough. Returns the rows written.
+    """
+    due = buffer.drain() if force else buffer.drain_due(time.time())
+    return write_locations(due) if due else 0
+
+
+@atexit.register
+def flush_at_exit():
+    flush_pings(force=True)
+
+
+def sync_index(force=False):
+    """Load positions other processes wrote since the last sync.
+
+    The first sync loads every fresh available driver. Later ones read the
+    rows updated since shortly before the previous sync; pings reach the
+    database up to ``flush_seconds()`` after they are taken, so the window
+    overlaps by that much and rows read twice are ignored by the index.
+    """
+    flush_pings()
+    now = time.time()
+    with _sync_lock:
+        last = _sync["at"]
+        if not force and last is not None and now - last < sync_seconds():
+            return
+        _sync["at"] = now
+        rows = DriverLocation.objects.filter(
+            updated_at__gte=datetime.fromtimestamp(
+                now - stale_seconds(), tz=timezone.utc
+            )
+        )
+        if last is None:
+            rows = rows.filter(is_available=True)
+        else:
+            rows = rows.filter(
+                updated_at__gte=datetime.fromtimestamp(
+                    last - flush_seconds() - 1, tz=timezone.utc
+                )
+            )
+        for driver_id, lat, lon, available, updated_at in rows.values_list(
+            "driver_id", *LOCATION_FIELDS
+        ).iterator(chunk_size=5000):
+            index.apply(driver_id, lat, lon, available, updated_at.timestamp())
+
+        if _sync["pruned"] is None or now - _sync["pruned"] >= stale_seconds():
+            _sync["pruned"] = now
+            index.prune(now - stale_seconds())
+
+
+def nearest_drivers(lat, lon, n, radius_km=None):
+    """Return up to ``n`` fresh available drivers near the point, closest first."""
+    sync_index()
+    return index.nearest(
+        lat,
+        lon,
+        n,
+        min(radius_km or max_km(), 100),
+        fresh_after=time.time() - stale_seconds(),
+    )
+
@@ -1,16 +1,76 @@
+import re
+
 from django.core.exceptions import ValidationError
 
+LICENSE_PATTERN = re.compile(r"[A-Z]{3}[0-9]{5}")
+LETTERS_PATTERN = re.compile(r"[A-Z]{3}")
+# License numbers looked up per uniqueness query
+BATCH_SIZE = 10000
+
+
+def license_error(license_number):
+    """Return why the license number breaks the rules, or ``None`` if it is valid.
+
+    Valid numbers are three ASCII uppercase letters followed by five
+    digits and pass with a single match; the reason is only worked out
+    for invalid ones.
+    """
+    if LICENSE_PATTERN.fullmatch(license_number):
+        return None
+    if len(license_number) != 8:
+        return "License number must contain exactly 8 characters"
+    if not LETTERS_PATTERN.fullmatch(license_number[:3]):
+        return "First 3 characters are uppercase letters"
+    return "Last 5 characters are digits"
+
+
+def check_license_number(license_number):
+    """Raise ``ValidationError`` unless the license number follows the rules.
+
+    This is the validator of ``Driver.license_number``, so it runs in every
+    model form of drivers, the admin included.
+    """
+    error = license_error(license_number)
+    if error:
+        raise ValidationError(error, code="invalid_license_number")
+
+
+def license_errors(license_numbers, check_taken=True, exclude_pks=()):
+    """Validate a batch of license numbers.
+
+    Returns the error message, or ``None``, for each number in turn. A
+    number repeated within the batch is valid the first time and reported
+    as repeated after that; with ``check_taken``, numbers already held by
+    drivers other than ``exclude_pks`` are reported wherever they appear.
+    Those are found with one ``IN`` query per ``BATCH_SIZE`` valid numbers.
+    """
+    license_numbers = list(license_numbers)
+    errors = []
+    seen = set()
+    for license_number in license_numbers:
+        error = license_error(license_number)
+        if error is None and license_number in seen:
+            error = "License number is repeated"
+        seen.add(license_number)
+        errors.append(error)
+
+    if check_taken:
+        from taxi.models import Driver
 
-def license_validation(func):
-    def inner(*args):
-        license_number = func(args[0])
-        letter = license_number[:3]
-        number = license_number[3:]
-        if len(license_number) != 8:
-            raise ValidationError("License number must contain exactly 8 characters")
-        if not letter.isupper() or not letter.isalpha():
-            raise ValidationError("First 3 characters are uppercase letters")
-        if not "".join(number).isdigit():
-            raise ValidationError("Last 5 characters are digits")
-        return license_number
-    return inner
+        valid = list({
+            license_number
+            for license_number, error in zip(license_numbers, errors)
+            if error is None
+        })
+        taken = set()
+        for start in range(0, len(valid), BATCH_SIZE):
+            taken.update(
+                Driver.objects.filter(license_number__in=valid[start:start + BATCH_SIZE])
+                .exclude(pk__in=exclude_pks)
+                .values_list("license_number", flat=True)
+            )
+        errors = [
+            "License number is taken" if license_number in taken else error
+            for license_number, error in zip(license_numbers, errors)
+        ]
+    return errors
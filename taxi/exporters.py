@@ -0,0 +1,81 @@
+import csv
+import json
+from collections import defaultdict
+
+from taxi.importers import chunked
+from taxi.models import Manufacturer, Car, Driver
+
+FORMATS = ("csv", "jsonl")
+
+
+def manufacturer_rows(chunk_size):
+    return Manufacturer.objects.order_by("pk").values(
+        "id", "name", "country"
+    ).iterator(chunk_size=chunk_size)
+
+
+def driver_rows(chunk_size):
+    return Driver.objects.order_by("pk").values(
+        "id", "username", "first_name", "last_name", "email", "license_number"
+    ).iterator(chunk_size=chunk_size)
+
+
+def car_rows(chunk_size):
+    """Yield cars with their manufacturer name and driver usernames.
+
+    Assignments are fetched with one query per chunk of cars, since
+    ``prefetch_related`` is ignored by ``iterator()``.
+    """
+    cars = Car.objects.order_by("pk").values(
+        "id", "model", "manufacturer__name"
+    ).iterator(chunk_size=chunk_size)
+    for chunk in chunked(cars, chunk_size):
+        drivers = defaultdict(list)
+        for car_id, username in Car.drivers.through.objects.filter(
+            car_id__in=[car["id"] for car in chunk]
+        ).order_by("car_id", "driver_id").values_list("car_id", "driver__username"):
+            drivers[car_id].append(username)
+        for car in chunk:
+            yield {
+                "id": car["id"],
+                "model": car["model"],
+                "manufacturer": car["manufacturer__name"],
+                "drivers": drivers[car["id"]],
+            }
+
+
+EXPORTS = {
+    "manufacturers": (manufacturer_rows, ("id", "name", "country")),
+    "drivers": (
+        driver_rows,
+        ("id", "username", "first_name", "last_name", "email", "license_number"),
+    ),
+    "cars": (car_rows, ("id", "model", "manufacturer", "drivers")),
+}
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def stream_export(kind, fmt, chunk_size=2000):
+    """Yield the export of ``kind`` as ``fmt`` one line at a time.
+
+    In CSV the drivers of a car are joined with ``;``, the format
+    ``import_fleet`` reads back.
+    """
+    rows, columns = EXPORTS[kind]
+    if fmt == "jsonl":
+        for row in rows(chunk_size):
+            yield json.dumps(row) + "\n"
+        return
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows(chunk_size):
+        if "drivers" in row:
+            row["drivers"] = ";".join(row["drivers"])
+        yield writer.writerow([row[column] for column in columns])
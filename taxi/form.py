@@ -1,15 +1,15 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 from django import forms
+from django.urls import reverse
+from django.utils.html import format_html
 
-from taxi.expansion import license_validation
 from taxi.models import Driver, Car
 
 
 class DriverCreationForm(UserCreationForm):
     license_number = forms.CharField(
         max_length=8,
-        required=False,
         help_text="<li>License number must contain exactly 8 characters</li>"
                   "<li>First 3 characters are uppercase letters</li>"
                   "<li>Last 5 characters are digits</li>",
@@ -23,11 +23,6 @@ class DriverCreationForm(UserCreationForm):
             "license_number",
         )
 
-    @license_validation
-    def clean_license_number(self):
-        license_number = self.cleaned_data["license_number"]
-        return license_number
-
 
 class DriverLicenseUpdateForm(forms.ModelForm):
 
@@ -35,16 +30,46 @@ class DriverLicenseUpdateForm(forms.ModelForm):
         model = Driver
         fields = ("license_number",)
 
-    @license_validation
-    def clean_license_number(self):
-        license_number = self.cleaned_data["license_number"]
-        return license_number
+
+class DriverAutocompleteWidget(forms.SelectMultiple):
+    """Multiple select which only renders the selected drivers.
+
+    Further drivers are looked up as the user types through the
+    ``taxi:driver-search`` JSON endpoint, so rendering the form no longer
+    loads every driver in the system.
+    """
+
+    class Media:
+        js = ("js/driver_autocomplete.js",)
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [pk for pk in value if str(pk).isdigit()]
+        choices = self.choices
+        self.choices = [
+            (driver.pk, str(driver))
+            for driver in choices.queryset.filter(pk__in=selected)
+        ]
+        try:
+            return super().optgroups(name, value, attrs)
+        finally:
+            self.choices = choices
+
+    def render(self, name, value, attrs=None, renderer=None):
+        return format_html(
+            '<div class="driver-autocomplete" data-url="{}">{}'
+            '<ul class="list-inline driver-autocomplete-selected"></ul>'
+            '<input type="search" class="form-control" autocomplete="off" '
+            'placeholder="Search drivers by username or license number..">'
+            '<ul class="list-group driver-autocomplete-results"></ul></div>',
+            reverse("taxi:driver-search"),
+            super().render(name, value, attrs, renderer),
+        )
 
 
 class CarForm(forms.ModelForm):
     drivers = forms.ModelMultipleChoiceField(
         queryset=get_user_model().objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+        widget=DriverAutocompleteWidget,
         required=False
     )
 
@@ -0,0 +1,63 @@
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+HITS_KEY = "taxi:fragments:hits"
+MISSES_KEY = "taxi:fragments:misses"
+
+
+def version_key(model_name, pk):
+    return f"taxi:fragments:version:{model_name}:{pk}"
+
+
+def fragment_timeout():
+    return getattr(settings, "TAXI_FRAGMENT_CACHE_TIMEOUT", 600)
+
+
+def get_version(model_name, pk):
+    """Return the current cache version of an object, creating one if needed.
+
+    Versions are random tokens rather than counters, so a version lost
+    from the cache can never bring back fragments cached under it.
+    """
+    key = version_key(model_name, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def touch(model_name, pks):
+    """Invalidate the cached fragments of the given objects after commit."""
+    keys = [version_key(model_name, pk) for pk in pks]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def fragment_key(name, obj):
+    model_name = obj._meta.model_name
+    return (
+        f"taxi:fragments:{name}:{model_name}:{obj.pk}:"
+        f"{get_version(model_name, obj.pk)}"
+    )
+
+
+def record(hit):
+    key = HITS_KEY if hit else MISSES_KEY
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def stats():
+    """Return the fragment cache hit and miss counts."""
+    counts = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {
+        "hits": counts.get(HITS_KEY, 0),
+        "misses": counts.get(MISSES_KEY, 0),
+    }
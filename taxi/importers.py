@@ -0,0 +1,191 @@
+import csv
+import json
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from taxi import fragments
+from taxi.expansion import license_errors
+from taxi.models import Manufacturer, Car, Driver
+from taxi.search import get_search_backend
+
+
+class RowError(Exception):
+    pass
+
+
+def read_rows(path):
+    """Stream rows of a CSV or JSON Lines file as dicts, one at a time."""
+    with open(path, newline="", encoding="utf-8") as source:
+        if str(path).endswith((".jsonl", ".ndjson")):
+            for line in source:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(source)
+
+
+def field(row, name):
+    return str(row.get(name) or "").strip()
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class FleetImporter:
+    """Validates and bulk inserts one chunk of rows at a time.
+
+    ``import_chunk`` returns the created objects and a list of
+    ``(row index in chunk, message)`` for the rows which were skipped.
+    """
+    model = None
+
+    def import_chunk(self, rows):
+        objects, errors = [], []
+        for index, row in enumerate(self.prepare(rows)):
+            if isinstance(row, RowError):
+                errors.append((index, str(row)))
+            else:
+                objects.append(row)
+        with transaction.atomic():
+            created = self.model.objects.bulk_create(objects)
+            self.after_create(created)
+        return created, errors
+
+    def prepare(self, rows):
+        raise NotImplementedError
+
+    def after_create(self, created):
+        pass
+
+
+class ManufacturerImporter(FleetImporter):
+    model = Manufacturer
+
+    def prepare(self, rows):
+        names = [field(row, "name") for row in rows]
+        existing = set(
+            Manufacturer.objects.filter(name__in=names).values_list("name", flat=True)
+        )
+        for name, row in zip(names, rows):
+            if not name:
+                yield RowError("Manufacturer name is required")
+            elif name in existing:
+                yield RowError(f"Manufacturer {name!r} already exists")
+            else:
+                existing.add(name)
+                yield Manufacturer(name=name, country=field(row, "country"))
+
+
+class DriverImporter(FleetImporter):
+    """Drivers without a ``password`` column get an unusable password;
+    identical passwords are hashed once per import."""
+    model = Driver
+
+    def __init__(self):
+        self.hashes = {None: make_password(None)}
+
+    def password_hash(self, password):
+        password = password or None
+        if password not in self.hashes:
+            self.hashes[password] = make_password(password)
+        return self.hashes[password]
+
+    def prepare(self, rows):
+        usernames = [field(row, "username") for row in rows]
+        licenses = [field(row, "license_number") for row in rows]
+        invalid = license_errors(licenses)
+        taken_usernames = set(
+            Driver.objects.filter(username__in=usernames).values_list("username", flat=True)
+        )
+        for username, license_number, error, row in zip(
+            usernames, licenses, invalid, rows
+        ):
+            if not username:
+                yield RowError("Username is required")
+            elif username in taken_usernames:
+                yield RowError(f"Username {username!r} is taken")
+            elif error:
+                yield RowError(f"{license_number!r}: {error}")
+            else:
+                taken_usernames.add(username)
+                yield Driver(
+                    username=username,
+                    license_number=license_number,
+                    first_name=field(row, "first_name"),
+                    last_name=field(row, "last_name"),
+                    email=field(row, "email"),
+                    password=self.password_hash(row.get("password")),
+                )
+
+
+class CarImporter(FleetImporter):
+    """Cars reference their manufacturer by name and their drivers by
+    username (a list in JSON Lines, ``;`` separated in CSV)."""
+    model = Car
+
+    def __init__(self):
+        self.manufacturers = dict(Manufacturer.objects.values_list("name", "id"))
+        self.assignments = {}
+
+    @staticmethod
+    def usernames(row):
+        drivers = row.get("drivers") or []
+        if isinstance(drivers, str):
+            drivers = drivers.split(";")
+        return [username.strip() for username in drivers if username.strip()]
+
+    def prepare(self, rows):
+        driver_ids = dict(
+            Driver.objects.filter(
+                username__in={name for row in rows for name in self.usernames(row)}
+            ).values_list("username", "id")
+        )
+        self.assignments = {}
+        for row in rows:
+            model = field(row, "model")
+            manufacturer_id = self.manufacturers.get(field(row, "manufacturer"))
+            usernames = self.usernames(row)
+            unknown = [name for name in usernames if name not in driver_ids]
+            if not model:
+                yield RowError("Car model is required")
+            elif manufacturer_id is None:
+                yield RowError(f"Unknown manufacturer {row.get('manufacturer')!r}")
+            elif unknown:
+                yield RowError(f"Unknown drivers {', '.join(unknown)}")
+            else:
+                car = Car(model=model, manufacturer_id=manufacturer_id)
+                self.assignments[id(car)] = {driver_ids[name] for name in usernames}
+                yield car
+
+    def after_create(self, created):
+        through = Car.drivers.through
+        through.objects.bulk_create(
+            through(car_id=car.id, driver_id=driver_id)
+            for car in created
+            for driver_id in self.assignments[id(car)]
+        )
+        # bulk_create sends no m2m_changed, so the drivers' cached pages
+        # are invalidated here
+        fragments.touch("driver", set().union(
+            *(self.assignments[id(car)] for car in created)
+        ))
+        get_search_backend().index(
+            Car.objects.filter(
+                pk__in=[car.pk for car in created]
+            ).select_related("manufacturer")
+        )
+
+
+IMPORTERS = {
+    "manufacturers": ManufacturerImporter,
+    "drivers": DriverImporter,
+    "cars": CarImporter,
+}
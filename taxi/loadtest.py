@@ -0,0 +1,165 @@
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from django.contrib.auth import get_user_model
+from django.test import Client
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(int(len(sorted_values) * fraction), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def session_cookies(username="loadtest"):
+    """Return cookies of a logged-in session for a dedicated load test user.
+
+    The ``csrftoken`` cookie is fixed so POST requests can echo it in the
+    ``X-CSRFToken`` header.
+    """
+    user, _ = get_user_model().objects.get_or_create(
+        username=username, defaults={"license_number": "LOD00000"}
+    )
+    client = Client()
+    client.force_login(user)
+    return {
+        "sessionid": client.cookies["sessionid"].value,
+        "csrftoken": "loadtest" * 4,
+    }
+
+
+def run_load(
+    base_url, paths, total, concurrency, cookies=None, method="GET", json_body=None
+):
+    """Send ``total`` requests over ``concurrency`` keep-alive connections.
+
+    ``paths`` are requested round-robin, with ``json_body`` serialized as
+    the body when given. Returns throughput and latency percentiles in
+    milliseconds.
+    """
+    url = urlsplit(base_url)
+    headers = {}
+    body = None
+    if json_body is not None:
+        body = json.dumps(json_body).encode()
+        headers["Content-Type"] = "application/json"
+    if cookies:
+        headers["Cookie"] = "; ".join(f"{key}={value}" for key, value in cookies.items())
+        if "csrftoken" in cookies:
+            headers["X-CSRFToken"] = cookies["csrftoken"]
+            headers["Referer"] = base_url
+
+    latencies = []
+    errors = []
+    counter = iter(range(total))
+    lock = threading.Lock()
+
+    def worker():
+        connection = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+        while True:
+            with lock:
+                num = next(counter, None)
+            if num is None:
+                break
+            path = paths[num % len(paths)]
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                connection = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+                status = repr(error)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not isinstance(status, int) or status >= 400:
+                    errors.append(status)
+        connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "requests_per_second": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """Run a server command in a subprocess for the duration of a ``with`` block."""
+
+    def __init__(self, args, port, env=None):
+        self.args = args
+        self.port = port
+        self.env = {**os.environ, **(env or {})}
+        self.process = None
+
+    def __enter__(self):
+        self.process = subprocess.Popen(
+            self.args,
+            env=self.env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            try:
+                with socket.create_connection(("127.0.0.1", self.port), timeout=1):
+                    return self
+            except OSError:
+                if self.process.poll() is not None:
+                    break
+                time.sleep(0.2)
+        self.__exit__(None, None, None)
+        raise RuntimeError(f"Server {' '.join(self.args)} did not start")
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}"
+
+
+def gunicorn(application, port, workers, worker_class=None, threads=1):
+    """Gunicorn serving ``application`` with ``DEBUG`` off, as in production."""
+    args = [
+        sys.executable, "-m", "gunicorn", application,
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+        "--threads", str(threads),
+    ]
+    if worker_class:
+        args += ["--worker-class", worker_class]
+    return Server(args, port, env={"DJANGO_DEBUG": "False"})
@@ -0,0 +1,177 @@
+import random
+import time
+from collections import Counter
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from taxi.analytics import (
+    CHUNK_SIZE,
+    PERCENTILES,
+    distribution,
+    fleet_report,
+    group_counts,
+)
+from taxi.models import Car, Driver, Manufacturer
+from taxi.synthetic import seed_fleet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the NumPy fleet report with per-row Python loops and "
+        "per-group ORM queries on a synthetic fleet. Data is rolled back "
+        "afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assignments", type=int, default=1000000)
+        parser.add_argument("--drivers-per-car", type=int, default=3)
+        parser.add_argument(
+            "--sample",
+            type=int,
+            default=1000,
+            help="Cars and drivers queried one by one, extrapolated to all",
+        )
+
+    def handle(self, *args, **options):
+        cars = options["assignments"] // options["drivers_per_car"]
+        with transaction.atomic():
+            start = time.perf_counter()
+            seed_fleet(
+                manufacturers=max(cars // 1000, 10),
+                cars=cars,
+                drivers=max(cars // 10, 10),
+                drivers_per_car=options["drivers_per_car"],
+            )
+            self.stderr.write(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+            start = time.perf_counter()
+            report = fleet_report()
+            numpy_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loops = self.python_report()
+            loop_seconds = time.perf_counter() - start
+
+            orm_seconds = self.per_group_queries(options["sample"])
+            numpy_compute, loop_compute = self.in_memory()
+            transaction.set_rollback(True)
+
+        for name, stats in loops.items():
+            expected = {key: report[name][key] for key in stats}
+            if stats != expected:
+                self.stderr.write(f"{name} differs: {stats} != {expected}")
+
+        totals = report["totals"]
+        self.stdout.write(
+            f"{totals['assignments']} assignments, {totals['cars']} cars, "
+            f"{totals['drivers']} drivers, {totals['manufacturers']} manufacturers"
+        )
+        self.stdout.write(f"{'NumPy columns':<28} {numpy_seconds:>9.2f}s")
+        self.stdout.write(f"{'per-row Python loops':<28} {loop_seconds:>9.2f}s")
+        self.stdout.write(
+            f"{'per-group ORM queries':<28} {orm_seconds:>9.2f}s (extrapolated)"
+        )
+        self.stdout.write("Assignment distributions from rows already in memory:")
+        self.stdout.write(f"{'NumPy':<28} {numpy_compute:>9.3f}s")
+        self.stdout.write(f"{'Python loops':<28} {loop_compute:>9.3f}s")
+
+    def python_report(self):
+        """The distributions of ``fleet_report``, counted row by row in Python."""
+        manufacturer_country = dict(
+            Manufacturer.objects.values_list("pk", "country")
+        )
+        cars_per_manufacturer = Counter({pk: 0 for pk in manufacturer_country})
+        drivers_per_car = Counter()
+        for car_id, manufacturer_id in (
+            Car.objects.order_by().values_list("pk", "manufacturer_id")
+            .iterator(chunk_size=CHUNK_SIZE)
+        ):
+            cars_per_manufacturer[manufacturer_id] += 1
+            drivers_per_car[car_id] = 0
+        cars_per_country = Counter()
+        for manufacturer_id, cars in cars_per_manufacturer.items():
+            cars_per_country[manufacturer_country[manufacturer_id]] += cars
+
+        cars_per_driver = Counter(
+            {pk: 0 for pk in Driver.objects.values_list("pk", flat=True).iterator()}
+        )
+        for car_id, driver_id in (
+            Car.drivers.through.objects.values_list("car_id", "driver_id")
+            .iterator(chunk_size=CHUNK_SIZE)
+        ):
+            drivers_per_car[car_id] += 1
+            cars_per_driver[driver_id] += 1
+
+        return {
+            "cars_per_manufacturer": self.summary(cars_per_manufacturer.values()),
+            "drivers_per_car": self.summary(drivers_per_car.values()),
+            "cars_per_driver": self.summary(cars_per_driver.values()),
+        }
+
+    def in_memory(self):
+        """Time drivers per car and cars per driver without the reads."""
+        car_ids = sorted(Car.objects.values_list("pk", flat=True))
+        driver_ids = sorted(Driver.objects.values_list("pk", flat=True))
+        pairs = list(Car.drivers.through.objects.values_list("car_id", "driver_id"))
+        columns = np.array(pairs, dtype=np.int64).T
+        car_array = np.array(car_ids, dtype=np.int64)
+        driver_array = np.array(driver_ids, dtype=np.int64)
+
+        start = time.perf_counter()
+        distribution(group_counts(columns[0], car_array))
+        distribution(group_counts(columns[1], driver_array))
+        numpy_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        drivers_per_car = Counter({pk: 0 for pk in car_ids})
+        cars_per_driver = Counter({pk: 0 for pk in driver_ids})
+        for car_id, driver_id in pairs:
+            drivers_per_car[car_id] += 1
+            cars_per_driver[driver_id] += 1
+        self.summary(drivers_per_car.values())
+        self.summary(cars_per_driver.values())
+        return numpy_seconds, time.perf_counter() - start
+
+    @staticmethod
+    def summary(counts):
+        values = sorted(counts)
+        last = len(values) - 1
+
+        def percentile(fraction):
+            rank = last * fraction
+            low = int(rank)
+            high = min(low + 1, last)
+            return values[low] + (values[high] - values[low]) * (rank - low)
+
+        return {
+            "groups": len(values),
+            "total": sum(values),
+            "min": values[0],
+            "max": values[-1],
+            "mean": round(sum(values) / len(values), 3),
+            "percentiles": {
+                f"p{value}": float(percentile(value / 100)) for value in PERCENTILES
+            },
+        }
+
+    @staticmethod
+    def per_group_queries(sample):
+        """Time one count query per group, extrapolating cars and drivers."""
+        start = time.perf_counter()
+        for manufacturer in Manufacturer.objects.all():
+            Car.objects.filter(manufacturer=manufacturer).count()
+        for country in Manufacturer.objects.values_list("country", flat=True).distinct():
+            Car.objects.filter(manufacturer__country=country).count()
+        seconds = time.perf_counter() - start
+
+        rng = random.Random(0)
+        for model, related in ((Car, "drivers"), (Driver, "cars")):
+            pks = list(model.objects.values_list("pk", flat=True))
+            chosen = rng.sample(pks, min(sample, len(pks)))
+            start = time.perf_counter()
+            for obj in model.objects.filter(pk__in=chosen):
+                getattr(obj, related).count()
+            seconds += (time.perf_counter() - start) * len(pks) / len(chosen)
+        return seconds
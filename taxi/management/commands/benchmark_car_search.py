@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from taxi.models import Car
+from taxi.search import IcontainsSearchBackend, get_search_backend
+from taxi.synthetic import seed_fleet
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the configured car search backend with the plain "
+        "icontains scan on synthetic fleets. Data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", nargs="+", type=int, default=[10000, 100000, 1000000]
+        )
+        parser.add_argument(
+            "--queries", nargs="+", default=["cam", "golf 12", "model s", "qqq"]
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--page-size", type=int, default=20)
+
+    def handle(self, *args, **options):
+        baseline = IcontainsSearchBackend()
+        backend = get_search_backend()
+        self.stdout.write(
+            f"{'cars':>9} {'query':>10} {'icontains ms':>13} "
+            f"{backend.__class__.__name__ + ' ms':>24}"
+        )
+        for size in options["sizes"]:
+            with transaction.atomic():
+                seed_fleet(
+                    manufacturers=max(size // 1000, 10),
+                    cars=size,
+                    drivers=0,
+                    drivers_per_car=0,
+                )
+                backend.rebuild()
+                for query in options["queries"]:
+                    baseline_ms = self.measure(baseline, query, options)
+                    backend_ms = self.measure(backend, query, options)
+                    self.stdout.write(
+                        f"{size:>9} {query:>10} {baseline_ms:>13.2f} "
+                        f"{backend_ms:>24.2f}"
+                    )
+                transaction.set_rollback(True)
+
+    @staticmethod
+    def measure(backend, query, options):
+        queryset = Car.objects.select_related("manufacturer")
+        timings = []
+        for _ in range(options["repeat"]):
+            start = time.perf_counter()
+            results = backend.search(queryset, query)
+            results.count()
+            list(results[:options["page_size"]])
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
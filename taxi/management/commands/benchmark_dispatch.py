@@ -0,0 +1,110 @@
+import heapq
+import random
+import time
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from taxi import dispatch
+from taxi.loadtest import percentile
+from taxi.models import Driver, DriverLocation
+from taxi.synthetic import seed_fleet
+
+CENTER = (50.45, 30.52)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed available drivers around a city and compare nearest driver "
+        "queries on the dispatch grid index with a full-table distance "
+        "scan. Data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[10000, 100000])
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--n", type=int, default=10)
+        parser.add_argument(
+            "--spread-km",
+            type=float,
+            default=20,
+            help="Drivers are placed uniformly within this distance of the center",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'drivers':>8} {'pings/s':>9} {'load ms':>8} {'scan p50':>9} "
+            f"{'grid p50':>9} {'grid p99':>9} {'same':>6}"
+        )
+        rng = random.Random(0)
+        for size in options["sizes"]:
+            with transaction.atomic():
+                seed_fleet(
+                    manufacturers=10, cars=size // 2, drivers=size, drivers_per_car=2
+                )
+                pings = [
+                    (driver_id, *self.point(rng, options["spread_km"]), True)
+                    for driver_id in Driver.objects.values_list("pk", flat=True)
+                ]
+
+                dispatch.reset()
+                start = time.perf_counter()
+                dispatch.record_pings(pings)
+                dispatch.write_locations(dispatch.buffer.drain())
+                pings_per_second = len(pings) / (time.perf_counter() - start)
+
+                dispatch.reset()
+                start = time.perf_counter()
+                dispatch.sync_index(force=True)
+                load_ms = (time.perf_counter() - start) * 1000
+
+                scan, grid, same = [], [], 0
+                fresh_after = time.time() - dispatch.stale_seconds()
+                for _ in range(options["queries"]):
+                    lat, lon = self.point(rng, options["spread_km"])
+                    start = time.perf_counter()
+                    expected = self.full_scan(lat, lon, options["n"], fresh_after)
+                    scan.append(time.perf_counter() - start)
+                    start = time.perf_counter()
+                    found = dispatch.index.nearest(
+                        lat, lon, options["n"], dispatch.max_km(), fresh_after
+                    )
+                    grid.append(time.perf_counter() - start)
+                    same += [driver_id for _, driver_id in expected] == [
+                        driver_id for _, driver_id, _, _ in found
+                    ]
+                scan.sort()
+                grid.sort()
+                self.stdout.write(
+                    f"{size:>8} {pings_per_second:>9.0f} {load_ms:>8.1f} "
+                    f"{percentile(scan, 0.5) * 1000:>9.2f} "
+                    f"{percentile(grid, 0.5) * 1000:>9.3f} "
+                    f"{percentile(grid, 0.99) * 1000:>9.3f} "
+                    f"{same / options['queries']:>6.0%}"
+                )
+                transaction.set_rollback(True)
+        dispatch.reset()
+
+    @staticmethod
+    def point(rng, spread_km):
+        degrees = spread_km / dispatch.KM_PER_DEGREE
+        return (
+            CENTER[0] + rng.uniform(-degrees, degrees),
+            CENTER[1] + rng.uniform(-degrees, degrees) * 1.5,
+        )
+
+    @staticmethod
+    def full_scan(lat, lon, n, fresh_after):
+        """Distance to every fresh available driver in the table."""
+        rows = DriverLocation.objects.filter(
+            is_available=True,
+            updated_at__gte=datetime.fromtimestamp(fresh_after, tz=timezone.utc),
+        ).values_list("driver_id", "latitude", "longitude")
+        return heapq.nsmallest(
+            n,
+            (
+                (dispatch.haversine_km(lat, lon, d_lat, d_lon), driver_id)
+                for driver_id, d_lat, d_lon in rows
+            ),
+        )
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from taxi.loadtest import percentile
+from taxi_service.db.pool import ConnectionPool
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure connection-acquire latency with a fresh connection per "
+        "checkout and with a bounded pool, from concurrent threads."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--pool-size", type=int)
+
+    def handle(self, *args, **options):
+        wrapper = connections[options["database"]]
+        params = wrapper.get_connection_params()
+
+        def connect():
+            return wrapper.Database.connect(**params)
+
+        pool_size = options["pool_size"] or wrapper.settings_dict.get(
+            "POOL", {}
+        ).get("MAX_SIZE", 10)
+        pool = ConnectionPool(max_size=pool_size, timeout=60)
+
+        strategies = {
+            "direct": (connect, lambda connection: connection.close()),
+            "pool": (lambda: pool.acquire(connect), pool.release),
+        }
+        self.stdout.write(
+            f"{'strategy':>8} {'threads':>7} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'max ms':>8} {'checkouts/s':>12}"
+        )
+        for name, (acquire, release) in strategies.items():
+            timings, duration = self.run(acquire, release, options)
+            self.stdout.write(
+                f"{name:>8} {options['threads']:>7} "
+                f"{percentile(timings, 0.50) * 1000:>8.3f} "
+                f"{percentile(timings, 0.95) * 1000:>8.3f} "
+                f"{percentile(timings, 0.99) * 1000:>8.3f} "
+                f"{timings[-1] * 1000:>8.3f} "
+                f"{len(timings) / duration:>12.0f}"
+            )
+        stats = pool.stats()
+        pool.close_all()
+        self.stdout.write(
+            f"pool: size {stats['size']}/{stats['max_size']}, "
+            f"{stats['created']} connections opened, "
+            f"{stats['waits']} of {stats['acquired']} checkouts waited, "
+            f"longest wait {stats['wait_seconds_max'] * 1000:.3f} ms"
+        )
+
+    @staticmethod
+    def run(acquire, release, options):
+        timings = []
+        lock = threading.Lock()
+
+        def worker():
+            local = []
+            for _ in range(options["iterations"]):
+                start = time.perf_counter()
+                connection = acquire()
+                local.append(time.perf_counter() - start)
+                cursor = connection.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+                cursor.close()
+                release(connection)
+            with lock:
+                timings.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(options["threads"])]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start
+        timings.sort()
+        return timings, duration
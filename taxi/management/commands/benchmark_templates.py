@@ -0,0 +1,127 @@
+import time
+
+from crispy_forms.templatetags.crispy_forms_filters import as_crispy_form
+from django.core.management.base import BaseCommand
+from django.template import Context, Engine, engines
+from django.template.loader import get_template
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from taxi.form import CarSearchForm
+from taxi.models import Car, Driver, Manufacturer
+from taxi.templatetags.form_cache import cached_crispy
+from taxi.warmup import template_names
+
+LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare loading every template with the plain and the cached "
+        "loaders, rendering CarSearchForm with |crispy and |cached_crispy, "
+        "and rendering a car list page with {% url %} and the memoized "
+        "{% cached_url %} and sidebar navigation."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=50)
+        parser.add_argument("--rows", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        names = list(template_names())
+
+        self.stdout.write(f"{'':<34} {'before ms':>10} {'after ms':>10}")
+        uncached = self.engine(LOADERS)
+        cached = self.engine([("django.template.loaders.cached.Loader", LOADERS)])
+        for name in names:
+            cached.get_template(name)
+        self.report(
+            f"load {len(names)} templates",
+            self.measure(lambda: [uncached.get_template(name) for name in names], repeat),
+            self.measure(lambda: [cached.get_template(name) for name in names], repeat),
+        )
+
+        form = CarSearchForm(initial={"model": "golf"})
+        with override_settings(DEBUG=False):
+            cached_crispy(form)
+            self.report(
+                "render CarSearchForm",
+                self.measure(lambda: as_crispy_form(form), repeat),
+                self.measure(lambda: cached_crispy(form), repeat),
+            )
+
+            before, after = self.list_page_engines()
+            context = self.list_page_context(options["rows"])
+            page = "taxi/car_list.html"
+            self.report(
+                f"render car list, {options['rows']} rows",
+                self.measure(lambda: before.get_template(page).render(context), repeat),
+                self.measure(lambda: after.get_template(page).render(context), repeat),
+            )
+
+    def list_page_engines(self):
+        """Cached engines for the page as it is, and with plain ``{% url %}``.
+
+        The "before" engine serves the car list and sidebar with every
+        link reversed per row and per request.
+        """
+        navigation = get_template("includes/navigation.html").template.source
+        originals = {
+            name: get_template(name).template.source
+            .replace("{% cached_url ", "{% url ")
+            .replace("{% navigation %}", navigation)
+            for name in ("taxi/car_list.html", "includes/sidebar.html")
+        }
+        cached = ("django.template.loaders.cached.Loader", LOADERS)
+        before = self.engine([
+            ("django.template.loaders.cached.Loader", [
+                ("django.template.loaders.locmem.Loader", originals), *LOADERS
+            ]),
+        ])
+        return before, self.engine([cached])
+
+    @staticmethod
+    def list_page_context(rows):
+        request = RequestFactory().get("/cars/")
+        request.user = Driver(id=1, username="benchmark")
+        manufacturer = Manufacturer(id=1, name="Toyota", country="Japan")
+        return Context({
+            "request": request,
+            "user": request.user,
+            "car_list": [
+                Car(id=num, model=f"Corolla {num}", manufacturer=manufacturer)
+                for num in range(1, rows + 1)
+            ],
+            "search_form": CarSearchForm(initial={"model": ""}),
+        })
+
+    @staticmethod
+    def engine(loaders):
+        base = engines["django"].engine
+        return Engine(
+            dirs=base.dirs,
+            loaders=loaders,
+            context_processors=base.context_processors,
+            libraries=base.libraries,
+            builtins=[
+                builtin for builtin in base.builtins
+                if builtin not in Engine.default_builtins
+            ],
+        )
+
+    @staticmethod
+    def measure(function, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        return timings[len(timings) // 2] * 1000
+
+    def report(self, label, before, after):
+        self.stdout.write(f"{label:<34} {before:>10.3f} {after:>10.3f}")
@@ -0,0 +1,246 @@
+import argparse
+import json
+import os
+import platform
+import secrets
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlsplit
+from urllib.request import Request, urlopen
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from taxi.counters import reconcile
+from taxi.loadtest import free_port, gunicorn, run_load, session_cookies
+from taxi.models import Car, Driver, Manufacturer
+from taxi.perf import parse_prometheus
+from taxi.search import get_search_backend
+from taxi.synthetic import seed_fleet
+from taxi.urls import urlpatterns
+
+# url name: (HTTP method, object the pk comes from or url kwargs, query string,
+# optional JSON body)
+ROUTES = {
+    "index": ("GET", None, ""),
+    "manufacturer-list": ("GET", None, ""),
+    "manufacturer-create": ("GET", None, ""),
+    "manufacturer-update": ("GET", "manufacturer", ""),
+    "manufacturer-delete": ("GET", "manufacturer", ""),
+    "car-list": ("GET", None, "?model=golf"),
+    "car-detail": ("GET", "car", ""),
+    "car-create": ("GET", None, ""),
+    "car-update": ("GET", "car", ""),
+    "car-delete": ("GET", "car", ""),
+    "driver-list": ("GET", None, ""),
+    "driver-search": ("GET", None, "?q=driver_1"),
+    "driver-detail": ("GET", "driver", ""),
+    "driver-create": ("GET", None, ""),
+    "driver-license": ("GET", "driver", ""),
+    "driver-delete": ("GET", "driver", ""),
+    "driver-car": ("POST", "car", ""),
+    "assignments": (
+        "POST",
+        None,
+        "",
+        {"changes": [
+            {"action": "add", "driver": 1, "car": 1},
+            {"action": "remove", "driver": 2, "car": 1},
+        ]},
+    ),
+    "fleet-export": ("GET", {"kind": "manufacturers", "fmt": "csv"}, ""),
+    "metrics": ("GET", None, ""),
+    "dispatch-pings": (
+        "POST", None, "", {"latitude": 50.45, "longitude": 30.52, "available": True}
+    ),
+    "dispatch-nearest": ("GET", None, "?lat=50.45&lon=30.52&n=10"),
+    "analytics": ("GET", None, ""),
+    "analytics-fleet": ("GET", None, ""),
+}
+
+BENCH_USER = "benchmark"
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic fleets into scratch databases, serve each with "
+        "gunicorn and load every taxi route with concurrent logged-in "
+        "clients. Prints throughput, latency percentiles and query counts "
+        "per route as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", type=int, default=[1000])
+        parser.add_argument(
+            "--database-url",
+            help=(
+                "Database to benchmark against, emptied for every size. "
+                "Defaults to a temporary SQLite file."
+            ),
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Threads of the single gunicorn worker",
+        )
+        parser.add_argument("--routes", nargs="+", choices=sorted(ROUTES))
+        parser.add_argument("--output", help="Write the report to this file")
+        # Internal: seed the database of the environment and print the
+        # session and sample objects the load runs with.
+        parser.add_argument("--prepare", type=int, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["prepare"] is not None:
+            return self.prepare(options["prepare"])
+
+        missing = {pattern.name for pattern in urlpatterns} - set(ROUTES)
+        if missing:
+            raise CommandError(f"No benchmark route for {', '.join(sorted(missing))}")
+
+        report = {"environment": self.environment(options), "sizes": {}}
+        with tempfile.TemporaryDirectory() as directory:
+            for size in options["sizes"]:
+                database_url = options["database_url"] or (
+                    f"sqlite:///{os.path.join(directory, f'bench-{size}.sqlite3')}"
+                )
+                report["sizes"][size] = self.benchmark(size, database_url, options)
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as target:
+                target.write(output + "\n")
+        self.stdout.write(output)
+
+    def benchmark(self, size, database_url, options):
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "TAXI_PERF_SAMPLE_RATE": "1",
+            "TAXI_METRICS_TOKEN": secrets.token_hex(16),
+        }
+        start = time.perf_counter()
+        prepared = subprocess.run(
+            [
+                sys.executable,
+                os.path.join(settings.BASE_DIR, "manage.py"),
+                "benchmark_urls",
+                "--prepare",
+                str(size),
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if prepared.returncode:
+            raise CommandError(prepared.stderr)
+        setup = json.loads(prepared.stdout.splitlines()[-1])
+        self.stderr.write(
+            f"Seeded {size} cars in {time.perf_counter() - start:.1f}s"
+        )
+
+        port = free_port()
+        server = gunicorn(
+            "taxi_service.wsgi:application", port, 1, "gthread", options["threads"]
+        )
+        server.env.update(env, DJANGO_DEBUG="False")
+        routes = {}
+        with server:
+            for name in options["routes"] or ROUTES:
+                method, source, query, *body = ROUTES[name]
+                if isinstance(source, str):
+                    kwargs = {"pk": setup["objects"][source]}
+                else:
+                    kwargs = source or {}
+                path = reverse(f"taxi:{name}", kwargs=kwargs) + query
+                routes[name] = run_load(
+                    server.url,
+                    [path],
+                    options["requests"],
+                    options["concurrency"],
+                    cookies=setup["cookies"],
+                    method=method,
+                    json_body=body[0] if body else None,
+                )
+            routes = self.add_query_counts(
+                server.url, routes, env["TAXI_METRICS_TOKEN"]
+            )
+
+        return {"seed": setup["counts"], "routes": routes}
+
+    @staticmethod
+    def add_query_counts(url, routes, token):
+        """Add queries per request from the server's own histograms."""
+        request = Request(
+            f"{url}{reverse('taxi:metrics')}",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        with urlopen(request, timeout=10) as response:
+            histograms = parse_prometheus(response.read().decode())
+        for name, result in routes.items():
+            histogram = histograms.get(("taxi_request_db_queries", f"taxi:{name}"))
+            if histogram and histogram["count"]:
+                result["queries_mean"] = round(histogram["sum"] / histogram["count"], 2)
+                # Upper bound of the bucket holding the 99th percentile;
+                # exact for up to 3 queries.
+                result["queries_p99"] = next(
+                    bound
+                    for bound, count in histogram["buckets"]
+                    if count >= 0.99 * histogram["count"]
+                )
+        return routes
+
+    def prepare(self, size):
+        call_command("migrate", verbosity=0)
+        call_command("flush", interactive=False, verbosity=0)
+        counts = seed_fleet(
+            manufacturers=max(size // 1000, 10),
+            cars=size,
+            drivers=max(size // 10, 10),
+            drivers_per_car=2,
+        )
+        get_search_backend().rebuild()
+        reconcile()
+        cookies = session_cookies(BENCH_USER)
+        # Staff, so the export route is measured rather than refused
+        get_user_model().objects.filter(username=BENCH_USER).update(is_staff=True)
+        self.stdout.write(json.dumps({
+            "counts": counts,
+            "cookies": cookies,
+            "objects": {
+                "manufacturer": Manufacturer.objects.order_by("pk").first().pk,
+                "car": Car.objects.order_by("pk").first().pk,
+                "driver": Driver.objects.exclude(username=BENCH_USER)
+                .order_by("pk").first().pk,
+            },
+        }))
+
+    @staticmethod
+    def environment(options):
+        try:
+            commit = subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True,
+                text=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except OSError:
+            commit = ""
+        return {
+            "commit": commit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": urlsplit(options["database_url"] or "sqlite:").scheme,
+            "requests": options["requests"],
+            "concurrency": options["concurrency"],
+            "threads": options["threads"],
+        }
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from taxi.exporters import EXPORTS, FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = "Stream manufacturers, drivers or cars to a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORTS))
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--output", help="Output file, defaults to stdout")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        lines = stream_export(
+            options["kind"], options["format"], options["chunk_size"]
+        )
+        if options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as target:
+                target.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending="")
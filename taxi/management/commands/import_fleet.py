@@ -0,0 +1,71 @@
+import json
+import os
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from taxi.counters import reconcile
+from taxi.importers import IMPORTERS, chunked, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import manufacturers, drivers or cars from a CSV or JSON Lines "
+        "file. Each chunk is written in its own transaction and recorded in "
+        "a checkpoint file, so an interrupted import can be resumed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path")
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument(
+            "--checkpoint",
+            help="Checkpoint file, defaults to <path>.checkpoint",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Skip the rows committed by a previous run",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"{path} does not exist")
+        checkpoint = options["checkpoint"] or f"{path}.checkpoint"
+
+        done = 0
+        if options["resume"] and os.path.exists(checkpoint):
+            with open(checkpoint) as source:
+                done = json.load(source)["rows"]
+            self.stdout.write(f"Resuming after row {done}")
+
+        importer = IMPORTERS[options["kind"]]()
+        rows = islice(read_rows(path), done, None)
+        created = skipped = 0
+        start = time.perf_counter()
+
+        for chunk in chunked(rows, options["chunk_size"]):
+            objects, errors = importer.import_chunk(chunk)
+            for index, message in errors:
+                self.stderr.write(f"Row {done + index + 1}: {message}")
+            done += len(chunk)
+            created += len(objects)
+            skipped += len(errors)
+            with open(checkpoint, "w") as target:
+                json.dump({"rows": done}, target)
+
+            elapsed = time.perf_counter() - start
+            self.stdout.write(
+                f"{done} rows read, {created} created, {skipped} skipped "
+                f"({(created + skipped) / elapsed:.0f} rows/s)"
+            )
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        reconcile()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} {options['kind']}, skipped {skipped}"
+        ))
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+
+from taxi.loadtest import free_port, gunicorn, run_load, session_cookies
+from taxi.models import Car
+
+STACKS = {
+    "wsgi": ("taxi_service.wsgi:application", None),
+    "asgi": ("taxi_service.asgi:application", "uvicorn.workers.UvicornWorker"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Start gunicorn with sync workers and with uvicorn workers against "
+        "the configured database, load the home page and the assign toggle "
+        "as a logged-in driver, and print throughput and p99 latency as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--concurrency", type=int, default=32)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--stacks", nargs="+", choices=sorted(STACKS), default=sorted(STACKS)
+        )
+
+    def handle(self, *args, **options):
+        cookies = session_cookies()
+        targets = {"index": ("GET", [reverse("taxi:index")])}
+        car = Car.objects.order_by("pk").first()
+        if car:
+            targets["driver-car"] = (
+                "POST", [reverse("taxi:driver-car", kwargs={"pk": car.pk})]
+            )
+
+        results = {}
+        for stack in options["stacks"]:
+            application, worker_class = STACKS[stack]
+            port = free_port()
+            with gunicorn(application, port, options["workers"], worker_class) as server:
+                results[stack] = {
+                    name: run_load(
+                        server.url,
+                        paths,
+                        options["requests"],
+                        options["concurrency"],
+                        cookies=cookies,
+                        method=method,
+                    )
+                    for name, (method, paths) in targets.items()
+                }
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,76 @@
+import json
+import os
+from urllib.request import Request, urlopen
+
+from django.core.management.base import BaseCommand, CommandError
+
+from taxi.perf import METRICS, parse_prometheus, quantile
+
+QUANTILES = (0.5, 0.95, 0.99)
+COLUMNS = {
+    "taxi_request_seconds": ("wall ms", 1000),
+    "taxi_request_db_queries": ("queries", 1),
+    "taxi_request_db_seconds": ("db ms", 1000),
+    "taxi_request_template_seconds": ("tpl ms", 1000),
+    "taxi_response_bytes": ("KiB", 1 / 1024),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Print p50/p95/p99 per view from the metrics endpoint of a running "
+        "server. Histograms are per process, so each scrape reflects the "
+        "worker that answered it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/metrics/")
+        parser.add_argument(
+            "--token",
+            default=os.environ.get("TAXI_METRICS_TOKEN", ""),
+            help="Bearer token of the metrics endpoint (TAXI_METRICS_TOKEN)",
+        )
+        parser.add_argument("--json", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            request = Request(options["url"])
+            if options["token"]:
+                request.add_header("Authorization", f"Bearer {options['token']}")
+            with urlopen(request, timeout=10) as response:
+                histograms = parse_prometheus(response.read().decode())
+        except OSError as error:
+            raise CommandError(f"Cannot read {options['url']}: {error}")
+
+        stats = {}
+        for (metric, view), histogram in histograms.items():
+            stats.setdefault(view, {"requests": int(histogram["count"])})[metric] = [
+                quantile(histogram["buckets"], fraction) for fraction in QUANTILES
+            ]
+
+        if options["json"]:
+            self.stdout.write(json.dumps(stats, indent=2, sort_keys=True))
+            return
+
+        self.stdout.write(
+            f"{'view':<24} {'requests':>8} "
+            + " ".join(f"{COLUMNS[metric][0]:>23}" for metric in METRICS)
+        )
+        self.stdout.write(
+            f"{'':<24} {'':>8} " + " ".join(f"{'p50/p95/p99':>23}" for _ in METRICS)
+        )
+        for view, values in sorted(stats.items()):
+            cells = [
+                self.format_quantiles(values.get(metric), COLUMNS[metric][1])
+                for metric in METRICS
+            ]
+            self.stdout.write(f"{view:<24} {values['requests']:>8} " + " ".join(cells))
+
+    @staticmethod
+    def format_quantiles(quantiles, scale):
+        if not quantiles:
+            return f"{'-':>23}"
+        cell = "/".join(
+            "-" if value is None else f"{value * scale:.1f}" for value in quantiles
+        )
+        return f"{cell:>23}"
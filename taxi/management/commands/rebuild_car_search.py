@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from taxi.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the car search index of the configured search backend."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        backend.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {backend.__class__.__name__} index")
+        )
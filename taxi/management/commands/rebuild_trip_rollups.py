@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from taxi.models import TripRollup
+from taxi.trips import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the hourly and daily trip rollups from the trip table."
+
+    def handle(self, *args, **options):
+        rebuild_rollups()
+        self.stdout.write(f"{TripRollup.objects.count()} rollup rows")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from taxi.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = "Recount the cached dashboard totals from the database."
+
+    def handle(self, *args, **options):
+        for name, count in reconcile().items():
+            self.stdout.write(f"{name}: {count}")
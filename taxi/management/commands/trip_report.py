@@ -0,0 +1,72 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from taxi.synthetic import seed_fleet, seed_trips
+from taxi.trips import month_bounds, scan_trip_totals, start_of_day, trip_totals
+
+
+class Command(BaseCommand):
+    help = (
+        "Print trips per driver or car for a month from the daily rollups. "
+        "With --compare, also count them from the trip table and time both; "
+        "with --seed, on synthetic trips that are rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--by", choices=["driver", "car"], default="driver")
+        parser.add_argument(
+            "--month",
+            type=lambda value: datetime.datetime.strptime(value, "%Y-%m").date(),
+            help="YYYY-MM, the current month by default",
+        )
+        parser.add_argument("--limit", type=int, default=10)
+        parser.add_argument("--compare", action="store_true")
+        parser.add_argument(
+            "--seed",
+            type=int,
+            metavar="TRIPS",
+            help="Report on this many synthetic trips over the last 90 days",
+        )
+
+    def handle(self, *args, **options):
+        if options["seed"] is None:
+            return self.report(options)
+        with transaction.atomic():
+            seed_fleet(manufacturers=10, cars=150, drivers=300)
+            start = time.perf_counter()
+            seed_trips(trips=options["seed"], days=90)
+            self.stdout.write(
+                f"Recorded {options['seed']} trips in "
+                f"{time.perf_counter() - start:.1f}s"
+            )
+            self.report(options)
+            transaction.set_rollback(True)
+
+    def report(self, options):
+        first, following = month_bounds(options["month"] or timezone.localdate())
+        subject = options["by"]
+        reports = {
+            "rollups": lambda: trip_totals(
+                subject, start_of_day(first), start_of_day(following)
+            ),
+        }
+        if options["compare"]:
+            reports["trip table"] = lambda: scan_trip_totals(subject, first, following)
+
+        for source, totals in reports.items():
+            start = time.perf_counter()
+            rows = list(totals())
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stdout.write(
+                f"{subject}s by trips, {first:%Y-%m}, from the {source}: "
+                f"{len(rows)} {subject}s in {elapsed:.1f} ms"
+            )
+            for row in rows[:options["limit"]]:
+                self.stdout.write(
+                    f"  {row[subject]:>8} {row['trips']:>6} trips "
+                    f"{row['distance_km']:>10.2f} km {row['fare']:>10.2f}"
+                )
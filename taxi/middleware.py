@@ -0,0 +1,118 @@
+import asyncio
+import random
+import time
+
+from django.conf import settings
+
+from taxi import perf, routers
+
+PIN_COOKIE = "taxi_primary"
+
+
+class AsyncCapableMiddleware:
+    """Base for middleware that runs natively in both sync and async stacks.
+
+    Like Django's ``MiddlewareMixin``, an instance wrapping a coroutine
+    function is itself one, so ASGI requests never go through an
+    extra thread hop for this middleware.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state = self.before(request)
+        try:
+            response = self.get_response(request)
+        except BaseException:
+            self.after(request, None, state)
+            raise
+        return self.after(request, response, state)
+
+    async def __acall__(self, request):
+        state = self.before(request)
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            self.after(request, None, state)
+            raise
+        return self.after(request, response, state)
+
+    def before(self, request):
+        """Run before the view; the result is handed to ``after``."""
+
+    def after(self, request, response, state):
+        """Run after the view, with ``response`` ``None`` when it raised."""
+        return response
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    """Choose the database replica that serves the reads of each request.
+
+    Unsafe methods and clients that wrote recently are served from the
+    primary. A request that writes sets a short-lived cookie, so the
+    redirect that usually follows (and anything else the client loads
+    while replicas catch up) reads its own writes.
+    """
+
+    def before(self, request):
+        routers.begin(
+            pinned=request.method not in ("GET", "HEAD", "OPTIONS")
+            or PIN_COOKIE in request.COOKIES
+        )
+
+    def after(self, request, response, state):
+        wrote = routers.end()
+        if wrote and response is not None:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "TAXI_REPLICA_PIN_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class PerformanceMiddleware(AsyncCapableMiddleware):
+    """Record timings of a sample of requests into per-view histograms.
+
+    Only ``TAXI_PERF_SAMPLE_RATE`` of the requests are measured; the rest
+    pay for one random number. Views are labelled with their URL name.
+    Queries are counted by ``perf.timed_execute``, which every database
+    connection runs.
+    """
+
+    def before(self, request):
+        if random.random() >= getattr(settings, "TAXI_PERF_SAMPLE_RATE", 0.1):
+            return None
+        perf.start_request()
+        return time.perf_counter()
+
+    def after(self, request, response, start):
+        if start is None:
+            return response
+        timings = perf.finish_request()
+        if response is None:
+            return response
+        elapsed = time.perf_counter() - start
+
+        match = request.resolver_match
+        values = {
+            "taxi_request_seconds": elapsed,
+            "taxi_request_db_queries": timings.queries,
+            "taxi_request_db_seconds": timings.db_seconds,
+            "taxi_request_template_seconds": timings.template_seconds,
+        }
+        if not response.streaming:
+            values["taxi_response_bytes"] = len(response.content)
+        perf.observe(match.view_name if match else "unresolved", values)
+        return response
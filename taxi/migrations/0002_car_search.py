@@ -0,0 +1,75 @@
+# Generated by Django 4.0.2 on 2026-10-18 19:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+TRIGRAM_INDEXES = (
+    ("taxi_car_model_trgm", "taxi_car", "model"),
+    ("taxi_manufacturer_name_trgm", "taxi_manufacturer", "name"),
+    ("taxi_manufacturer_country_trgm", "taxi_manufacturer", "country"),
+)
+
+
+def trigrams(text):
+    """Copy of ``taxi.search.trigrams`` as it was when this migration was written."""
+    text = " ".join(text.lower().split())
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, column in TRIGRAM_INDEXES:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS {name} ON {table} '
+                f'USING gin ((UPPER("{column}"::text)) gin_trgm_ops)'
+            )
+        return
+
+    Car = apps.get_model("taxi", "Car")
+    CarSearchTrigram = apps.get_model("taxi", "CarSearchTrigram")
+    rows = []
+    for car in Car.objects.select_related("manufacturer").iterator():
+        weights = {}
+        for text, weight in (
+            (car.manufacturer.name, 1),
+            (car.manufacturer.country, 1),
+            (car.model, 2),
+        ):
+            for trigram in trigrams(text):
+                weights[trigram] = max(weight, weights.get(trigram, 0))
+        rows += [
+            CarSearchTrigram(car_id=car.id, trigram=trigram, weight=weight)
+            for trigram, weight in weights.items()
+        ]
+    CarSearchTrigram.objects.bulk_create(rows, batch_size=5000)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        for name, _, _ in TRIGRAM_INDEXES:
+            schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CarSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+                ('car', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='taxi.car')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='carsearchtrigram',
+            constraint=models.UniqueConstraint(fields=('trigram', 'car'), name='taxi_car_search_trigram_unique'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
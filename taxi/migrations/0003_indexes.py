@@ -0,0 +1,31 @@
+# Generated by Django 4.0.2 on 2026-10-18 19:33
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0002_car_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['manufacturer', 'id'], name='taxi_car_manufacturer_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(fields=['model'], name='taxi_car_model_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='car',
+            index=models.Index(django.db.models.functions.text.Upper('model'), name='taxi_car_model_upper_idx'),
+        ),
+        migrations.RunSQL(
+            "CREATE INDEX taxi_car_drivers_driver_car_idx "
+            "ON taxi_car_drivers (driver_id, car_id)",
+            "DROP INDEX taxi_car_drivers_driver_car_idx",
+        ),
+    ]
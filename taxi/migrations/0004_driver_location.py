@@ -0,0 +1,25 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0003_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverLocation',
+            fields=[
+                ('driver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='location', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('is_available', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:06
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def create_day_index(apps, schema_editor):
+    # Trips arrive in time order, so on PostgreSQL a BRIN index over the
+    # day bucket stays tiny and lets range scans skip whole blocks. Other
+    # databases get a B-tree over it instead.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS taxi_trip_started_brin "
+            "ON taxi_trip USING brin (started_on)"
+        )
+    else:
+        schema_editor.execute(
+            "CREATE INDEX IF NOT EXISTS taxi_trip_started_on_idx "
+            "ON taxi_trip (started_on)"
+        )
+
+
+def drop_day_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS taxi_trip_started_brin")
+    schema_editor.execute("DROP INDEX IF EXISTS taxi_trip_started_on_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0004_driver_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('period_start', models.DateTimeField()),
+                ('trips', models.PositiveIntegerField(default=0)),
+                ('distance_km', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('fare', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('car', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='taxi.car')),
+                ('driver', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Trip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('started_at', models.DateTimeField()),
+                ('ended_at', models.DateTimeField()),
+                ('started_on', models.DateField()),
+                ('distance_km', models.DecimalField(decimal_places=2, max_digits=7)),
+                ('fare', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('car', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trips', to='taxi.car')),
+                ('driver', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trips', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='triprollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('car__isnull', True)), fields=('period', 'period_start', 'driver'), name='taxi_triprollup_driver_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='triprollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('driver__isnull', True)), fields=('period', 'period_start', 'car'), name='taxi_triprollup_car_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['driver', 'started_on'], name='taxi_trip_driver_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trip',
+            index=models.Index(fields=['car', 'started_on'], name='taxi_trip_car_day_idx'),
+        ),
+        migrations.RunPython(create_day_index, drop_day_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:31
+
+from django.db import migrations, models
+import taxi.expansion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0005_trips'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='driver',
+            name='license_number',
+            field=models.CharField(max_length=255, unique=True, validators=[taxi.expansion.check_license_number]),
+        ),
+    ]
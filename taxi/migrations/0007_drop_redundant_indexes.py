@@ -0,0 +1,26 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:44
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0006_license_number_validator'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='car',
+            name='manufacturer',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='taxi.manufacturer'),
+        ),
+        # The automatic driver_id index already serves a driver's cars and
+        # the unique (car_id, driver_id) index the assignment probe
+        migrations.RunSQL(
+            "DROP INDEX taxi_car_drivers_driver_car_idx",
+            "CREATE INDEX taxi_car_drivers_driver_car_idx "
+            "ON taxi_car_drivers (driver_id, car_id)",
+        ),
+    ]
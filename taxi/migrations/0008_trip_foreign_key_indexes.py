@@ -0,0 +1,25 @@
+# Generated by Django 4.0.2 on 2026-10-18 20:44
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0007_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='trip',
+            name='car',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trips', to='taxi.car'),
+        ),
+        migrations.AlterField(
+            model_name='trip',
+            name='driver',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='trips', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.2 on 2026-10-18 21:03
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taxi', '0008_trip_foreign_key_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='car',
+            name='taxi_car_model_upper_idx',
+        ),
+    ]
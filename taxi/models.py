@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from django.urls import reverse
+
+from taxi.expansion import check_license_number
+from taxi.reversing import cached_reverse
 
 
 class Manufacturer(models.Model):
@@ -15,7 +17,9 @@ class Manufacturer(models.Model):
 
 
 class Driver(AbstractUser):
-    license_number = models.CharField(max_length=255, unique=True)
+    license_number = models.CharField(
+        max_length=255, unique=True, validators=[check_license_number]
+    )
 
     class Meta:
         verbose_name = "driver"
@@ -25,16 +29,134 @@ class Driver(AbstractUser):
         return f"{self.username} ({self.first_name} {self.last_name})"
 
     def get_absolute_url(self):
-        return reverse("taxi:driver-detail", kwargs={'pk': self.pk})
+        return cached_reverse("taxi:driver-detail", kwargs={"pk": self.pk})
 
 
 class Car(models.Model):
     model = models.CharField(max_length=255)
-    manufacturer = models.ForeignKey(Manufacturer, on_delete=models.CASCADE)
+    # Indexed as the prefix of taxi_car_manufacturer_id_idx
+    manufacturer = models.ForeignKey(
+        Manufacturer, on_delete=models.CASCADE, db_index=False
+    )
     drivers = models.ManyToManyField(Driver, related_name="cars")
 
     class Meta:
         ordering = ["manufacturer"]
+        indexes = [
+            models.Index(
+                fields=["manufacturer", "id"], name="taxi_car_manufacturer_id_idx"
+            ),
+            models.Index(fields=["model"], name="taxi_car_model_idx"),
+        ]
 
     def __str__(self):
         return self.model
+
+
+class CarSearchTrigram(models.Model):
+    car = models.ForeignKey(
+        Car, on_delete=models.CASCADE, related_name="search_trigrams"
+    )
+    trigram = models.CharField(max_length=3)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["trigram", "car"], name="taxi_car_search_trigram_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.trigram} -> {self.car_id}"
+
+
+class DriverLocation(models.Model):
+    """Last reported position of a driver, written in batches by dispatch."""
+
+    driver = models.OneToOneField(
+        Driver,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="location",
+    )
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    is_available = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.driver_id} @ {self.latitude:.5f},{self.longitude:.5f}"
+
+
+class Trip(models.Model):
+    """A finished ride, recorded through ``taxi.trips.record_trips``.
+
+    Trips are only ever inserted, in bulk, together with their rollups.
+    ``started_on`` is the local date of ``started_at`` and buckets the
+    rows by day for range scans.
+    """
+
+    # Both indexed as the prefix of the (subject, started_on) indexes below
+    driver = models.ForeignKey(
+        Driver,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="trips",
+        db_index=False,
+    )
+    car = models.ForeignKey(
+        Car, on_delete=models.SET_NULL, null=True, related_name="trips", db_index=False
+    )
+    started_at = models.DateTimeField()
+    ended_at = models.DateTimeField()
+    started_on = models.DateField()
+    distance_km = models.DecimalField(max_digits=7, decimal_places=2)
+    fare = models.DecimalField(max_digits=8, decimal_places=2)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["driver", "started_on"], name="taxi_trip_driver_day_idx"
+            ),
+            models.Index(fields=["car", "started_on"], name="taxi_trip_car_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.driver_id} in {self.car_id} at {self.started_at:%Y-%m-%d %H:%M}"
+
+
+class TripRollup(models.Model):
+    """Trips of one driver, or of one car, added up per hour or per day."""
+
+    HOUR = "hour"
+    DAY = "day"
+    PERIODS = [(HOUR, "Hour"), (DAY, "Day")]
+
+    period = models.CharField(max_length=4, choices=PERIODS)
+    period_start = models.DateTimeField()
+    driver = models.ForeignKey(
+        Driver, on_delete=models.CASCADE, null=True, related_name="+"
+    )
+    car = models.ForeignKey(Car, on_delete=models.CASCADE, null=True, related_name="+")
+    trips = models.PositiveIntegerField(default=0)
+    distance_km = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    fare = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "period_start", "driver"],
+                condition=models.Q(car__isnull=True),
+                name="taxi_triprollup_driver_unique",
+            ),
+            models.UniqueConstraint(
+                fields=["period", "period_start", "car"],
+                condition=models.Q(driver__isnull=True),
+                name="taxi_triprollup_car_unique",
+            ),
+        ]
+
+    def __str__(self):
+        subject = f"driver {self.driver_id}" if self.driver_id else f"car {self.car_id}"
+        return f"{subject}, {self.period} of {self.period_start}: {self.trips}"
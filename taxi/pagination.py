@@ -0,0 +1,160 @@
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.http import Http404
+
+CURSOR_SALT = "taxi.pagination.cursor"
+
+
+class KeysetPage:
+    """Page of a keyset (cursor) paginated list.
+
+    Mirrors the parts of ``django.core.paginator.Page`` the templates use,
+    but knows its neighbours only through opaque cursor tokens.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(values, forward=True):
+    return signing.dumps(
+        {"v": list(values), "f": forward}, salt=CURSOR_SALT, compress=True
+    )
+
+
+def decode_cursor(token):
+    try:
+        data = signing.loads(token, salt=CURSOR_SALT)
+        return data["v"], data["f"]
+    except (signing.BadSignature, KeyError, TypeError):
+        raise Http404("Invalid cursor")
+
+
+def seek(queryset, fields, values, forward=True):
+    """Filter ``queryset`` to rows strictly after (or before) ``values``.
+
+    Builds the row-value comparison ``(a, b) > (x, y)`` as
+    ``a > x OR (a = x AND b > y)`` so every backend can use the index
+    on ``fields``.
+    """
+    lookup = "gt" if forward else "lt"
+    condition = Q()
+    for index, field in enumerate(fields):
+        clause = Q(**{f"{field}__{lookup}": values[index]})
+        for previous_field, previous_value in zip(fields[:index], values[:index]):
+            clause &= Q(**{previous_field: previous_value})
+        condition |= clause
+    return queryset.filter(condition)
+
+
+def paginate_keyset(queryset, fields, page_size, cursor=None, with_count=False):
+    """Return a ``KeysetPage`` of ``queryset`` ordered by ``fields``.
+
+    Every page is a single ``LIMIT page_size + 1`` query seeking from the
+    cursor position, so deep pages cost the same as the first one.
+    The total ``COUNT(*)`` is only issued when ``with_count`` is set.
+    """
+    count = queryset.count() if with_count else None
+    forward = True
+    if cursor:
+        values, forward = decode_cursor(cursor)
+        if len(values) != len(fields):
+            raise Http404("Invalid cursor")
+        queryset = seek(queryset, fields, values, forward)
+
+    if forward:
+        queryset = queryset.order_by(*fields)
+    else:
+        queryset = queryset.order_by(*(f"-{field}" for field in fields))
+
+    rows = list(queryset[:page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if not forward:
+        rows.reverse()
+
+    def position(obj):
+        return [getattr(obj, field) for field in fields]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or not forward:
+            next_cursor = encode_cursor(position(rows[-1]))
+        if cursor and (has_more or forward):
+            previous_cursor = encode_cursor(position(rows[0]), forward=False)
+
+    return KeysetPage(rows, next_cursor, previous_cursor, count)
+
+
+class KeysetPaginationMixin:
+    """Opt-in keyset pagination for ``ListView`` subclasses.
+
+    Offset pagination stays the default; passing ``?cursor=`` (empty for
+    the first page) switches the view to seeking on ``keyset_fields``,
+    and ``?count=1`` additionally asks for the total number of rows.
+    """
+    keyset_fields = ("pk",)
+    cursor_kwarg = "cursor"
+    count_kwarg = "count"
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.cursor_kwarg not in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+
+        page = paginate_keyset(
+            queryset,
+            self.keyset_fields,
+            page_size,
+            cursor=self.request.GET.get(self.cursor_kwarg),
+            with_count=bool(self.request.GET.get(self.count_kwarg)),
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+
+def requested_page_size(request, default, kwarg="page_size"):
+    """Return ``?page_size=`` capped at ``TAXI_MAX_PAGE_SIZE``, else ``default``.
+
+    Missing, malformed and non-positive values fall back to ``default``.
+    """
+    try:
+        size = int(request.GET[kwarg])
+    except (KeyError, ValueError):
+        size = default
+    if size < 1:
+        size = default
+    return min(size, getattr(settings, "TAXI_MAX_PAGE_SIZE", 100))
+
+
+class PageSizeMixin:
+    """Let ``ListView`` clients pick the page size with ``?page_size=``.
+
+    The default comes from ``TAXI_PAGE_SIZES`` by model name, and falls
+    back to ``paginate_by``.
+    """
+    page_size_kwarg = "page_size"
+
+    def get_paginate_by(self, queryset):
+        default = getattr(settings, "TAXI_PAGE_SIZES", {}).get(
+            self.model._meta.model_name, self.paginate_by
+        )
+        return requested_page_size(self.request, default, self.page_size_kwarg)
@@ -0,0 +1,215 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from django.template.backends.django import DjangoTemplates, Template
+
+SECONDS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+QUERIES = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+BYTES = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# metric name: (help, bucket upper bounds)
+METRICS = {
+    "taxi_request_seconds": ("Wall time of the request", SECONDS),
+    "taxi_request_db_queries": ("Database queries per request", QUERIES),
+    "taxi_request_db_seconds": ("Time spent in database queries", SECONDS),
+    "taxi_request_template_seconds": ("Time spent rendering templates", SECONDS),
+    "taxi_response_bytes": ("Size of the response body", BYTES),
+}
+
+
+class Histogram:
+    """Cumulative bucket histogram in the Prometheus style."""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def buckets(self):
+        """Yield ``(upper bound, cumulative count)``, ending with ``+Inf``."""
+        total = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            yield bound, total
+
+
+def quantile(buckets, fraction):
+    """Estimate a quantile from cumulative buckets like ``histogram_quantile``."""
+    buckets = list(buckets)
+    total = buckets[-1][1] if buckets else 0
+    if not total:
+        return None
+    rank = fraction * total
+    lower_bound = lower_count = 0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == float("inf"):
+                return lower_bound
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (
+                (rank - lower_count) / (count - lower_count)
+            )
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+_lock = threading.Lock()
+_histograms = {}
+
+
+def observe(view, values):
+    """Record the measurements of one request to ``view``."""
+    with _lock:
+        for name, value in values.items():
+            key = (name, view)
+            if key not in _histograms:
+                _histograms[key] = Histogram(METRICS[name][1])
+            _histograms[key].observe(value)
+
+
+def snapshot():
+    """Return ``{(metric, view): (buckets, sum, count)}`` for every recorded view."""
+    with _lock:
+        return {
+            key: (list(histogram.buckets()), histogram.sum, histogram.count)
+            for key, histogram in _histograms.items()
+        }
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def format_bound(bound):
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus(extra_gauges=None):
+    """Render the histograms, and ``{name: {labels: value}}`` gauges, as text."""
+    histograms = snapshot()
+    lines = []
+    for name, (description, _) in METRICS.items():
+        views = sorted(view for metric, view in histograms if metric == name)
+        if not views:
+            continue
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+        for view in views:
+            buckets, total, count = histograms[name, view]
+            for bound, cumulative in buckets:
+                lines.append(
+                    f'{name}_bucket{{view="{view}",le="{format_bound(bound)}"}} '
+                    f"{cumulative}"
+                )
+            lines.append(f'{name}_sum{{view="{view}"}} {total}')
+            lines.append(f'{name}_count{{view="{view}"}} {count}')
+    for name, samples in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        for labels, value in samples.items():
+            lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_prometheus(text):
+    """Read histograms back as ``{(metric, view): {"buckets", "sum", "count"}}``."""
+    histograms = {}
+    for line in text.splitlines():
+        if line.startswith("#") or 'view="' not in line:
+            continue
+        series, value = line.rsplit(" ", 1)
+        name, labels = series.split("{", 1)
+        labels = dict(
+            label.split("=", 1) for label in labels.rstrip("}").split(",")
+        )
+        name, _, part = name.rpartition("_")
+        histogram = histograms.setdefault(
+            (name, labels["view"].strip('"')), {"buckets": [], "sum": 0, "count": 0}
+        )
+        if part == "bucket":
+            histogram["buckets"].append((float(labels["le"].strip('"')), float(value)))
+        else:
+            histogram[part] = float(value)
+    return histograms
+
+
+class RequestTimings:
+    """Queries and template time of one sampled request.
+
+    Shared by the request's context and the copies ``sync_to_async``
+    makes of it, so work done in worker threads is counted too.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.depth = 0
+
+
+_timings = ContextVar("taxi_perf_timings", default=None)
+
+
+def start_request():
+    _timings.set(RequestTimings())
+
+
+def finish_request():
+    timings = _timings.get()
+    _timings.set(None)
+    return timings
+
+
+def timed_execute(execute, sql, params, many, context):
+    """``execute_wrapper`` counting the queries of the sampled request, if any."""
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.db_seconds += time.perf_counter() - start
+        timings.queries += 1
+
+
+def install_query_timer(connection):
+    if timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(timed_execute)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        # Templates rendered from inside another one (crispy forms, widgets)
+        # are already part of the outer render time.
+        timings = _timings.get()
+        if timings is None or timings.depth:
+            return super().render(context, request)
+        timings.depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_seconds += time.perf_counter() - start
+            timings.depth -= 1
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Django template backend that adds render time to the sampled request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
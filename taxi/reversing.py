@@ -0,0 +1,48 @@
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, reverse
+
+# Stand-in for integer arguments while a URL template is reversed
+PLACEHOLDER = 7_319_000_000_001
+
+# Distinct (script prefix, URL name, argument names) templates kept
+MAX_TEMPLATES = 512
+
+
+def cached_reverse(viewname, kwargs=None):
+    """``reverse()`` memoized per URL name and integer keyword arguments.
+
+    The URL is reversed once with placeholder values, then filled in with
+    ``str.format`` for every later call, so a list page pays for one
+    resolver walk per route rather than one per row. Anything but
+    non-negative integer keyword arguments goes through ``reverse()`` as
+    usual, so values the URL pattern would reject still raise
+    ``NoReverseMatch``.
+    """
+    kwargs = kwargs or {}
+    if not all(
+        type(value) is int and value >= 0 for value in kwargs.values()
+    ):
+        return reverse(viewname, kwargs=kwargs)
+    template = url_template(get_script_prefix(), viewname, tuple(sorted(kwargs)))
+    return template.format(**kwargs)
+
+
+@lru_cache(maxsize=MAX_TEMPLATES)
+def url_template(prefix, viewname, names):
+    placeholders = {
+        name: PLACEHOLDER + index for index, name in enumerate(names)
+    }
+    template = reverse(viewname, kwargs=placeholders)
+    template = template.replace("{", "{{").replace("}", "}}")
+    for name, value in placeholders.items():
+        template = template.replace(str(value), f"{{{name}}}")
+    return template
+
+
+@receiver(setting_changed)
+def clear_on_urlconf_change(setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        url_template.cache_clear()
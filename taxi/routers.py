@@ -0,0 +1,111 @@
+import threading
+from contextvars import ContextVar
+from itertools import count
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Apps whose rows must never be read stale, and whose writes (a session
+# being saved on every request) should not pin the client to the primary.
+PRIMARY_ONLY_APPS = ("sessions",)
+
+_lock = threading.Lock()
+_turns = count()
+_in_flight = {}
+
+
+class RequestRoute:
+    """Where the reads of one request go, and whether it has written yet.
+
+    One object is shared by the request's context and the copies
+    ``sync_to_async`` makes of it, so a write made in a worker thread
+    still pins the rest of the request to the primary.
+    """
+
+    def __init__(self, replica):
+        self.chosen = self.replica = replica
+        self.wrote = False
+
+
+_route = ContextVar("taxi_route", default=None)
+
+
+def replicas():
+    return getattr(settings, "TAXI_DATABASE_REPLICAS", [])
+
+
+def choose_replica():
+    """Pick the replica for a new request, or ``None`` without replicas.
+
+    ``round_robin`` cycles through the replicas. ``least_loaded`` takes the
+    one serving the fewest requests in this process right now.
+    """
+    aliases = replicas()
+    if not aliases:
+        return None
+    with _lock:
+        if getattr(settings, "TAXI_REPLICA_POLICY", "round_robin") == "least_loaded":
+            return min(aliases, key=lambda alias: _in_flight.get(alias, 0))
+        return aliases[next(_turns) % len(aliases)]
+
+
+def begin(pinned=False):
+    """Route the reads of the current request to a replica unless ``pinned``."""
+    replica = None if pinned else choose_replica()
+    _route.set(RequestRoute(replica))
+    if replica:
+        with _lock:
+            _in_flight[replica] = _in_flight.get(replica, 0) + 1
+    return replica
+
+
+def end():
+    """Forget the current request and report whether it wrote to the primary."""
+    route = _route.get()
+    if route is None:
+        return False
+    if route.chosen:
+        with _lock:
+            _in_flight[route.chosen] -= 1
+    _route.set(None)
+    return route.wrote
+
+
+def pin_primary():
+    """Send the remaining reads of the current request to the primary."""
+    route = _route.get()
+    if route is not None:
+        route.replica = None
+
+
+class PrimaryReplicaRouter:
+    """Send reads made while serving a request to the replica chosen for it.
+
+    Reads outside a request (management commands, the shell), reads inside
+    a transaction, and every read after the request's first write go to the
+    primary, so a request always sees its own writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        replica = route.replica if route else None
+        if (
+            replica is None
+            or model._meta.app_label in PRIMARY_ONLY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return replica
+
+    def db_for_write(self, model, **hints):
+        route = _route.get()
+        if route is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            route.replica = None
+            route.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Greatest
+from django.utils.module_loading import import_string
+
+from taxi.models import Car, CarSearchTrigram
+
+MODEL_WEIGHT = 2
+MANUFACTURER_WEIGHT = 1
+
+
+def trigrams(text):
+    """Return the set of lowercase three character substrings of ``text``."""
+    text = " ".join(text.lower().split())
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def car_trigrams(car):
+    """Return ``{trigram: weight}`` for the searchable text of ``car``."""
+    weights = {}
+    for text, weight in (
+        (car.manufacturer.name, MANUFACTURER_WEIGHT),
+        (car.manufacturer.country, MANUFACTURER_WEIGHT),
+        (car.model, MODEL_WEIGHT),
+    ):
+        for trigram in trigrams(text):
+            weights[trigram] = max(weight, weights.get(trigram, 0))
+    return weights
+
+
+def icontains_filter(query):
+    return (
+        Q(model__icontains=query)
+        | Q(manufacturer__name__icontains=query)
+        | Q(manufacturer__country__icontains=query)
+    )
+
+
+class CarSearchBackend:
+    """Base class for car search backends.
+
+    ``search`` narrows and ranks a ``Car`` queryset; the index hooks are
+    called from model signals and are no-ops for backends which rely on
+    the database's own indexes.
+    """
+
+    def search(self, queryset, query):
+        raise NotImplementedError
+
+    def index(self, cars):
+        pass
+
+    def rebuild(self):
+        pass
+
+
+class IcontainsSearchBackend(CarSearchBackend):
+    """Unindexed ``model__icontains`` scan, kept as the baseline."""
+
+    def search(self, queryset, query):
+        return queryset.filter(model__icontains=query)
+
+
+class TrigramSearchBackend(CarSearchBackend):
+    """PostgreSQL ``pg_trgm`` search.
+
+    The ``icontains`` filters are served by the GIN trigram indexes
+    created in migration 0002 and results are ranked by similarity.
+    """
+
+    def search(self, queryset, query):
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return queryset.filter(icontains_filter(query)).annotate(
+            search_rank=Greatest(
+                TrigramSimilarity("model", query) * MODEL_WEIGHT,
+                TrigramSimilarity("manufacturer__name", query),
+                TrigramSimilarity("manufacturer__country", query),
+            )
+        ).order_by("-search_rank", "pk")
+
+
+class NgramSearchBackend(CarSearchBackend):
+    """Search through the self-maintained ``CarSearchTrigram`` table.
+
+    A car matches when its text contains every trigram of the query.
+    Candidates come from the posting list of the rarest query trigram
+    and are then checked against the others, so the lookup cost follows
+    the size of the matching posting lists rather than of the car table.
+    Cars matching on their model rank above manufacturer matches.
+    """
+
+    def search(self, queryset, query):
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return queryset.filter(icontains_filter(query))
+
+        frequencies = dict(
+            CarSearchTrigram.objects.filter(
+                trigram__in=query_trigrams
+            ).values_list("trigram").annotate(Count("car"))
+        )
+        if len(frequencies) < len(query_trigrams):
+            return queryset.none()
+        rarest = min(frequencies, key=frequencies.get)
+
+        return queryset.filter(
+            pk__in=CarSearchTrigram.objects.filter(
+                trigram=rarest
+            ).values("car_id"),
+            search_trigrams__trigram__in=query_trigrams,
+        ).annotate(
+            search_hits=Count("search_trigrams"),
+            search_rank=Sum("search_trigrams__weight"),
+        ).filter(
+            search_hits=len(query_trigrams)
+        ).order_by("-search_rank", "pk")
+
+    def index(self, cars):
+        cars = list(cars)
+        with transaction.atomic():
+            CarSearchTrigram.objects.filter(car__in=cars).delete()
+            CarSearchTrigram.objects.bulk_create(
+                [
+                    CarSearchTrigram(car=car, trigram=trigram, weight=weight)
+                    for car in cars
+                    for trigram, weight in car_trigrams(car).items()
+                ],
+                batch_size=5000,
+            )
+
+    def rebuild(self, chunk_size=2000):
+        CarSearchTrigram.objects.all().delete()
+        cars = Car.objects.select_related("manufacturer").order_by("pk")
+        last_pk = 0
+        while True:
+            chunk = list(cars.filter(pk__gt=last_pk)[:chunk_size])
+            if not chunk:
+                break
+            self.index(chunk)
+            last_pk = chunk[-1].pk
+
+
+def get_search_backend():
+    """Return the configured car search backend.
+
+    ``TAXI_CAR_SEARCH_BACKEND`` may name a backend class; otherwise
+    PostgreSQL uses ``pg_trgm`` and other databases the n-gram table.
+    """
+    path = getattr(settings, "TAXI_CAR_SEARCH_BACKEND", None)
+    if path:
+        return import_string(path)()
+    if connection.vendor == "postgresql":
+        return TrigramSearchBackend()
+    return NgramSearchBackend()
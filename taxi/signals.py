@@ -0,0 +1,82 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from taxi import counters, fragments, perf
+from taxi.models import Car, Driver, Manufacturer
+from taxi.search import get_search_backend
+
+
+@receiver(connection_created)
+def time_queries(sender, connection, **kwargs):
+    perf.install_query_timer(connection)
+
+
+@receiver(post_save, sender=Car)
+def index_car(sender, instance, raw=False, **kwargs):
+    if not raw:
+        get_search_backend().index([instance])
+
+
+@receiver(post_save, sender=Manufacturer)
+def index_manufacturer_cars(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        get_search_backend().index(instance.car_set.select_related("manufacturer"))
+
+
+@receiver(post_save, sender=Driver)
+@receiver(post_save, sender=Car)
+@receiver(post_save, sender=Manufacturer)
+def count_created(sender, created=False, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust(sender, 1)
+
+
+@receiver(post_delete, sender=Driver)
+@receiver(post_delete, sender=Car)
+@receiver(post_delete, sender=Manufacturer)
+def count_deleted(sender, **kwargs):
+    counters.adjust(sender, -1)
+
+
+def touch_car_drivers(car_ids):
+    fragments.touch("car", car_ids)
+    fragments.touch("driver", set(
+        Car.drivers.through.objects.filter(
+            car_id__in=car_ids
+        ).values_list("driver_id", flat=True)
+    ))
+
+
+@receiver(post_save, sender=Car)
+@receiver(pre_delete, sender=Car)
+def invalidate_car_fragments(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_car_drivers([instance.pk])
+
+
+@receiver(post_save, sender=Manufacturer)
+def invalidate_manufacturer_fragments(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        touch_car_drivers(list(instance.car_set.values_list("pk", flat=True)))
+
+
+@receiver(post_save, sender=Driver)
+@receiver(pre_delete, sender=Driver)
+def invalidate_driver_fragments(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or update_fields == frozenset({"last_login"}):
+        return
+    fragments.touch("driver", [instance.pk])
+    fragments.touch("car", list(instance.cars.values_list("pk", flat=True)))
+
+
+@receiver(m2m_changed, sender=Car.drivers.through)
+def invalidate_assignment_fragments(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if action == "pre_clear":
+        related = instance.cars if reverse else instance.drivers
+        pk_set = related.values_list("pk", flat=True)
+    instance_kind, related_kind = ("driver", "car") if reverse else ("car", "driver")
+    fragments.touch(instance_kind, [instance.pk])
+    fragments.touch(related_kind, list(pk_set))
@@ -0,0 +1,139 @@
+import datetime
+import random
+import string
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+from taxi.models import Manufacturer, Car, Driver, Trip
+from taxi.trips import record_trips
+
+COUNTRIES = ("Ukraine", "Germany", "Japan", "USA", "France", "Italy", "Korea")
+MODELS = (
+    "Corolla", "Camry", "Golf", "Passat", "Civic", "Accord", "Focus",
+    "Mustang", "Octavia", "Clio", "Model S", "Sportage", "Tucson", "Panda",
+)
+
+
+def license_number_for(index):
+    """Return a unique ``AAA00000`` style license number for ``index``."""
+    letters = ""
+    prefix = index // 100000
+    for _ in range(3):
+        prefix, letter = divmod(prefix, 26)
+        letters = string.ascii_uppercase[letter] + letters
+    return f"{letters}{index % 100000:05d}"
+
+
+def seed_fleet(
+    manufacturers=10,
+    cars=100,
+    drivers=100,
+    drivers_per_car=2,
+    batch_size=5000,
+    seed=0,
+):
+    """Bulk insert a synthetic fleet and return the created counts.
+
+    Rows are written with ``bulk_create`` so no model signals are sent;
+    callers relying on signal-maintained state should rebuild it.
+    """
+    rng = random.Random(seed)
+    manufacturer_offset = Manufacturer.objects.count()
+    driver_offset = Driver.objects.count()
+    unusable_password = make_password(None)
+
+    manufacturer_ids = [
+        manufacturer.id
+        for manufacturer in Manufacturer.objects.bulk_create(
+            (
+                Manufacturer(
+                    name=f"Manufacturer {manufacturer_offset + num}",
+                    country=rng.choice(COUNTRIES),
+                )
+                for num in range(manufacturers)
+            ),
+            batch_size=batch_size,
+        )
+    ]
+
+    driver_ids = [
+        driver.id
+        for driver in Driver.objects.bulk_create(
+            (
+                Driver(
+                    username=f"driver_{driver_offset + num}",
+                    first_name=f"First {num}",
+                    last_name=f"Last {num}",
+                    license_number=license_number_for(driver_offset + num),
+                    password=unusable_password,
+                )
+                for num in range(drivers)
+            ),
+            batch_size=batch_size,
+        )
+    ]
+
+    through = Car.drivers.through
+    created_cars = 0
+    assignments = 0
+    for start in range(0, cars, batch_size):
+        chunk = Car.objects.bulk_create(
+            Car(
+                model=f"{rng.choice(MODELS)} {num}",
+                manufacturer_id=rng.choice(manufacturer_ids),
+            )
+            for num in range(start, min(start + batch_size, cars))
+        )
+        created_cars += len(chunk)
+        if driver_ids and drivers_per_car:
+            rows = [
+                through(car_id=car.id, driver_id=driver_id)
+                for car in chunk
+                for driver_id in rng.sample(
+                    driver_ids, min(drivers_per_car, len(driver_ids))
+                )
+            ]
+            through.objects.bulk_create(rows, batch_size=batch_size)
+            assignments += len(rows)
+
+    return {
+        "manufacturers": len(manufacturer_ids),
+        "drivers": len(driver_ids),
+        "cars": created_cars,
+        "assignments": assignments,
+    }
+
+
+def seed_trips(trips=1000, days=30, end=None, batch_size=5000, seed=0):
+    """Record synthetic trips of assigned drivers over the ``days`` before ``end``.
+
+    Trips are generated in time order, as they would arrive, and go
+    through ``record_trips`` so the rollups are filled in too.
+    """
+    rng = random.Random(seed)
+    pairs = list(Car.drivers.through.objects.values_list("driver_id", "car_id"))
+    if not pairs:
+        return 0
+    end = end or timezone.now()
+    span = days * 86400
+    offsets = sorted(rng.uniform(0, span) for _ in range(trips))
+
+    def generate():
+        for offset in offsets:
+            driver_id, car_id = rng.choice(pairs)
+            started_at = end - datetime.timedelta(seconds=span - offset)
+            distance_km = Decimal(f"{rng.uniform(1, 30):.2f}")
+            yield Trip(
+                driver_id=driver_id,
+                car_id=car_id,
+                started_at=started_at,
+                ended_at=started_at + datetime.timedelta(minutes=rng.randint(5, 60)),
+                distance_km=distance_km,
+                fare=(Decimal(2) + distance_km * Decimal("0.8")).quantize(
+                    Decimal("0.01")
+                ),
+            )
+
+    return record_trips(generate(), batch_size=batch_size)
@@ -0,0 +1,49 @@
+import threading
+from collections import OrderedDict
+
+from django import template
+from django.conf import settings
+
+from crispy_forms.templatetags.crispy_forms_filters import as_crispy_form
+
+register = template.Library()
+
+MAX_ENTRIES = 256
+
+# Least recently used markup first; shared by the threads of the process
+_rendered = OrderedDict()
+_lock = threading.Lock()
+
+
+def form_key(form):
+    return (
+        type(form),
+        form.prefix,
+        form.is_bound,
+        tuple((name, str(form[name].value())) for name in form.fields),
+    )
+
+
+@register.filter
+def cached_crispy(form):
+    """``|crispy`` for forms whose markup depends only on their field values.
+
+    The markup is kept in this process by form class and values, so it is
+    only meant for forms without database-backed choices, like
+    ``CarSearchForm``. At most ``MAX_ENTRIES`` forms are kept, dropping the
+    least recently used. Forms with errors and DEBUG mode are not cached.
+    """
+    if settings.DEBUG or (form.is_bound and form.errors):
+        return as_crispy_form(form)
+    key = form_key(form)
+    with _lock:
+        markup = _rendered.get(key)
+        if markup is not None:
+            _rendered.move_to_end(key)
+            return markup
+    markup = as_crispy_form(form)
+    with _lock:
+        _rendered[key] = markup
+        while len(_rendered) > MAX_ENTRIES:
+            _rendered.popitem(last=False)
+    return markup
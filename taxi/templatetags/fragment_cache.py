@@ -0,0 +1,44 @@
+from django import template
+from django.core.cache import cache
+
+from taxi import fragments
+
+register = template.Library()
+
+
+class VersionedCacheNode(template.Node):
+    def __init__(self, nodelist, name, obj):
+        self.nodelist = nodelist
+        self.name = name
+        self.obj = obj
+
+    def render(self, context):
+        key = fragments.fragment_key(
+            self.name.resolve(context), self.obj.resolve(context)
+        )
+        content = cache.get(key)
+        fragments.record(hit=content is not None)
+        if content is None:
+            content = self.nodelist.render(context)
+            cache.set(key, content, fragments.fragment_timeout())
+        return content
+
+
+@register.tag
+def versioned_cache(parser, token):
+    """Cache the enclosed block until ``obj`` or its related rows change.
+
+    Usage::
+
+        {% versioned_cache "car-drivers" car %}...{% endversioned_cache %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires a fragment name and an object"
+        )
+    nodelist = parser.parse(("endversioned_cache",))
+    parser.delete_first_token()
+    return VersionedCacheNode(
+        nodelist, parser.compile_filter(bits[1]), parser.compile_filter(bits[2])
+    )
@@ -0,0 +1,27 @@
+from django import template
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.urls import get_script_prefix
+
+from taxi.reversing import cached_reverse
+
+register = template.Library()
+
+_navigation = {}
+
+
+@register.simple_tag
+def cached_url(viewname, **kwargs):
+    """``{% url %}`` through ``cached_reverse``, for links repeated per row."""
+    return cached_reverse(viewname, kwargs)
+
+
+@register.simple_tag
+def navigation():
+    """The sidebar links, rendered once per process (and script prefix)."""
+    prefix = get_script_prefix()
+    markup = _navigation.get(prefix)
+    if markup is None or settings.DEBUG:
+        markup = render_to_string("includes/navigation.html")
+        _navigation[prefix] = markup
+    return markup
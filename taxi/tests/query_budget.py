@@ -0,0 +1,51 @@
+import time
+from contextlib import ContextDecorator
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class query_budget(ContextDecorator):
+    """Fail when the wrapped block runs more queries or longer than allowed.
+
+    Usable as a context manager or a decorator::
+
+        with query_budget(max_queries=5, max_seconds=0.5) as budget:
+            self.client.get(url)
+        budget.queries  # number of queries actually run
+    """
+
+    def __init__(self, max_queries, max_seconds=None, using="default"):
+        self.max_queries = max_queries
+        self.max_seconds = max_seconds
+        self.using = using
+        self.queries = None
+        self.seconds = None
+
+    def __enter__(self):
+        self.context = CaptureQueriesContext(connections[self.using])
+        self.context.__enter__()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds = time.perf_counter() - self.start
+        self.context.__exit__(exc_type, exc_value, traceback)
+        self.queries = len(self.context)
+        if exc_type is not None:
+            return False
+
+        if self.queries > self.max_queries:
+            executed = "\n".join(
+                f"{num}. {query['sql']}"
+                for num, query in enumerate(self.context.captured_queries, start=1)
+            )
+            raise AssertionError(
+                f"{self.queries} queries executed, budget is "
+                f"{self.max_queries}\n{executed}"
+            )
+        if self.max_seconds is not None and self.seconds > self.max_seconds:
+            raise AssertionError(
+                f"took {self.seconds:.3f}s, budget is {self.max_seconds:.3f}s"
+            )
+        return False
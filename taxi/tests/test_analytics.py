@@ -0,0 +1,93 @@
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from taxi import analytics
+from taxi.models import Car, Manufacturer
+
+ANALYTICS_URL = reverse("taxi:analytics")
+FLEET_URL = reverse("taxi:analytics-fleet")
+
+
+class GroupCountsTest(SimpleTestCase):
+    def test_counts_empty_groups_and_skips_unknown_keys(self):
+        counts = analytics.group_counts(
+            np.array([3, 3, 7, 5, 9, 1]), np.array([1, 3, 5, 8])
+        )
+
+        self.assertEqual(counts.tolist(), [1, 2, 1, 0])
+
+    def test_distribution(self):
+        stats = analytics.distribution(np.array([0, 1, 1, 2, 6]))
+
+        self.assertEqual(
+            (stats["groups"], stats["total"], stats["min"], stats["max"]),
+            (5, 10, 0, 6),
+        )
+        self.assertEqual(stats["percentiles"]["p50"], 1.0)
+        self.assertEqual(sum(bucket["count"] for bucket in stats["histogram"]), 5)
+
+
+class FleetReportTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test", password="test12345"
+        )
+        self.client.force_login(self.user)
+        other = get_user_model().objects.create_user(
+            username="other", password="test12345", license_number="ABC12345"
+        )
+        toyota = Manufacturer.objects.create(name="Toyota", country="Japan")
+        honda = Manufacturer.objects.create(name="Honda", country="Japan")
+        Manufacturer.objects.create(name="Skoda", country="Czech")
+        cars = [
+            Car.objects.create(model=f"Model {num}", manufacturer=manufacturer)
+            for num, manufacturer in enumerate([toyota, toyota, honda])
+        ]
+        cars[0].drivers.add(self.user, other)
+        cars[1].drivers.add(self.user)
+
+    def test_report(self):
+        report = analytics.fleet_report()
+
+        self.assertEqual(
+            report["totals"],
+            {"manufacturers": 3, "cars": 3, "drivers": 2, "assignments": 3},
+        )
+        self.assertEqual(
+            report["top_manufacturers"],
+            [
+                {"name": "Toyota", "cars": 2},
+                {"name": "Honda", "cars": 1},
+                {"name": "Skoda", "cars": 0},
+            ],
+        )
+        self.assertEqual(
+            report["cars_per_country"],
+            [{"country": "Japan", "cars": 3}, {"country": "Czech", "cars": 0}],
+        )
+        self.assertEqual(report["drivers_per_car"]["max"], 2)
+        self.assertEqual(report["drivers_per_car"]["min"], 0)
+        self.assertEqual(report["cars_per_driver"]["total"], 3)
+
+    def test_columns_are_read_in_chunks(self):
+        car_ids, manufacturer_ids = analytics.int_columns(
+            Car.objects.all(), "manufacturer_id", chunk_size=2
+        )
+
+        self.assertEqual(
+            car_ids.tolist(), list(Car.objects.order_by("pk").values_list("pk", flat=True))
+        )
+        self.assertEqual(len(manufacturer_ids), 3)
+
+    def test_endpoints_share_the_cached_report(self):
+        response = self.client.get(FLEET_URL)
+
+        self.assertEqual(response.json()["totals"]["cars"], 3)
+        Car.objects.all().delete()
+        response = self.client.get(ANALYTICS_URL)
+        self.assertContains(response, "<strong>Cars:</strong> 3")
+        self.assertContains(response, "Toyota")
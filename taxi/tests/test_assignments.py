@@ -0,0 +1,127 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from taxi.assignments import apply_assignments
+from taxi.models import Car, Driver
+from taxi.synthetic import seed_fleet
+
+ASSIGNMENTS_URL = reverse("taxi:assignments")
+
+
+def assigned_pairs():
+    return set(Car.drivers.through.objects.values_list("driver_id", "car_id"))
+
+
+class ApplyAssignmentsTest(TestCase):
+    def setUp(self) -> None:
+        seed_fleet(manufacturers=2, cars=20, drivers=30, drivers_per_car=0)
+        self.drivers = list(Driver.objects.order_by("pk").values_list("pk", flat=True))
+        self.cars = list(Car.objects.order_by("pk").values_list("pk", flat=True))
+        self.car = Car.objects.get(pk=self.cars[0])
+        self.car.drivers.add(self.drivers[0])
+
+    def test_statuses(self):
+        changes = [
+            ("add", self.drivers[1], self.car.pk),
+            ("add", self.drivers[0], self.car.pk),
+            ("remove", self.drivers[0], self.car.pk),
+            ("remove", self.drivers[2], self.car.pk),
+            ("add", self.drivers[0], self.cars[-1] + 100),
+            ("add", self.drivers[-1] + 100, self.car.pk),
+        ]
+
+        self.assertEqual(
+            apply_assignments(changes),
+            ["added", "unchanged", "duplicate", "unchanged", "unknown_car",
+             "unknown_driver"],
+        )
+        self.assertEqual(
+            assigned_pairs(),
+            {(self.drivers[0], self.car.pk), (self.drivers[1], self.car.pk)},
+        )
+
+    def test_queries_do_not_grow_with_changes(self):
+        removals = [("remove", self.drivers[0], self.car.pk)]
+        additions = [
+            ("add", driver_id, car_id)
+            for driver_id in self.drivers
+            for car_id in self.cars
+        ]
+
+        # Savepoint, drivers, cars, existing pairs and inserts per 500 pairs,
+        # one delete and the release
+        with self.assertNumQueries(1 + 2 + 2 + 2 + 1 + 1):
+            statuses = apply_assignments(removals + additions)
+
+        self.assertEqual(statuses.count("added"), len(additions) - 1)
+        self.assertEqual(statuses[0], "removed")
+        self.assertEqual(len(assigned_pairs()), len(additions) - 1)
+
+
+class BulkAssignmentViewTest(TestCase):
+    def setUp(self) -> None:
+        seed_fleet(manufacturers=1, cars=2, drivers=2, drivers_per_car=0)
+        self.user = get_user_model().objects.create_user(
+            username="staff", password="test12345", is_staff=True
+        )
+        self.client.force_login(self.user)
+        self.car = Car.objects.first()
+
+    def post(self, data):
+        return self.client.post(
+            ASSIGNMENTS_URL, json.dumps(data), content_type="application/json"
+        )
+
+    def test_reports_every_change(self):
+        response = self.post({"changes": [
+            {"action": "add", "driver": self.user.pk, "car": self.car.pk},
+            {"action": "remove", "driver": self.user.pk, "car": self.car.pk + 100},
+        ]})
+
+        self.assertEqual(response.json(), {"results": [
+            {"action": "add", "driver": self.user.pk, "car": self.car.pk,
+             "status": "added"},
+            {"action": "remove", "driver": self.user.pk, "car": self.car.pk + 100,
+             "status": "unknown_car"},
+        ]})
+        self.assertTrue(self.car.drivers.filter(pk=self.user.pk).exists())
+
+    def test_invalidates_car_fragment(self):
+        car_url = reverse("taxi:car-detail", kwargs={"pk": self.car.pk})
+        self.client.get(car_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.post({"changes": [
+                {"action": "add", "driver": self.user.pk, "car": self.car.pk},
+            ]})
+
+        self.assertNotContains(self.client.get(car_url), "No drivers!")
+
+    def test_rejects_invalid_changes(self):
+        for data in (
+            {},
+            {"changes": [{"action": "swap", "driver": 1, "car": 1}]},
+            {"changes": [{"action": "add", "driver": "x", "car": 1}]},
+        ):
+            with self.subTest(data=data):
+                self.assertEqual(self.post(data).status_code, 400)
+
+    @override_settings(TAXI_ASSIGNMENT_MAX_CHANGES=1)
+    def test_limits_changes_per_request(self):
+        change = {"action": "add", "driver": self.user.pk, "car": self.car.pk}
+
+        response = self.post({"changes": [change, change]})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(self.car.drivers.exists())
+
+    def test_staff_only(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.post({"changes": []})
+
+        self.assertEqual(response.status_code, 403)
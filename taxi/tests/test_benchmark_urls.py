@@ -0,0 +1,9 @@
+from django.test import SimpleTestCase
+
+from taxi.management.commands.benchmark_urls import ROUTES
+from taxi.urls import urlpatterns
+
+
+class BenchmarkRoutesTest(SimpleTestCase):
+    def test_every_route_is_benchmarked(self):
+        self.assertEqual({pattern.name for pattern in urlpatterns}, set(ROUTES))
@@ -1,5 +1,8 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from taxi.models import Car, Manufacturer
@@ -132,3 +135,102 @@ class PrivateCarTest(TestCase):
             )
             drivers_car = car.drivers.all().prefetch_related("cars")
             self.assertTrue(self.user in drivers_car)
+
+
+class DriverCarToggleTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+        self.manufacturer = Manufacturer.objects.create(
+            name="Test", country="Test country"
+        )
+        self.car = Car.objects.create(model="Test", manufacturer=self.manufacturer)
+
+    def toggle(self, car_id):
+        return self.client.post(reverse("taxi:driver-car", kwargs={"pk": car_id}))
+
+    def test_get_not_allowed(self):
+        response = self.client.get(reverse("taxi:driver-car", kwargs={"pk": self.car.id}))
+
+        self.assertEqual(response.status_code, 405)
+        self.assertFalse(self.car.drivers.exists())
+
+    def test_toggle_assigns_and_unassigns(self):
+        response = self.toggle(self.car.id)
+
+        self.assertRedirects(
+            response, reverse("taxi:car-detail", kwargs={"pk": self.car.id})
+        )
+        self.assertTrue(self.car.drivers.filter(pk=self.user.pk).exists())
+
+        self.toggle(self.car.id)
+        self.assertFalse(self.car.drivers.filter(pk=self.user.pk).exists())
+
+    def test_toggle_unknown_car(self):
+        response = self.toggle(self.car.id + 100)
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_toggle_query_count_does_not_grow(self):
+        def count_queries():
+            with CaptureQueriesContext(connection) as assign:
+                self.toggle(self.car.id)
+            with CaptureQueriesContext(connection) as unassign:
+                self.toggle(self.car.id)
+            return len(assign), len(unassign)
+
+        few_cars = count_queries()
+        self.user.cars.add(*[
+            Car.objects.create(model=f"Model {num}", manufacturer=self.manufacturer)
+            for num in range(50)
+        ])
+        many_cars = count_queries()
+
+        self.assertEqual(few_cars, many_cars)
+
+
+class CarDetailQueriesTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+        manufacturer = Manufacturer.objects.create(name="Test", country="Test country")
+        self.car = Car.objects.create(model="Test", manufacturer=manufacturer)
+        self.url = reverse("taxi:car-detail", kwargs={"pk": self.car.id})
+
+    def test_assigned_flag(self):
+        response = self.client.get(self.url)
+        self.assertFalse(response.context["is_assigned"])
+        self.assertContains(response, "Assign me to this car")
+
+        self.car.drivers.add(self.user)
+        response = self.client.get(self.url)
+        self.assertTrue(response.context["is_assigned"])
+        self.assertContains(response, "Delete me for this car")
+
+    def test_drivers_rendered_in_one_query(self):
+        self.car.drivers.add(*[
+            get_user_model().objects.create_user(
+                username=f"driver {num}",
+                password="test12345",
+                license_number=f"license {num}",
+            )
+            for num in range(10)
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        self.assertContains(response, "license 9")
+        driver_queries = [
+            query["sql"] for query in queries.captured_queries
+            if '"taxi_car_drivers"' in query["sql"]
+        ]
+        self.assertEqual(len(driver_queries), 2)
+        self.assertNotIn('"password"', driver_queries[1])
@@ -0,0 +1,217 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from taxi import dispatch
+from taxi.models import Car, DriverLocation, Manufacturer
+
+PINGS_URL = reverse("taxi:dispatch-pings")
+NEAREST_URL = reverse("taxi:dispatch-nearest")
+
+
+class GridIndexTest(SimpleTestCase):
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.index = dispatch.GridIndex(0.01)
+        self.positions = {}
+        for driver_id in range(2000):
+            lat = 50.45 + rng.uniform(-0.2, 0.2)
+            lon = 30.52 + rng.uniform(-0.3, 0.3)
+            self.positions[driver_id] = (lat, lon)
+            self.index.apply(driver_id, lat, lon, True, 100)
+
+    def brute_force(self, lat, lon, n):
+        return sorted(
+            (dispatch.haversine_km(lat, lon, d_lat, d_lon), driver_id)
+            for driver_id, (d_lat, d_lon) in self.positions.items()
+        )[:n]
+
+    def test_nearest_matches_full_scan(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            lat = 50.45 + rng.uniform(-0.25, 0.25)
+            lon = 30.52 + rng.uniform(-0.35, 0.35)
+            found = self.index.nearest(lat, lon, 10, 50)
+            self.assertEqual(
+                [driver_id for _, driver_id, _, _ in found],
+                [driver_id for _, driver_id in self.brute_force(lat, lon, 10)],
+            )
+
+    def test_unavailable_and_stale_drivers_are_skipped(self):
+        closest = self.index.nearest(50.45, 30.52, 1, 50)[0][1]
+        self.index.apply(closest, 50.45, 30.52, False, 101)
+
+        self.assertNotIn(
+            closest, [found[1] for found in self.index.nearest(50.45, 30.52, 5, 50)]
+        )
+        self.index.apply(1, 50.45, 30.52, True, 200)
+        self.assertEqual(
+            [found[1] for found in self.index.nearest(50.45, 30.52, 5, 50, 150)], [1]
+        )
+
+    def test_older_position_is_ignored(self):
+        self.index.apply(1, 10.0, 10.0, True, 300)
+        self.index.apply(1, 50.45, 30.52, True, 200)
+
+        self.assertEqual(self.index.nearest(10.0, 10.0, 1, 1)[0][1], 1)
+
+    def test_radius_limits_results(self):
+        self.assertEqual(self.index.nearest(0.0, 0.0, 5, 50), [])
+
+    def test_polar_search_is_bounded(self):
+        self.index.apply(1, 89.9, 180.0, True, 200)
+
+        with mock.patch.object(
+            dispatch.GridIndex, "_ring", wraps=dispatch.GridIndex._ring
+        ) as ring:
+            found = self.index.nearest(89.5, 0.0, 5, 100)
+
+        self.assertEqual([driver_id for _, driver_id, _, _ in found], [1])
+        self.assertLess(ring.call_count, 50)
+
+    def test_prune(self):
+        self.index.apply(1, 50.45, 30.52, True, 200)
+        self.index.prune(150)
+
+        self.assertEqual(len(self.index), 1)
+
+
+class DispatchViewsTest(TestCase):
+    def setUp(self) -> None:
+        dispatch.reset()
+        self.addCleanup(dispatch.reset)
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+            license_number="ABC12345",
+        )
+        self.client.force_login(self.user)
+        manufacturer = Manufacturer.objects.create(name="Skoda", country="Czech")
+        self.car = Car.objects.create(model="Octavia", manufacturer=manufacturer)
+        self.car.drivers.add(self.user)
+
+    def ping(self, data):
+        return self.client.post(
+            PINGS_URL, json.dumps(data), content_type="application/json"
+        )
+
+    def test_driver_ping_is_found_with_cars(self):
+        response = self.ping({"latitude": 50.45, "longitude": 30.52})
+
+        self.assertEqual(response.status_code, 202)
+        response = self.client.get(NEAREST_URL, {"lat": 50.451, "lon": 30.52})
+        results = response.json()["results"]
+        self.assertEqual([result["id"] for result in results], [self.user.id])
+        self.assertAlmostEqual(results[0]["distance_km"], 0.111, places=2)
+        self.assertEqual(results[0]["cars"], [{"id": self.car.id, "model": "Octavia"}])
+
+    def test_unavailable_driver_is_not_found(self):
+        self.ping({"latitude": 50.45, "longitude": 30.52})
+        self.ping({"latitude": 50.45, "longitude": 30.52, "available": False})
+
+        response = self.client.get(NEAREST_URL, {"lat": 50.45, "lon": 30.52})
+        self.assertEqual(response.json()["results"], [])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.ping({"latitude": 91, "longitude": 0}).status_code, 400)
+        self.assertEqual(self.ping(["x"]).status_code, 400)
+        for available in ("false", "0", 0, None):
+            with self.subTest(available=available):
+                response = self.ping(
+                    {"latitude": 50.45, "longitude": 30.52, "available": available}
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(dispatch.index), 0)
+        self.assertEqual(self.client.get(PINGS_URL).status_code, 405)
+        self.assertEqual(
+            self.client.get(NEAREST_URL, {"lat": "x", "lon": 1}).status_code, 400
+        )
+        for km in ("nan", "inf", "-1", "0", "far"):
+            with self.subTest(km=km):
+                response = self.client.get(
+                    NEAREST_URL, {"lat": 50.45, "lon": 30.52, "km": km}
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_batches_need_staff(self):
+        batch = {"pings": [{"driver": self.user.id, "latitude": 1, "longitude": 1}]}
+
+        self.assertEqual(self.ping(batch).status_code, 403)
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.ping(batch).status_code, 202)
+
+    @override_settings(TAXI_DISPATCH_FLUSH_SIZE=2)
+    def test_pings_are_written_in_batches(self):
+        other = get_user_model().objects.create_user(
+            username="other", password="test12345", license_number="ABC12346"
+        )
+        self.user.is_staff = True
+        self.user.save()
+
+        self.ping({"latitude": 50.45, "longitude": 30.52})
+        self.assertFalse(DriverLocation.objects.exists())
+        self.ping({"pings": [
+            {"driver": other.id, "latitude": 50.46, "longitude": 30.53},
+            {"driver": 0, "latitude": 50.46, "longitude": 30.53},
+        ]})
+
+        self.assertEqual(
+            set(DriverLocation.objects.values_list("driver_id", flat=True)),
+            {self.user.id, other.id},
+        )
+        self.ping({"latitude": 50.47, "longitude": 30.54, "available": False})
+        self.ping({"pings": [{"driver": other.id, "latitude": 1, "longitude": 1}]})
+        location = DriverLocation.objects.get(driver=self.user)
+        self.assertEqual(
+            (location.latitude, location.is_available), (50.47, False)
+        )
+
+    def test_due_pings_are_written_on_read(self):
+        self.ping({"latitude": 50.45, "longitude": 30.52})
+        self.client.get(NEAREST_URL, {"lat": 50.45, "lon": 30.52})
+        self.assertFalse(DriverLocation.objects.exists())
+
+        later = dispatch.time.time() + dispatch.flush_seconds()
+        with mock.patch.object(dispatch.time, "time", return_value=later):
+            self.client.get(NEAREST_URL, {"lat": 50.45, "lon": 30.52})
+
+        self.assertTrue(DriverLocation.objects.filter(driver=self.user).exists())
+
+    def test_pings_are_written_at_exit(self):
+        self.ping({"latitude": 50.45, "longitude": 30.52})
+
+        dispatch.flush_at_exit()
+
+        self.assertTrue(DriverLocation.objects.filter(driver=self.user).exists())
+        self.assertEqual(len(dispatch.buffer), 0)
+
+    def test_sync_reads_positions_written_elsewhere(self):
+        now = datetime.now(timezone.utc)
+        DriverLocation.objects.create(
+            driver=self.user, latitude=50.45, longitude=30.52, updated_at=now
+        )
+        stale = get_user_model().objects.create_user(
+            username="stale", password="test12345", license_number="ABC12347"
+        )
+        DriverLocation.objects.create(
+            driver=stale,
+            latitude=50.45,
+            longitude=30.52,
+            updated_at=now - timedelta(hours=1),
+        )
+
+        found = dispatch.nearest_drivers(50.45, 30.52, 5)
+
+        self.assertEqual([driver_id for _, driver_id, _, _ in found], [self.user.id])
+        DriverLocation.objects.filter(driver=self.user).update(
+            is_available=False, updated_at=now + timedelta(seconds=1)
+        )
+        dispatch.sync_index(force=True)
+        self.assertEqual(dispatch.nearest_drivers(50.45, 30.52, 5), [])
+        self.assertEqual(len(dispatch.index), 0)
@@ -105,3 +105,46 @@ class PrivateCarTest(TestCase):
             reverse("taxi:driver-delete", kwargs={"pk": 3}),
         )
         self.assertRedirects(post_response, reverse("taxi:driver-list"), status_code=302)
+
+
+class DriverSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+            license_number="ZZZ00000",
+        )
+        self.client.force_login(self.user)
+
+        for driver_num in range(1, 26):
+            Driver.objects.create(
+                username=f"driver{driver_num:02d}",
+                license_number=f"ABC{driver_num:05d}",
+            )
+
+    def search(self, **params):
+        return self.client.get(reverse("taxi:driver-search"), params).json()
+
+    def test_search_by_username_prefix(self):
+        data = self.search(q="driver1")
+
+        self.assertEqual(len(data["results"]), 10)
+        self.assertIsNone(data["next"])
+
+    def test_search_by_license_number_prefix(self):
+        data = self.search(q="abc00002")
+
+        self.assertEqual(
+            [driver["text"] for driver in data["results"]],
+            [str(driver) for driver in Driver.objects.filter(
+                license_number__startswith="ABC00002"
+            ).order_by("username")]
+        )
+
+    def test_search_pages_with_cursor(self):
+        first = self.search(q="driver")
+        second = self.search(q="driver", cursor=first["next"])
+
+        self.assertEqual(len(first["results"]), 20)
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next"])
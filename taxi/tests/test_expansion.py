@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from taxi.expansion import license_error, license_errors
+from taxi.form import DriverLicenseUpdateForm
+
+
+class LicenseValidationTest(TestCase):
+    def setUp(self) -> None:
+        self.driver = get_user_model().objects.create_user(
+            username="driver", password="test12345", license_number="AAA11111"
+        )
+
+    def test_license_rules(self):
+        cases = {
+            "ABC12345": None,
+            "ABC1234": "License number must contain exactly 8 characters",
+            "AbC12345": "First 3 characters are uppercase letters",
+            "ÀBC12345": "First 3 characters are uppercase letters",
+            "ABC1234X": "Last 5 characters are digits",
+            "ABC١٢٣٤٥": "Last 5 characters are digits",
+        }
+        for license_number, error in cases.items():
+            with self.subTest(license_number=license_number):
+                self.assertEqual(license_error(license_number), error)
+
+    def test_batch_checks_taken_numbers_in_one_query(self):
+        with self.assertNumQueries(1):
+            errors = license_errors(
+                ["AAA11111", "BBB22222", "BBB22222", "bad", "CCC33333"]
+            )
+
+        self.assertEqual(
+            errors,
+            [
+                "License number is taken",
+                None,
+                "License number is repeated",
+                "License number must contain exactly 8 characters",
+                None,
+            ],
+        )
+
+    def test_batch_excludes_own_license(self):
+        with self.assertNumQueries(0):
+            license_errors(["AAA11111"], check_taken=False)
+
+        self.assertEqual(
+            license_errors(["AAA11111"], exclude_pks=[self.driver.pk]), [None]
+        )
+
+    def test_update_form_rejects_invalid_and_taken_numbers(self):
+        other = get_user_model().objects.create_user(
+            username="other", password="test12345", license_number="BBB22222"
+        )
+        for license_number in ("BBB2222X", "AAA11111"):
+            with self.subTest(license_number=license_number):
+                form = DriverLicenseUpdateForm(
+                    data={"license_number": license_number}, instance=other
+                )
+                self.assertFalse(form.is_valid())
+                self.assertIn("license_number", form.errors)
+
+    def test_admin_validates_license_number(self):
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="admin12345"
+        )
+        self.client.force_login(admin)
+
+        response = self.client.post(
+            reverse("admin:taxi_driver_change", args=[self.driver.pk]),
+            {
+                "username": self.driver.username,
+                "date_joined_0": "2026-01-01",
+                "date_joined_1": "00:00:00",
+                "license_number": "aaa11111",
+            },
+        )
+
+        self.assertContains(response, "First 3 characters are uppercase letters")
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.license_number, "AAA11111")
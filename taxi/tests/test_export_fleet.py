@@ -0,0 +1,69 @@
+import json
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from taxi.exporters import stream_export
+from taxi.models import Car, Manufacturer
+
+
+class ExportFleetTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="staff",
+            password="test12345",
+            license_number="AAA11111",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+        manufacturer = Manufacturer.objects.create(name="Toyota", country="Japan")
+        for num in range(5):
+            car = Car.objects.create(model=f"Corolla {num}", manufacturer=manufacturer)
+            car.drivers.add(self.user)
+
+    def test_export_cars_csv(self):
+        response = self.client.get(
+            reverse("taxi:fleet-export", kwargs={"kind": "cars", "fmt": "csv"})
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(lines[0], "id,model,manufacturer,drivers")
+        self.assertEqual(len(lines), 6)
+        self.assertTrue(lines[1].endswith(",Corolla 0,Toyota,staff"))
+
+    def test_export_requires_staff(self):
+        self.user.is_staff = False
+        self.user.save()
+
+        response = self.client.get(
+            reverse("taxi:fleet-export", kwargs={"kind": "cars", "fmt": "csv"})
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_unknown_export(self):
+        response = self.client.get(
+            reverse("taxi:fleet-export", kwargs={"kind": "trips", "fmt": "csv"})
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_car_assignments_fetched_per_chunk(self):
+        with self.assertNumQueries(4):
+            rows = [json.loads(line) for line in stream_export("cars", "jsonl", 2)]
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[4]["drivers"], ["staff"])
+
+    def test_export_command(self):
+        stdout = StringIO()
+        call_command("export_fleet", "manufacturers", format="jsonl", stdout=stdout)
+
+        self.assertEqual(
+            json.loads(stdout.getvalue()),
+            {"id": Manufacturer.objects.get().id, "name": "Toyota", "country": "Japan"},
+        )
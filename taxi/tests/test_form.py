@@ -111,3 +111,16 @@ class FormsTests(TestCase):
                 attrs={"placeholder": "Search by model.."}
             )
         )
+
+    def test_car_form_renders_only_selected_drivers(self):
+        selected = get_user_model().objects.create_user(
+            username="selected", password="test12345", license_number="AAA11111"
+        )
+        get_user_model().objects.create_user(
+            username="other", password="test12345", license_number="AAA22222"
+        )
+        form = CarForm(initial={"drivers": [selected.pk]})
+        html = str(form["drivers"])
+
+        self.assertIn(f'value="{selected.pk}" selected', html)
+        self.assertNotIn("other", html)
@@ -0,0 +1,79 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from taxi import fragments
+from taxi.models import Car, Manufacturer
+
+
+class DetailFragmentCacheTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+            license_number="AAA11111",
+        )
+        self.client.force_login(self.user)
+        self.driver = get_user_model().objects.create_user(
+            username="driver",
+            password="test12345",
+            license_number="BBB22222",
+        )
+        self.manufacturer = Manufacturer.objects.create(
+            name="Skoda", country="Czechia"
+        )
+        self.car = Car.objects.create(model="Octavia", manufacturer=self.manufacturer)
+        self.car_url = reverse("taxi:car-detail", kwargs={"pk": self.car.pk})
+        self.driver_url = reverse("taxi:driver-detail", kwargs={"pk": self.driver.pk})
+
+    def test_repeat_views_are_served_from_cache(self):
+        self.client.get(self.car_url)
+        self.client.get(self.car_url)
+
+        self.assertEqual(fragments.stats(), {"hits": 1, "misses": 1})
+
+    def test_assignment_invalidates_car_and_driver(self):
+        self.client.get(self.car_url)
+        self.client.get(self.driver_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.car.drivers.add(self.driver)
+
+        self.assertContains(self.client.get(self.car_url), "BBB22222")
+        self.assertContains(self.client.get(self.driver_url), "Octavia")
+
+    def test_toggle_invalidates_car(self):
+        self.client.get(self.car_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("taxi:driver-car", kwargs={"pk": self.car.pk}))
+
+        self.assertContains(self.client.get(self.car_url), "AAA11111")
+
+    def test_driver_change_invalidates_car(self):
+        self.car.drivers.add(self.driver)
+        self.client.get(self.car_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.driver.license_number = "CCC33333"
+            self.driver.save()
+
+        self.assertContains(self.client.get(self.car_url), "CCC33333")
+
+    def test_manufacturer_change_invalidates_driver(self):
+        self.car.drivers.add(self.driver)
+        self.client.get(self.driver_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manufacturer.name = "Volkswagen"
+            self.manufacturer.save()
+
+        self.assertContains(self.client.get(self.driver_url), "Volkswagen")
+
+    def test_invalidation_waits_for_commit(self):
+        self.client.get(self.car_url)
+        self.car.drivers.add(self.driver)
+
+        self.assertNotContains(self.client.get(self.car_url), "BBB22222")
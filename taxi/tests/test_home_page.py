@@ -1,8 +1,15 @@
+import time
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import AsyncClient, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
-from taxi.models import Manufacturer, Car, Driver
+from taxi.models import Manufacturer, Car, CarSearchTrigram, Driver
 
 INDEX_URL = reverse("taxi:index")
 
@@ -16,6 +23,7 @@ class PublicIndexTest(TestCase):
 
 class PrivateIndexTest(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             username="test",
             password="test12345"
@@ -54,3 +62,125 @@ class PrivateIndexTest(TestCase):
         self.assertEqual(response.context["num_cars"], form_data["num_cars"])
         self.assertEqual(response.context["num_manufacturers"], form_data["num_manufacturers"])
         self.assertEqual(response.context["num_visits"], form_data["num_visits"])
+
+    def test_home_page_counts_are_cached(self):
+        self.client.get(INDEX_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_cars"], 1)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_home_page_counts_follow_changes(self):
+        self.client.get(INDEX_URL)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Manufacturer.objects.create(
+                name="Another manufacturer",
+                country="Test country"
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            Car.objects.filter(model="Test model").delete()
+        response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_manufacturers"], 2)
+        self.assertEqual(response.context["num_cars"], 0)
+
+    def test_uncounted_models_keep_fast_deletes(self):
+        collector = Collector(using="default")
+
+        for model in (CarSearchTrigram, Car.drivers.through):
+            with self.subTest(model=model):
+                self.assertTrue(collector.can_fast_delete(model))
+
+
+class AsyncIndexTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+    async def test_anonymous_redirected_to_login(self):
+        response = await AsyncClient().get(INDEX_URL)
+
+        self.assertRedirects(
+            response, f"{reverse('login')}?next={INDEX_URL}",
+            fetch_redirect_response=False
+        )
+
+    async def test_retrieve_home_page(self):
+        response = await self.async_client.get(INDEX_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["num_visits"], 1)
+
+
+@override_settings(
+    TAXI_VISITS_BUFFERED=True, TAXI_VISITS_FLUSH_EVERY=3, TAXI_VISITS_FLUSH_SECONDS=300
+)
+class BufferedVisitsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+
+    def test_visits_are_counted_without_writes(self):
+        self.client.get(INDEX_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_visits"], 2)
+        self.assertFalse(
+            any(
+                query["sql"].startswith(("UPDATE", "INSERT"))
+                for query in queries.captured_queries
+            )
+        )
+        self.assertNotIn("num_visits", self.client.session)
+
+    def test_visits_are_flushed_to_session(self):
+        for _ in range(3):
+            self.client.get(INDEX_URL)
+
+        self.assertEqual(self.client.session["num_visits"], 3)
+
+        response = self.client.get(INDEX_URL)
+        self.assertEqual(response.context["num_visits"], 4)
+
+    def test_visits_are_flushed_after_delay(self):
+        self.client.get(INDEX_URL)
+
+        with mock.patch("taxi.visits.time.time", return_value=time.time() + 301):
+            response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_visits"], 2)
+        self.assertEqual(self.client.session["num_visits"], 2)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_signed_cookie_sessions_store_count_directly(self):
+        self.client.force_login(self.user)
+
+        self.client.get(INDEX_URL)
+        response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_visits"], 2)
+        self.assertEqual(self.client.session["num_visits"], 2)
+
+    @override_settings(TAXI_VISITS_BUFFERED=False)
+    def test_unshared_cache_stores_count_directly(self):
+        self.client.get(INDEX_URL)
+        response = self.client.get(INDEX_URL)
+
+        self.assertEqual(response.context["num_visits"], 2)
+        self.assertEqual(self.client.session["num_visits"], 2)
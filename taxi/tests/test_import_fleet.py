@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from taxi.models import Car, Driver, Manufacturer
+
+
+class ImportFleetTest(TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as target:
+            target.write(content)
+        return path
+
+    def run_import(self, *args, **options):
+        stderr = StringIO()
+        call_command(
+            "import_fleet", *args, stdout=StringIO(), stderr=stderr, **options
+        )
+        return stderr.getvalue()
+
+    def test_import_manufacturers_csv(self):
+        Manufacturer.objects.create(name="BMW", country="Germany")
+        path = self.write(
+            "manufacturers.csv",
+            "name,country\nToyota,Japan\nBMW,Germany\nSkoda,Czechia\n",
+        )
+
+        errors = self.run_import("manufacturers", path, chunk_size=2)
+
+        self.assertEqual(Manufacturer.objects.count(), 3)
+        self.assertIn("Row 2: Manufacturer 'BMW' already exists", errors)
+
+    def test_import_drivers_jsonl(self):
+        rows = [
+            {"username": "first", "license_number": "ABC12345", "password": "pass12345"},
+            {"username": "second", "license_number": "abc12345"},
+            {"username": "third", "license_number": "XYZ54321"},
+        ]
+        path = self.write(
+            "drivers.jsonl", "\n".join(json.dumps(row) for row in rows)
+        )
+
+        errors = self.run_import("drivers", path)
+
+        self.assertEqual(
+            set(Driver.objects.values_list("username", flat=True)),
+            {"first", "third"},
+        )
+        self.assertIn("First 3 characters are uppercase letters", errors)
+        self.assertTrue(Driver.objects.get(username="first").check_password("pass12345"))
+        self.assertFalse(Driver.objects.get(username="third").has_usable_password())
+
+    def test_import_drivers_with_repeated_license(self):
+        path = self.write(
+            "drivers.csv",
+            "username,license_number\nfirst,ABC12345\nsecond,ABC12345\n",
+        )
+
+        errors = self.run_import("drivers", path)
+
+        self.assertEqual(
+            list(Driver.objects.values_list("username", flat=True)), ["first"]
+        )
+        self.assertIn("Row 2: 'ABC12345': License number is repeated", errors)
+
+    def test_import_cars_with_drivers(self):
+        Manufacturer.objects.create(name="Toyota", country="Japan")
+        first = Driver.objects.create(username="first", license_number="ABC12345")
+        second = Driver.objects.create(username="second", license_number="ABC54321")
+        path = self.write(
+            "cars.csv",
+            "model,manufacturer,drivers\n"
+            "Corolla,Toyota,first;second\n"
+            "Camry,Toyota,\n"
+            "Golf,Volkswagen,first\n",
+        )
+
+        errors = self.run_import("cars", path)
+
+        self.assertEqual(
+            set(Car.objects.get(model="Corolla").drivers.all()), {first, second}
+        )
+        self.assertTrue(Car.objects.filter(model="Camry").exists())
+        self.assertIn("Row 3: Unknown manufacturer 'Volkswagen'", errors)
+
+    def test_import_cars_invalidates_driver_pages(self):
+        cache.clear()
+        Manufacturer.objects.create(name="Toyota", country="Japan")
+        driver = Driver.objects.create(username="first", license_number="ABC12345")
+        self.client.force_login(driver)
+        driver_url = reverse("taxi:driver-detail", kwargs={"pk": driver.pk})
+        self.client.get(driver_url)
+        path = self.write("cars.csv", "model,manufacturer,drivers\nCorolla,Toyota,first\n")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_import("cars", path)
+
+        self.assertContains(self.client.get(driver_url), "Corolla")
+
+    def test_resume_from_checkpoint(self):
+        path = self.write(
+            "manufacturers.csv",
+            "name,country\nToyota,Japan\nBMW,Germany\nSkoda,Czechia\n",
+        )
+        checkpoint = self.write("manufacturers.checkpoint", json.dumps({"rows": 2}))
+
+        self.run_import("manufacturers", path, resume=True, checkpoint=checkpoint)
+
+        self.assertEqual(
+            list(Manufacturer.objects.values_list("name", flat=True)), ["Skoda"]
+        )
+        self.assertFalse(os.path.exists(checkpoint))
@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from taxi.models import Manufacturer, Car
+
+MANUFACTURER_URL = reverse("taxi:manufacturer-list")
+CAR_URL = reverse("taxi:car-list")
+
+
+class KeysetPaginationTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+
+        for manufacturer_num in range(1, 7):
+            manufacturer = Manufacturer.objects.create(
+                name=f"Test {manufacturer_num}",
+                country=f"Test country {manufacturer_num}",
+            )
+            Car.objects.create(
+                model=f"Model {manufacturer_num}",
+                manufacturer=manufacturer,
+            )
+
+    def test_offset_pagination_is_default(self):
+        response = self.client.get(MANUFACTURER_URL)
+
+        self.assertEqual(response.context["paginator"].num_pages, 3)
+
+    def test_first_page(self):
+        response = self.client.get(MANUFACTURER_URL, {"cursor": ""})
+        page = response.context["page_obj"]
+
+        self.assertEqual(
+            list(response.context["manufacturer_list"]),
+            list(Manufacturer.objects.all()[:2])
+        )
+        self.assertTrue(page.has_next())
+        self.assertFalse(page.has_previous())
+        self.assertIsNone(page.count)
+
+    def test_walk_forward_and_back(self):
+        response = self.client.get(MANUFACTURER_URL, {"cursor": ""})
+        first_page = list(response.context["manufacturer_list"])
+
+        response = self.client.get(
+            MANUFACTURER_URL,
+            {"cursor": response.context["page_obj"].next_cursor}
+        )
+        self.assertEqual(
+            list(response.context["manufacturer_list"]),
+            list(Manufacturer.objects.all()[2:4])
+        )
+
+        response = self.client.get(
+            MANUFACTURER_URL,
+            {"cursor": response.context["page_obj"].previous_cursor}
+        )
+        self.assertEqual(list(response.context["manufacturer_list"]), first_page)
+
+    def test_last_page_has_no_next(self):
+        cursor = ""
+        seen = []
+        for _ in range(3):
+            response = self.client.get(CAR_URL, {"cursor": cursor})
+            seen += list(response.context["car_list"])
+            cursor = response.context["page_obj"].next_cursor
+
+        self.assertIsNone(cursor)
+        self.assertEqual(
+            seen,
+            list(Car.objects.order_by("manufacturer_id", "id"))
+        )
+
+    def test_count_only_when_requested(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(MANUFACTURER_URL, {"cursor": ""})
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+
+        response = self.client.get(MANUFACTURER_URL, {"cursor": "", "count": "1"})
+        self.assertEqual(response.context["page_obj"].count, 6)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(MANUFACTURER_URL, {"cursor": "broken"})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class PageSizeTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+        for manufacturer_num in range(1, 7):
+            Manufacturer.objects.create(
+                name=f"Test {manufacturer_num}",
+                country=f"Test country {manufacturer_num}",
+            )
+
+    def page_length(self, **params):
+        response = self.client.get(MANUFACTURER_URL, params)
+        return len(response.context["manufacturer_list"])
+
+    def test_default_from_settings(self):
+        self.assertEqual(self.page_length(), 2)
+
+        with self.settings(TAXI_PAGE_SIZES={"manufacturer": 4}):
+            self.assertEqual(self.page_length(), 4)
+
+    def test_falls_back_to_paginate_by(self):
+        with self.settings(TAXI_PAGE_SIZES={}):
+            self.assertEqual(self.page_length(), 2)
+            self.assertEqual(self.page_length(page_size=0), 2)
+
+    def test_requested_page_size(self):
+        self.assertEqual(self.page_length(page_size=5), 5)
+        self.assertEqual(self.page_length(page_size=5, cursor=""), 5)
+
+    def test_page_size_is_capped(self):
+        with self.settings(TAXI_MAX_PAGE_SIZE=3):
+            self.assertEqual(self.page_length(page_size=1000), 3)
+
+    def test_invalid_page_size_uses_default(self):
+        self.assertEqual(self.page_length(page_size="many"), 2)
+        self.assertEqual(self.page_length(page_size=0), 2)
+
+    def test_pagination_links_keep_page_size(self):
+        response = self.client.get(MANUFACTURER_URL, {"page_size": 4})
+
+        self.assertContains(response, "page_size=4&amp;page=2")
@@ -0,0 +1,105 @@
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+
+from taxi import perf
+from taxi.models import Manufacturer
+
+METRICS_URL = reverse("taxi:metrics")
+
+
+class HistogramTest(TestCase):
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = perf.Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3):
+            histogram.observe(value)
+
+        buckets = list(histogram.buckets())
+
+        self.assertEqual(buckets, [(1, 1), (2, 3), (4, 4), (float("inf"), 4)])
+        self.assertEqual(perf.quantile(buckets, 0.5), 1.5)
+        self.assertEqual(perf.quantile(buckets, 1.0), 4)
+        self.assertIsNone(perf.quantile([], 0.5))
+
+    def test_prometheus_text_round_trip(self):
+        perf.reset()
+        perf.observe("taxi:index", {"taxi_request_seconds": 0.02})
+
+        text = perf.render_prometheus({"taxi_fragment_cache_hits": {"": 3}})
+
+        self.assertIn('taxi_request_seconds_count{view="taxi:index"} 1', text)
+        self.assertIn("taxi_fragment_cache_hits 3", text)
+        histogram = perf.parse_prometheus(text)["taxi_request_seconds", "taxi:index"]
+        self.assertEqual(histogram["buckets"][-1], (float("inf"), 1))
+        self.assertEqual(histogram["sum"], 0.02)
+        self.assertEqual(histogram["count"], 1)
+
+
+@override_settings(TAXI_PERF_SAMPLE_RATE=1)
+class PerformanceMiddlewareTest(TestCase):
+    def setUp(self) -> None:
+        perf.reset()
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+        Manufacturer.objects.create(name="Test", country="Test country")
+        self.async_client = AsyncClient()
+        self.async_client.force_login(self.user)
+
+    def test_records_view_timings(self):
+        self.client.get(reverse("taxi:manufacturer-list"))
+
+        stats = perf.snapshot()
+        _, db_queries, count = stats["taxi_request_db_queries", "taxi:manufacturer-list"]
+        _, template_seconds, _ = stats[
+            "taxi_request_template_seconds", "taxi:manufacturer-list"
+        ]
+        _, response_bytes, _ = stats["taxi_response_bytes", "taxi:manufacturer-list"]
+        self.assertEqual(count, 1)
+        self.assertGreater(db_queries, 0)
+        self.assertGreater(template_seconds, 0)
+        self.assertGreater(response_bytes, 0)
+
+    async def test_records_async_view_queries(self):
+        await self.async_client.get(reverse("taxi:index"))
+
+        _, db_queries, count = perf.snapshot()["taxi_request_db_queries", "taxi:index"]
+        self.assertEqual(count, 1)
+        self.assertGreater(db_queries, 0)
+
+    @override_settings(TAXI_PERF_SAMPLE_RATE=0)
+    def test_unsampled_requests_are_not_recorded(self):
+        self.client.get(reverse("taxi:manufacturer-list"))
+
+        self.assertEqual(perf.snapshot(), {})
+
+    @override_settings(TAXI_METRICS_TOKEN="secret")
+    def test_metrics_endpoint(self):
+        self.client.get(reverse("taxi:manufacturer-list"))
+
+        response = self.client.get(METRICS_URL, HTTP_AUTHORIZATION="Bearer secret")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(
+            response, 'taxi_request_seconds_count{view="taxi:manufacturer-list"} 1'
+        )
+
+    @override_settings(TAXI_METRICS_TOKEN="secret")
+    def test_metrics_endpoint_closed_to_non_staff(self):
+        for headers in ({}, {"HTTP_AUTHORIZATION": "Bearer wrong"}):
+            with self.subTest(headers=headers):
+                response = self.client.get(
+                    METRICS_URL, REMOTE_ADDR="127.0.0.1", **headers
+                )
+
+                self.assertEqual(response.status_code, 403)
+
+    def test_metrics_endpoint_open_to_staff(self):
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.get(METRICS_URL, REMOTE_ADDR="10.0.0.1")
+
+        self.assertEqual(response.status_code, 200)
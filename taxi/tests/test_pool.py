@@ -0,0 +1,91 @@
+import threading
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from taxi_service.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTest(SimpleTestCase):
+    def test_reuses_released_connection(self):
+        pool = ConnectionPool(max_size=2)
+
+        first = pool.acquire(FakeConnection)
+        pool.release(first)
+
+        self.assertIs(pool.acquire(FakeConnection), first)
+        self.assertEqual(pool.stats()["created"], 1)
+
+    def test_bounded_size_times_out(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+        pool.acquire(FakeConnection)
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire(FakeConnection)
+        self.assertEqual(pool.stats()["timeouts"], 1)
+        self.assertEqual(pool.stats()["saturation"], 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(max_size=1, timeout=5)
+        held = pool.acquire(FakeConnection)
+        timer = threading.Timer(0.05, pool.release, [held])
+        timer.start()
+
+        self.assertIs(pool.acquire(FakeConnection), held)
+        timer.join()
+        self.assertEqual(pool.stats()["waits"], 1)
+        self.assertGreater(pool.stats()["wait_seconds_max"], 0)
+
+    def test_recycles_after_max_lifetime(self):
+        pool = ConnectionPool(max_size=1, max_lifetime=60)
+        with mock.patch("taxi_service.db.pool.time.monotonic", return_value=0):
+            old = pool.acquire(FakeConnection)
+            pool.release(old)
+
+        with mock.patch("taxi_service.db.pool.time.monotonic", return_value=61):
+            new = pool.acquire(FakeConnection)
+
+        self.assertIsNot(new, old)
+        self.assertTrue(old.closed)
+        self.assertEqual(pool.stats()["recycled"], 1)
+
+    def test_health_check_after_idle(self):
+        pool = ConnectionPool(max_size=1, check_idle=10, check=lambda connection: False)
+        with mock.patch("taxi_service.db.pool.time.monotonic", return_value=0):
+            stale = pool.acquire(FakeConnection)
+            pool.release(stale)
+            self.assertIs(pool.acquire(FakeConnection), stale)
+            pool.release(stale)
+
+        with mock.patch("taxi_service.db.pool.time.monotonic", return_value=11):
+            fresh = pool.acquire(FakeConnection)
+
+        self.assertIsNot(fresh, stale)
+        self.assertEqual(pool.stats()["failed_checks"], 1)
+
+    def test_failed_reset_discards(self):
+        pool = ConnectionPool(max_size=1, reset=lambda connection: False)
+        broken = pool.acquire(FakeConnection)
+
+        pool.release(broken)
+
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.stats()["size"], 0)
+
+    def test_failed_connect_frees_slot(self):
+        pool = ConnectionPool(max_size=1, timeout=0.01)
+
+        def refuse():
+            raise OSError("refused")
+
+        with self.assertRaises(OSError):
+            pool.acquire(refuse)
+        self.assertIsInstance(pool.acquire(FakeConnection), FakeConnection)
@@ -0,0 +1,142 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from taxi import dispatch
+from taxi.models import Car, Driver, Manufacturer
+from taxi.synthetic import seed_fleet
+from taxi.tests.query_budget import query_budget
+from taxi.urls import urlpatterns
+
+MAX_SECONDS = 2.0
+
+
+def assignment_changes(objects):
+    """Assign the driver to the car and unassign the user driver-car assigned."""
+    car = objects["car"].pk
+    return {"changes": [
+        {"action": "add", "driver": objects["driver"].pk, "car": car},
+        {"action": "remove", "driver": objects["user"].pk, "car": car},
+    ]}
+
+
+# url name: {
+#     "queries": most queries the request may run,
+#     "method": HTTP method, "get" when left out,
+#     "pk": test object whose pk the url takes, or "kwargs": url kwargs,
+#     "data": request data, or a function of the test objects returning it,
+#     "content_type": content type of the data,
+# }
+BUDGETS = {
+    "index": {"queries": 5},
+    "manufacturer-list": {"queries": 3},
+    "manufacturer-create": {"queries": 1},
+    "manufacturer-update": {"queries": 2, "pk": "manufacturer"},
+    "manufacturer-delete": {"queries": 2, "pk": "manufacturer"},
+    "car-list": {"queries": 3},
+    "car-detail": {"queries": 4, "pk": "car"},
+    "car-create": {"queries": 2},
+    "car-update": {"queries": 5, "pk": "car"},
+    "car-delete": {"queries": 2, "pk": "car"},
+    "driver-list": {"queries": 3},
+    "driver-search": {"queries": 2},
+    "driver-detail": {"queries": 3, "pk": "driver"},
+    "driver-create": {"queries": 1},
+    "driver-license": {"queries": 2, "pk": "driver"},
+    "driver-delete": {"queries": 2, "pk": "driver"},
+    "driver-car": {"queries": 6, "method": "post", "pk": "car"},
+    "assignments": {
+        "queries": 8,
+        "method": "post",
+        "data": assignment_changes,
+        "content_type": "application/json",
+    },
+    "fleet-export": {"queries": 2, "kwargs": {"kind": "drivers", "fmt": "csv"}},
+    "metrics": {"queries": 1},
+    "dispatch-pings": {
+        "queries": 1,
+        "method": "post",
+        "data": {"latitude": 50.45, "longitude": 30.52, "available": True},
+        "content_type": "application/json",
+    },
+    "dispatch-nearest": {"queries": 4, "data": {"lat": 50.45, "lon": 30.52, "n": 10}},
+    "analytics": {"queries": 5},
+    "analytics-fleet": {"queries": 1},
+}
+
+
+# Budgets count the views' own queries, with sessions and visits kept in the
+# cache as they are in production with a shared cache, and buffered pings not
+# yet due for a write
+@override_settings(
+    SESSION_ENGINE="django.contrib.sessions.backends.cached_db",
+    TAXI_VISITS_BUFFERED=True,
+    TAXI_DISPATCH_FLUSH_SECONDS=60,
+)
+class QueryBudgetTest(TestCase):
+    """Every taxi route stays within its query budget, whatever the fleet size."""
+
+    def setUp(self) -> None:
+        self.addCleanup(dispatch.reset)
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345",
+            is_staff=True,
+        )
+        self.client.force_login(self.user)
+        seed_fleet(manufacturers=3, cars=5, drivers=5)
+        self.objects = {
+            "manufacturer": Manufacturer.objects.first(),
+            "car": Car.objects.first(),
+            "driver": Driver.objects.exclude(pk=self.user.pk).first(),
+            "user": self.user,
+        }
+
+    def measure_routes(self):
+        cache.clear()
+        dispatch.reset()
+        self.objects["car"].drivers.remove(self.user, self.objects["driver"])
+        queries = {}
+        for name, budget in BUDGETS.items():
+            if "pk" in budget:
+                kwargs = {"pk": self.objects[budget["pk"]].pk}
+            else:
+                kwargs = budget.get("kwargs", {})
+            data = budget.get("data")
+            if callable(data):
+                data = data(self.objects)
+            extra = {}
+            if "content_type" in budget:
+                extra["content_type"] = budget["content_type"]
+            with self.subTest(route=name):
+                with query_budget(budget["queries"], MAX_SECONDS) as measured:
+                    response = getattr(self.client, budget.get("method", "get"))(
+                        reverse(f"taxi:{name}", kwargs=kwargs), data, **extra
+                    )
+                    if response.streaming:
+                        b"".join(response.streaming_content)
+                self.assertLess(response.status_code, 400)
+                queries[name] = measured.queries
+        return queries
+
+    def test_every_route_has_a_budget(self):
+        self.assertEqual(
+            {pattern.name for pattern in urlpatterns}, set(BUDGETS)
+        )
+
+    def test_queries_do_not_grow_with_data(self):
+        small = self.measure_routes()
+
+        seed_fleet(
+            manufacturers=100, cars=2000, drivers=500, drivers_per_car=3, seed=1
+        )
+        self.objects["car"].drivers.add(
+            *Driver.objects.exclude(pk=self.user.pk)[:200]
+        )
+        self.objects["driver"].cars.add(*Car.objects.all()[:200])
+        large = self.measure_routes()
+
+        for name in BUDGETS:
+            with self.subTest(route=name):
+                self.assertEqual(small[name], large[name])
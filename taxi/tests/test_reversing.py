@@ -0,0 +1,75 @@
+from unittest import mock
+
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, reverse
+
+from taxi import reversing
+from taxi.models import Driver
+from taxi.templatetags import layout
+
+
+class CachedReverseTest(SimpleTestCase):
+    def setUp(self) -> None:
+        reversing.url_template.cache_clear()
+
+    def test_matches_reverse(self):
+        for name, kwargs in (
+            ("taxi:index", {}),
+            ("taxi:car-detail", {"pk": 7}),
+            ("taxi:fleet-export", {"kind": "cars", "fmt": "csv"}),
+            ("login", {}),
+        ):
+            with self.subTest(name=name):
+                self.assertEqual(
+                    reversing.cached_reverse(name, kwargs), reverse(name, kwargs=kwargs)
+                )
+
+    def test_reverses_once_per_route(self):
+        with mock.patch.object(reversing, "reverse", wraps=reverse) as wrapped:
+            urls = [
+                reversing.cached_reverse("taxi:car-detail", {"pk": pk})
+                for pk in range(50)
+            ]
+
+        self.assertEqual(wrapped.call_count, 1)
+        self.assertEqual(urls[42], "/cars/42/")
+
+    def test_invalid_arguments_not_cached(self):
+        for pk in (-1, True, 1.5):
+            with self.subTest(pk=pk), self.assertRaises(NoReverseMatch):
+                reversing.cached_reverse("taxi:car-detail", {"pk": pk})
+
+        self.assertEqual(reversing.url_template.cache_info().currsize, 0)
+
+    def test_templates_bounded(self):
+        self.assertEqual(
+            reversing.url_template.cache_info().maxsize, reversing.MAX_TEMPLATES
+        )
+
+    def test_driver_absolute_url(self):
+        self.assertEqual(Driver(pk=3).get_absolute_url(), "/drivers/3/")
+
+    def test_cached_url_tag(self):
+        rendered = Template(
+            '{% load layout %}{% cached_url "taxi:driver-detail" pk=driver.id %}'
+        ).render(Context({"driver": Driver(id=5)}))
+
+        self.assertEqual(rendered, "/drivers/5/")
+
+
+@override_settings(DEBUG=False)
+class NavigationTest(SimpleTestCase):
+    def setUp(self) -> None:
+        layout._navigation.clear()
+
+    def test_rendered_once(self):
+        with mock.patch.object(
+            layout, "render_to_string", wraps=layout.render_to_string
+        ) as render:
+            first = layout.navigation()
+            second = layout.navigation()
+
+        self.assertEqual(render.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertIn(f'href="{reverse("taxi:car-list")}"', first)
@@ -0,0 +1,126 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from taxi import routers
+from taxi.middleware import PIN_COOKIE, ReplicaRoutingMiddleware
+from taxi.models import Car
+
+REPLICAS = ["replica1", "replica2"]
+
+
+@override_settings(TAXI_DATABASE_REPLICAS=REPLICAS)
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = routers.PrimaryReplicaRouter()
+        self.addCleanup(routers.end)
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(self.router.db_for_read(Car), "default")
+
+    def test_round_robin(self):
+        chosen = []
+        for _ in range(4):
+            routers.begin()
+            chosen.append(self.router.db_for_read(Car))
+            routers.end()
+
+        self.assertEqual(sorted(chosen), sorted(REPLICAS * 2))
+        self.assertNotEqual(chosen[0], chosen[1])
+
+    @override_settings(TAXI_REPLICA_POLICY="least_loaded")
+    def test_least_loaded(self):
+        busy = routers.begin()
+
+        self.assertEqual(
+            routers.choose_replica(), [alias for alias in REPLICAS if alias != busy][0]
+        )
+
+    def test_write_pins_rest_of_request_to_primary(self):
+        routers.begin()
+
+        self.assertIn(self.router.db_for_read(Car), REPLICAS)
+        self.assertEqual(self.router.db_for_write(Car), "default")
+        self.assertEqual(self.router.db_for_read(Car), "default")
+        self.assertTrue(routers.end())
+
+    def test_sessions_use_primary_without_pinning(self):
+        routers.begin()
+
+        self.assertEqual(self.router.db_for_read(Session), "default")
+        self.router.db_for_write(Session)
+        self.assertIn(self.router.db_for_read(Car), REPLICAS)
+        self.assertFalse(routers.end())
+
+    def test_migrations_only_on_primary(self):
+        self.assertTrue(self.router.allow_migrate("default", "taxi"))
+        self.assertFalse(self.router.allow_migrate("replica1", "taxi"))
+
+
+@override_settings(TAXI_DATABASE_REPLICAS=REPLICAS)
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.router = routers.PrimaryReplicaRouter()
+
+    def serve(self, request, write=False):
+        used = []
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Car)
+            used.append(self.router.db_for_read(Car))
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(view)(request)
+        return used[0], response
+
+    def test_get_reads_replica(self):
+        alias, response = self.serve(self.factory.get("/"))
+
+        self.assertIn(alias, REPLICAS)
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_post_reads_primary(self):
+        alias, _ = self.serve(self.factory.post("/"))
+
+        self.assertEqual(alias, "default")
+
+    def test_write_sets_pin_cookie(self):
+        _, response = self.serve(self.factory.post("/"), write=True)
+
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_cookie_reads_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[PIN_COOKIE] = "1"
+
+        alias, _ = self.serve(request)
+
+        self.assertEqual(alias, "default")
+
+    @override_settings(TAXI_DATABASE_REPLICAS=[])
+    def test_without_replicas_reads_primary(self):
+        alias, _ = self.serve(self.factory.get("/"))
+
+        self.assertEqual(alias, "default")
+
+    async def test_async_write_in_worker_thread_pins(self):
+        used = []
+
+        async def view(request):
+            used.append(await sync_to_async(self.router.db_for_read)(Car))
+            await sync_to_async(self.router.db_for_write)(Car)
+            used.append(await sync_to_async(self.router.db_for_read)(Car))
+            return HttpResponse()
+
+        middleware = ReplicaRoutingMiddleware(view)
+        response = await middleware(self.factory.get("/"))
+
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+        self.assertIn(used[0], REPLICAS)
+        self.assertEqual(used[1], "default")
+        self.assertIn(PIN_COOKIE, response.cookies)
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from taxi.models import Car, CarSearchTrigram, Manufacturer
+from taxi.search import NgramSearchBackend, trigrams
+
+CAR_URL = reverse("taxi:car-list")
+
+
+class NgramSearchBackendTest(TestCase):
+    def setUp(self) -> None:
+        self.backend = NgramSearchBackend()
+        self.toyota = Manufacturer.objects.create(name="Toyota", country="Japan")
+        self.bmw = Manufacturer.objects.create(name="BMW", country="Germany")
+        self.corolla = Car.objects.create(model="Corolla", manufacturer=self.toyota)
+        self.camry = Car.objects.create(model="Camry", manufacturer=self.toyota)
+        self.x5 = Car.objects.create(model="X5 Toyota killer", manufacturer=self.bmw)
+
+    def search(self, query):
+        return list(self.backend.search(Car.objects.all(), query))
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("Golf  GT"), {"gol", "olf", "lf ", "f g", " gt"})
+
+    def test_index_maintained_on_save(self):
+        self.assertTrue(CarSearchTrigram.objects.filter(car=self.corolla).exists())
+
+        self.corolla.model = "Yaris"
+        self.corolla.save()
+
+        self.assertEqual(self.search("corolla"), [])
+        self.assertEqual(self.search("yaris"), [self.corolla])
+
+    def test_search_by_model(self):
+        self.assertEqual(self.search("CAMR"), [self.camry])
+
+    def test_search_by_manufacturer(self):
+        self.assertEqual(self.search("german"), [self.x5])
+
+    def test_model_matches_rank_first(self):
+        self.assertEqual(self.search("toyota")[0], self.x5)
+
+    def test_manufacturer_rename_reindexes_cars(self):
+        self.bmw.country = "Bavaria"
+        self.bmw.save()
+
+        self.assertEqual(self.search("bavaria"), [self.x5])
+
+    def test_short_query_falls_back_to_scan(self):
+        self.assertEqual(self.search("x5"), [self.x5])
+
+    def test_no_match(self):
+        self.assertEqual(self.search("zzz"), [])
+
+
+@override_settings(TAXI_CAR_SEARCH_BACKEND="taxi.search.NgramSearchBackend")
+class CarListSearchTest(TestCase):
+    def setUp(self) -> None:
+        self.user = get_user_model().objects.create_user(
+            username="test",
+            password="test12345"
+        )
+        self.client.force_login(self.user)
+        manufacturer = Manufacturer.objects.create(name="Skoda", country="Czechia")
+        self.octavia = Car.objects.create(model="Octavia", manufacturer=manufacturer)
+        Car.objects.create(model="Fabia", manufacturer=manufacturer)
+
+    def test_car_list_uses_search_backend(self):
+        response = self.client.get(CAR_URL, {"model": "octav"})
+
+        self.assertEqual(list(response.context["car_list"]), [self.octavia])
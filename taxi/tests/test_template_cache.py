@@ -0,0 +1,64 @@
+from unittest import mock
+
+from crispy_forms.templatetags.crispy_forms_filters import as_crispy_form
+from django.test import SimpleTestCase, override_settings
+
+from taxi.form import CarSearchForm
+from taxi.templatetags import form_cache
+from taxi.warmup import template_names, warm_templates
+
+
+@override_settings(DEBUG=False)
+class CachedCrispyTest(SimpleTestCase):
+    def setUp(self) -> None:
+        form_cache._rendered.clear()
+
+    def test_same_markup_as_crispy(self):
+        form = CarSearchForm(initial={"model": "golf"})
+
+        self.assertEqual(form_cache.cached_crispy(form), as_crispy_form(form))
+
+    def test_renders_once_per_value(self):
+        with mock.patch.object(
+            form_cache, "as_crispy_form", wraps=as_crispy_form
+        ) as render:
+            form_cache.cached_crispy(CarSearchForm(initial={"model": "golf"}))
+            form_cache.cached_crispy(CarSearchForm(initial={"model": "golf"}))
+            markup = form_cache.cached_crispy(CarSearchForm(initial={"model": "polo"}))
+
+        self.assertEqual(render.call_count, 2)
+        self.assertIn('value="polo"', markup)
+
+    @mock.patch.object(form_cache, "MAX_ENTRIES", 2)
+    def test_least_recently_used_markup_dropped(self):
+        for model in ("golf", "polo", "golf", "passat"):
+            form_cache.cached_crispy(CarSearchForm(initial={"model": model}))
+
+        self.assertEqual(
+            [dict(key[3])["model"] for key in form_cache._rendered],
+            ["golf", "passat"],
+        )
+
+    def test_invalid_forms_are_not_cached(self):
+        form = CarSearchForm(data={"model": "x" * 201})
+
+        form_cache.cached_crispy(form)
+
+        self.assertEqual(form_cache._rendered, {})
+
+
+class WarmTemplatesTest(SimpleTestCase):
+    def test_lists_project_and_crispy_templates(self):
+        names = set(template_names())
+
+        self.assertIn("taxi/car_list.html", names)
+        self.assertIn("includes/sidebar.html", names)
+        self.assertIn("bootstrap4/field.html", names)
+
+    @override_settings(DEBUG=False)
+    def test_compiles_every_template(self):
+        self.assertEqual(warm_templates(), len(list(template_names())))
+
+    @override_settings(DEBUG=True)
+    def test_skipped_in_debug(self):
+        self.assertEqual(warm_templates(), 0)
@@ -0,0 +1,103 @@
+import datetime
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from taxi.models import Car, Driver, Trip, TripRollup
+from taxi.synthetic import seed_fleet, seed_trips
+from taxi.trips import (
+    month_bounds,
+    rebuild_rollups,
+    record_trips,
+    scan_trip_totals,
+    start_of_day,
+    trip_totals,
+)
+
+UTC = datetime.timezone.utc
+
+
+def rollup_rows():
+    return set(
+        TripRollup.objects.values_list(
+            "period", "period_start", "driver_id", "car_id", "trips", "distance_km", "fare"
+        )
+    )
+
+
+class TripRollupTest(TestCase):
+    def setUp(self) -> None:
+        seed_fleet(manufacturers=2, cars=4, drivers=3)
+        self.driver = Driver.objects.first()
+        self.car = Car.objects.first()
+
+    def trip(self, started_at, distance_km="10.00", fare="10.00"):
+        return Trip(
+            driver=self.driver,
+            car=self.car,
+            started_at=started_at,
+            ended_at=started_at + datetime.timedelta(minutes=20),
+            distance_km=Decimal(distance_km),
+            fare=Decimal(fare),
+        )
+
+    def test_hourly_and_local_daily_buckets(self):
+        # 21:30 UTC is already the next day in Kyiv (UTC+3 in October)
+        record_trips([
+            self.trip(datetime.datetime(2026, 10, 5, 21, 10, tzinfo=UTC)),
+            self.trip(datetime.datetime(2026, 10, 5, 21, 40, tzinfo=UTC), "5.50"),
+        ])
+        record_trips([self.trip(datetime.datetime(2026, 10, 5, 20, 0, tzinfo=UTC))])
+
+        driver_rollups = TripRollup.objects.filter(driver=self.driver)
+        self.assertEqual(
+            {
+                (rollup.period, rollup.period_start, rollup.trips)
+                for rollup in driver_rollups
+            },
+            {
+                ("hour", datetime.datetime(2026, 10, 5, 20, tzinfo=UTC), 1),
+                ("hour", datetime.datetime(2026, 10, 5, 21, tzinfo=UTC), 2),
+                ("day", start_of_day(datetime.date(2026, 10, 5)), 1),
+                ("day", start_of_day(datetime.date(2026, 10, 6)), 2),
+            },
+        )
+        self.assertEqual(
+            driver_rollups.get(period="hour", trips=2).distance_km, Decimal("15.50")
+        )
+        self.assertEqual(
+            sorted(Trip.objects.values_list("started_on", flat=True)),
+            [datetime.date(2026, 10, 5), datetime.date(2026, 10, 6),
+             datetime.date(2026, 10, 6)],
+        )
+
+    def test_rollups_match_a_rebuild(self):
+        seed_trips(trips=300, days=10, batch_size=50)
+        recorded = rollup_rows()
+
+        rebuild_rollups()
+
+        self.assertEqual(rollup_rows(), recorded)
+
+    def test_totals_match_trip_table(self):
+        seed_trips(trips=300, days=40)
+        first, following = month_bounds(timezone.localdate())
+
+        for subject in ("driver", "car"):
+            with self.subTest(subject=subject):
+                self.assertEqual(
+                    list(trip_totals(
+                        subject, start_of_day(first), start_of_day(following)
+                    )),
+                    list(scan_trip_totals(subject, first, following)),
+                )
+
+    def test_deleting_driver_keeps_trips_and_car_totals(self):
+        record_trips([self.trip(timezone.now())])
+
+        self.driver.delete()
+
+        self.assertIsNone(Trip.objects.get().driver_id)
+        self.assertFalse(TripRollup.objects.filter(car__isnull=True).exists())
+        self.assertEqual(TripRollup.objects.filter(car=self.car).count(), 2)
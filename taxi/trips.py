@@ -0,0 +1,210 @@
+import datetime
+from decimal import Decimal
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from taxi.models import Trip, TripRollup
+
+BATCH_SIZE = 5000
+ROLLUP_FIELDS = ["trips", "distance_km", "fare"]
+SUBJECTS = ("driver", "car")
+
+
+def period_starts(started_at):
+    """Return the UTC hour and the local day ``started_at`` falls in."""
+    hour = started_at.astimezone(datetime.timezone.utc).replace(
+        minute=0, second=0, microsecond=0
+    )
+    day = start_of_day(timezone.localdate(started_at))
+    return {TripRollup.HOUR: hour, TripRollup.DAY: day}
+
+
+def start_of_day(date):
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def rollup_key(period, period_start, driver_id=None, car_id=None):
+    return period, period_start, driver_id, car_id
+
+
+def record_trips(trips, batch_size=BATCH_SIZE):
+    """Insert trips and add them to the hourly and daily rollups.
+
+    Trips are inserted in bulk and the rollups of each batch updated in
+    bulk, inside the same transaction, so reports never see trips
+    without their totals. Returns the number of
+    trips recorded.
+    """
+    trips = iter(trips)
+    recorded = 0
+    with transaction.atomic():
+        while True:
+            batch = list(islice(trips, batch_size))
+            if not batch:
+                break
+            deltas = {}
+            for trip in batch:
+                trip.started_on = timezone.localdate(trip.started_at)
+                for period, period_start in period_starts(trip.started_at).items():
+                    keys = []
+                    if trip.driver_id:
+                        keys.append(rollup_key(period, period_start, trip.driver_id))
+                    if trip.car_id:
+                        keys.append(rollup_key(period, period_start, car_id=trip.car_id))
+                    for key in keys:
+                        total = deltas.setdefault(key, [0, Decimal(0), Decimal(0)])
+                        total[0] += 1
+                        total[1] += Decimal(trip.distance_km)
+                        total[2] += Decimal(trip.fare)
+            Trip.objects.bulk_create(batch)
+            add_to_rollups(deltas)
+            recorded += len(batch)
+    return recorded
+
+
+def add_to_rollups(deltas):
+    """Add ``{rollup key: [trips, distance, fare]}`` to the rollup rows.
+
+    Existing rows are locked, incremented and written back in bulk;
+    missing ones are inserted with the totals. An insert that loses a
+    race with a concurrent writer is retried as an update.
+    """
+    keys = list(deltas)
+    for start in range(0, len(keys), BATCH_SIZE):
+        chunk = set(keys[start:start + BATCH_SIZE])
+        while True:
+            existing = locked_rollups(chunk)
+            try:
+                with transaction.atomic():
+                    TripRollup.objects.bulk_create(
+                        (
+                            TripRollup(
+                                period=key[0],
+                                period_start=key[1],
+                                driver_id=key[2],
+                                car_id=key[3],
+                                trips=deltas[key][0],
+                                distance_km=deltas[key][1],
+                                fare=deltas[key][2],
+                            )
+                            for key in chunk
+                            if key not in existing
+                        ),
+                        batch_size=BATCH_SIZE,
+                    )
+            except IntegrityError:
+                continue
+            break
+        for key, rollup in existing.items():
+            trips, distance_km, fare = deltas[key]
+            rollup.trips += trips
+            rollup.distance_km += distance_km
+            rollup.fare += fare
+        TripRollup.objects.bulk_update(
+            existing.values(), ROLLUP_FIELDS, batch_size=1000
+        )
+
+
+def locked_rollups(keys):
+    """Lock and return ``{key: row}`` for the rollup rows of ``keys`` that exist."""
+    starts = [key[1] for key in keys]
+    rows = TripRollup.objects.select_for_update().filter(
+        Q(car__isnull=True, driver_id__in={key[2] for key in keys if key[2]})
+        | Q(driver__isnull=True, car_id__in={key[3] for key in keys if key[3]}),
+        period_start__gte=min(starts),
+        period_start__lte=max(starts),
+    )
+    found = {}
+    for rollup in rows:
+        key = rollup_key(
+            rollup.period, rollup.period_start, rollup.driver_id, rollup.car_id
+        )
+        if key in keys:
+            found[key] = rollup
+    return found
+
+
+def rebuild_rollups():
+    """Recompute every rollup from the trip table."""
+    truncations = {
+        TripRollup.HOUR: TruncHour("started_at", tzinfo=datetime.timezone.utc),
+        TripRollup.DAY: TruncDay("started_at"),
+    }
+    with transaction.atomic():
+        TripRollup.objects.all().delete()
+        for period, truncation in truncations.items():
+            for subject in SUBJECTS:
+                rows = (
+                    Trip.objects.filter(**{f"{subject}__isnull": False})
+                    .annotate(period_start=truncation)
+                    .values("period_start", subject)
+                    .annotate(
+                        trips=Count("id"),
+                        distance_km=Sum("distance_km"),
+                        fare=Sum("fare"),
+                    )
+                    .order_by()
+                )
+                TripRollup.objects.bulk_create(
+                    (
+                        TripRollup(
+                            period=period,
+                            period_start=row["period_start"],
+                            trips=row["trips"],
+                            distance_km=row["distance_km"],
+                            fare=row["fare"],
+                            **{f"{subject}_id": row[subject]},
+                        )
+                        for row in rows.iterator()
+                    ),
+                    batch_size=BATCH_SIZE,
+                )
+
+
+def trip_totals(subject, start, end, period=TripRollup.DAY):
+    """Trips, distance and fares per driver or car from the rollups.
+
+    ``start`` and ``end`` are aware datetimes on ``period`` boundaries;
+    rows come busiest first.
+    """
+    other = "car" if subject == "driver" else "driver"
+    return (
+        TripRollup.objects.filter(
+            period=period,
+            period_start__gte=start,
+            period_start__lt=end,
+            **{f"{other}__isnull": True},
+        )
+        .values(subject)
+        .annotate(
+            trips=Sum("trips"), distance_km=Sum("distance_km"), fare=Sum("fare")
+        )
+        .order_by("-trips", subject)
+    )
+
+
+def scan_trip_totals(subject, start_date, end_date):
+    """``trip_totals`` by local day, counted from the trip table itself."""
+    return (
+        Trip.objects.filter(
+            started_on__gte=start_date,
+            started_on__lt=end_date,
+            **{f"{subject}__isnull": False},
+        )
+        .values(subject)
+        .annotate(
+            trips=Count("id"), distance_km=Sum("distance_km"), fare=Sum("fare")
+        )
+        .order_by("-trips", subject)
+    )
+
+
+def month_bounds(date):
+    """First day of ``date``'s month and of the next one."""
+    first = date.replace(day=1)
+    following = (first + datetime.timedelta(days=32)).replace(day=1)
+    return first, following
@@ -9,6 +9,7 @@ from .views import (
     CarDeleteView,
     DriverListView,
     DriverDetailView,
+    driver_search,
     DriverCreateView,
     DriverLicenseUpdate,
     DriverDeleteView,
@@ -17,6 +18,13 @@ from .views import (
     ManufacturerUpdateView,
     ManufacturerDeleteView,
     driver_car,
+    bulk_assignments,
+    fleet_export,
+    perf_metrics,
+    location_pings,
+    nearest_drivers,
+    analytics_report,
+    fleet_analytics,
 )
 
 urlpatterns = [
@@ -72,6 +80,11 @@ urlpatterns = [
         DriverListView.as_view(),
         name="driver-list"
     ),
+    path(
+        "drivers/search/",
+        driver_search,
+        name="driver-search"
+    ),
     path(
         "drivers/<int:pk>/",
         DriverDetailView.as_view(),
@@ -97,6 +110,41 @@ urlpatterns = [
         driver_car,
         name="driver-car"
     ),
+    path(
+        "assignments/",
+        bulk_assignments,
+        name="assignments"
+    ),
+    path(
+        "export/<str:kind>.<str:fmt>",
+        fleet_export,
+        name="fleet-export"
+    ),
+    path(
+        "metrics/",
+        perf_metrics,
+        name="metrics"
+    ),
+    path(
+        "dispatch/pings/",
+        location_pings,
+        name="dispatch-pings"
+    ),
+    path(
+        "dispatch/nearest/",
+        nearest_drivers,
+        name="dispatch-nearest"
+    ),
+    path(
+        "analytics/",
+        analytics_report,
+        name="analytics"
+    ),
+    path(
+        "analytics/fleet.json",
+        fleet_analytics,
+        name="analytics-fleet"
+    ),
 ]
 
 app_name = "taxi"
@@ -1,40 +1,67 @@
+import hmac
+import json
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseRedirect
+from django.db.models import Prefetch, Q
+from django.core.exceptions import PermissionDenied
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.conf import settings
 from django.shortcuts import render
 from django.urls import reverse_lazy
 from django.views import generic
+from django.views.decorators.http import require_POST
 from django.contrib.auth.mixins import LoginRequiredMixin
 
+from taxi_service.db.pool import pool_stats
+from . import analytics, dispatch, fragments, perf
+from .assignments import ADD, REMOVE, apply_assignments, max_changes, toggle_assignment
+from .counters import get_counts
+from .decorators import async_login_required, async_require_POST
+from .exporters import EXPORTS, FORMATS, stream_export
 from .form import DriverCreationForm, DriverLicenseUpdateForm, CarForm, CarSearchForm
 from .models import Driver, Car, Manufacturer
+from .pagination import (
+    KeysetPaginationMixin,
+    PageSizeMixin,
+    paginate_keyset,
+    requested_page_size,
+)
+from .search import get_search_backend
+from .visits import record_visit
+
+
+def visit_context(request):
+    """Return the home page context, counting this visit."""
+    return {
+        **get_counts(),
+        "num_visits": record_visit(request.session),
+    }
 
 
-@login_required
-def index(request):
+@async_login_required
+async def index(request):
     """View function for the home page of the site."""
 
-    num_drivers = Driver.objects.count()
-    num_cars = Car.objects.count()
-    num_manufacturers = Manufacturer.objects.count()
-
-    num_visits = request.session.get("num_visits", 0)
-    request.session["num_visits"] = num_visits + 1
-
-    context = {
-        "num_drivers": num_drivers,
-        "num_cars": num_cars,
-        "num_manufacturers": num_manufacturers,
-        "num_visits": num_visits + 1,
-    }
+    context = await sync_to_async(visit_context)(request)
 
     return render(request, "taxi/index.html", context=context)
 
 
-class ManufacturerListView(LoginRequiredMixin, generic.ListView):
+class ManufacturerListView(
+    LoginRequiredMixin, PageSizeMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Manufacturer
     context_object_name = "manufacturer_list"
     template_name = "taxi/manufacturer_list.html"
     paginate_by = 2
+    keyset_fields = ("name", "id")
 
 
 class ManufacturerCreateView(LoginRequiredMixin, generic.CreateView):
@@ -56,9 +83,12 @@ class ManufacturerDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "taxi/manufacturer_delete.html"
 
 
-class CarListView(LoginRequiredMixin, generic.ListView):
+class CarListView(
+    LoginRequiredMixin, PageSizeMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Car
     paginate_by = 2
+    keyset_fields = ("manufacturer_id", "id")
     queryset = Car.objects.all().select_related("manufacturer")
 
     def get_context_data(self, *, object_list=None, **kwargs):
@@ -76,13 +106,25 @@ class CarListView(LoginRequiredMixin, generic.ListView):
         model = self.request.GET.get("model")
 
         if model:
-            return self.queryset.filter(model__icontains=model)
+            return get_search_backend().search(self.queryset, model)
 
         return self.queryset
 
 
 class CarDetailView(LoginRequiredMixin, generic.DetailView):
     model = Car
+    queryset = Car.objects.all().select_related("manufacturer")
+
+    def get_context_data(self, **kwargs):
+        context = super(CarDetailView, self).get_context_data(**kwargs)
+        context["is_assigned"] = Car.drivers.through.objects.filter(
+            car_id=self.object.id, driver_id=self.request.user.id
+        ).exists()
+        # Evaluated only when the cached fragment has to be re-rendered
+        context["drivers"] = self.object.drivers.only(
+            "id", "username", "first_name", "last_name", "email", "license_number"
+        )
+        return context
 
 
 class CarCreateView(LoginRequiredMixin, generic.CreateView):
@@ -104,14 +146,49 @@ class CarDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "taxi/car_delete.html"
 
 
-class DriverListView(LoginRequiredMixin, generic.ListView):
+class DriverListView(
+    LoginRequiredMixin, PageSizeMixin, KeysetPaginationMixin, generic.ListView
+):
     model = Driver
     paginate_by = 2
+    keyset_fields = ("id",)
+
+
+@login_required
+def driver_search(request):
+    """JSON prefix search over driver usernames and license numbers.
+
+    Backs the driver picker of ``CarForm``; pages are walked with the
+    ``next`` cursor so each request reads one index range.
+    """
+    query = request.GET.get("q", "").strip()
+    drivers = Driver.objects.only("id", "username", "first_name", "last_name")
+    if query:
+        drivers = drivers.filter(
+            Q(username__startswith=query)
+            | Q(license_number__startswith=query.upper())
+        )
+
+    page = paginate_keyset(
+        drivers,
+        ("username",),
+        requested_page_size(request, 20),
+        cursor=request.GET.get("cursor"),
+    )
+    return JsonResponse({
+        "results": [{"id": driver.id, "text": str(driver)} for driver in page],
+        "next": page.next_cursor,
+    })
 
 
 class DriverDetailView(LoginRequiredMixin, generic.DetailView):
     model = Driver
-    queryset = Driver.objects.all().prefetch_related("cars__manufacturer")
+
+    def get_context_data(self, **kwargs):
+        context = super(DriverDetailView, self).get_context_data(**kwargs)
+        # Evaluated only when the cached fragment has to be re-rendered
+        context["cars"] = self.object.cars.select_related("manufacturer")
+        return context
 
 
 class DriverCreateView(LoginRequiredMixin, generic.CreateView):
@@ -133,15 +210,194 @@ class DriverDeleteView(LoginRequiredMixin, generic.DeleteView):
     template_name = "taxi/driver_delete.html"
 
 
-def driver_car(request, pk):
-    driver = Driver.objects.get(id=request.user.id)
-    if Car.objects.get(id=pk) in driver.cars.all():
-        driver.cars.remove(pk)
-    else:
-        driver.cars.add(pk)
+@async_login_required
+@async_require_POST
+async def driver_car(request, pk):
+    """Toggle the current driver's assignment to the car."""
+    try:
+        await sync_to_async(toggle_assignment)(request.user, pk)
+    except Car.DoesNotExist:
+        raise Http404("No car found matching the query")
+
     return HttpResponseRedirect(
         reverse_lazy(
             "taxi:car-detail",
             args=[pk]
         )
     )
+
+
+@login_required
+@require_POST
+def bulk_assignments(request):
+    """Add and remove many driver/car assignments in one request, for staff.
+
+    Takes ``{"changes": [{"action": "add" | "remove", "driver", "car"}]}``
+    and answers with the status of every change, in order.
+    """
+    if not request.user.is_staff:
+        raise PermissionDenied
+    try:
+        changes = [
+            (change["action"], int(change["driver"]), int(change["car"]))
+            for change in json.loads(request.body)["changes"]
+        ]
+        if any(action not in (ADD, REMOVE) for action, _, _ in changes):
+            raise ValueError
+    except (KeyError, TypeError, ValueError):
+        return JsonResponse({"error": "Invalid assignment changes"}, status=400)
+    if len(changes) > max_changes():
+        return JsonResponse(
+            {"error": f"At most {max_changes()} changes per request"}, status=400
+        )
+
+    statuses = apply_assignments(changes)
+    return JsonResponse({
+        "results": [
+            {"action": action, "driver": driver_id, "car": car_id, "status": status}
+            for (action, driver_id, car_id), status in zip(changes, statuses)
+        ],
+    })
+
+
+@login_required
+def fleet_export(request, kind, fmt):
+    """Stream an export of the fleet, row by row, to staff members."""
+    if not request.user.is_staff:
+        raise PermissionDenied
+    if kind not in EXPORTS or fmt not in FORMATS:
+        raise Http404("Unknown export")
+
+    response = StreamingHttpResponse(
+        stream_export(kind, fmt),
+        content_type="text/csv" if fmt == "csv" else "application/x-ndjson",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+    return response
+
+
+def perf_metrics(request):
+    """Expose request histograms and cache/pool gauges in Prometheus format.
+
+    Open to staff members and to scrapers sending ``TAXI_METRICS_TOKEN``
+    as a bearer token. The client address is not trusted, since behind a
+    reverse proxy every request comes from it.
+    """
+    token = getattr(settings, "TAXI_METRICS_TOKEN", "")
+    authorized = token and hmac.compare_digest(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    )
+    if not authorized and not request.user.is_staff:
+        raise PermissionDenied
+
+    gauges = {
+        f"taxi_fragment_cache_{name}": {"": value}
+        for name, value in fragments.stats().items()
+    }
+    for alias, stats in pool_stats().items():
+        for name, value in stats.items():
+            gauges.setdefault(f"taxi_db_pool_{name}", {})[f'alias="{alias}"'] = value
+    return HttpResponse(
+        perf.render_prometheus(gauges),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
+
+@login_required
+@require_POST
+def location_pings(request):
+    """Accept location pings as JSON and buffer them for dispatch.
+
+    Drivers post ``{"latitude", "longitude", "available"}`` for themselves;
+    staff gateways may relay ``{"pings": [{"driver", "latitude", ...}]}``
+    for many drivers at once.
+    """
+    try:
+        data = json.loads(request.body)
+        if "pings" in data:
+            if not request.user.is_staff:
+                raise PermissionDenied
+            pings = [
+                (
+                    int(ping["driver"]),
+                    *dispatch.parse_point(ping["latitude"], ping["longitude"]),
+                    dispatch.parse_available(ping.get("available", True)),
+                )
+                for ping in data["pings"]
+            ]
+        else:
+            pings = [(
+                request.user.id,
+                *dispatch.parse_point(data["latitude"], data["longitude"]),
+                dispatch.parse_available(data.get("available", True)),
+            )]
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return JsonResponse({"error": "Invalid location ping"}, status=400)
+
+    dispatch.record_pings(pings)
+    return JsonResponse({"accepted": len(pings)}, status=202)
+
+
+@login_required
+def nearest_drivers(request):
+    """JSON list of the available drivers closest to ``?lat=&lon=``.
+
+    ``?n=`` drivers (5 by default) within ``?km=`` are returned with their
+    distance, last position and cars.
+    """
+    try:
+        lat, lon = dispatch.parse_point(request.GET["lat"], request.GET["lon"])
+    except (KeyError, ValueError):
+        return JsonResponse({"error": "lat and lon are required"}, status=400)
+    try:
+        radius_km = dispatch.parse_radius(request.GET.get("km"))
+    except ValueError:
+        return JsonResponse({"error": "km must be a positive number"}, status=400)
+
+    found = dispatch.nearest_drivers(
+        lat, lon, requested_page_size(request, 5, kwarg="n"), radius_km
+    )
+    drivers = (
+        Driver.objects.only("id", "username", "first_name", "last_name")
+        .prefetch_related(
+            Prefetch("cars", queryset=Car.objects.only("id", "model").order_by("id"))
+        )
+        .in_bulk([driver_id for _, driver_id, _, _ in found])
+    )
+    return JsonResponse({
+        "results": [
+            {
+                "id": driver_id,
+                "text": str(drivers[driver_id]),
+                "distance_km": round(distance, 3),
+                "latitude": d_lat,
+                "longitude": d_lon,
+                "cars": [
+                    {"id": car.id, "model": car.model}
+                    for car in drivers[driver_id].cars.all()
+                ],
+            }
+            for distance, driver_id, d_lat, d_lon in found
+            if driver_id in drivers
+        ],
+    })
+
+
+@login_required
+def fleet_analytics(request):
+    """Fleet distributions as JSON, recomputed once per ``TAXI_ANALYTICS_TIMEOUT``."""
+    return JsonResponse(analytics.get_fleet_report())
+
+
+@login_required
+def analytics_report(request):
+    """Fleet distributions as a page, from the same cached report as the JSON."""
+    report = analytics.get_fleet_report()
+    return render(request, "taxi/analytics.html", {
+        "report": report,
+        "distributions": [
+            ("Cars per manufacturer", report["cars_per_manufacturer"]),
+            ("Drivers per car", report["drivers_per_car"]),
+            ("Cars per driver", report["cars_per_driver"]),
+        ],
+    })
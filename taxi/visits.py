@@ -0,0 +1,65 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+SIGNED_COOKIES = "django.contrib.sessions.backends.signed_cookies"
+
+
+def pending_keys(session_key):
+    return f"taxi:visits:{session_key}", f"taxi:visits:{session_key}:since"
+
+
+def flush_every():
+    """Visits buffered in the cache before they are written to the session."""
+    return getattr(settings, "TAXI_VISITS_FLUSH_EVERY", 10)
+
+
+def flush_seconds():
+    """Seconds buffered visits may wait before they are written to the session."""
+    return getattr(settings, "TAXI_VISITS_FLUSH_SECONDS", 300)
+
+
+def buffered():
+    """Whether visits are buffered, which needs a cache shared by all processes."""
+    return getattr(settings, "TAXI_VISITS_BUFFERED", False)
+
+
+def record_visit(session):
+    """Count a visit and return the session's total number of visits.
+
+    Visits are added up in the cache and only written to the session every
+    ``flush_every()`` visits or after ``flush_seconds()``, so most page
+    views leave a database-backed session untouched. The returned total
+    includes the buffered visits. Sessions kept in signed cookies, and new
+    sessions without a key, are always written since that costs no query;
+    so is every session when ``buffered()`` is off.
+    """
+    stored = session.get("num_visits", 0)
+    if (
+        not buffered()
+        or settings.SESSION_ENGINE == SIGNED_COOKIES
+        or session.session_key is None
+    ):
+        session["num_visits"] = stored + 1
+        return stored + 1
+
+    count_key, since_key = pending_keys(session.session_key)
+    now = time.time()
+    # Buffered visits are useless once the session itself has expired.
+    timeout = settings.SESSION_COOKIE_AGE
+    cache.add(count_key, 0, timeout)
+    cache.add(since_key, now, timeout)
+    try:
+        pending = cache.incr(count_key)
+    except ValueError:
+        # Evicted between add and incr.
+        cache.set(count_key, 1, timeout)
+        pending = 1
+    since = cache.get(since_key, now)
+
+    total = stored + pending
+    if pending >= flush_every() or now - since >= flush_seconds():
+        session["num_visits"] = total
+        cache.delete_many([count_key, since_key])
+    return total
@@ -0,0 +1,37 @@
+import os
+
+from django.conf import settings
+from django.template import engines
+from django.template.utils import get_app_template_dirs
+
+
+def template_names():
+    """Yield the project templates and the crispy template pack, by name."""
+    engine = engines["django"].engine
+    pack = getattr(settings, "CRISPY_TEMPLATE_PACK", "bootstrap4")
+    roots = [(directory, "") for directory in engine.dirs] + [
+        (os.path.join(directory, pack), pack)
+        for directory in get_app_template_dirs("templates")
+    ]
+    for root, prefix in roots:
+        for directory, _, files in os.walk(root):
+            for name in files:
+                if name.endswith(".html"):
+                    relative = os.path.relpath(os.path.join(directory, name), root)
+                    yield os.path.join(prefix, relative).replace(os.sep, "/")
+
+
+def warm_templates():
+    """Compile the templates into the cached loader before the first request.
+
+    Does nothing in DEBUG mode, where templates are read on every render.
+    Returns the number of templates compiled.
+    """
+    if settings.DEBUG:
+        return 0
+    engine = engines["django"]
+    count = 0
+    for name in template_names():
+        engine.get_template(name)
+        count += 1
+    return count
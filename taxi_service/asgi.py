@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "taxi_service.settings")
 
 application = get_asgi_application()
+
+# Compile templates now rather than during the first requests of the worker
+from taxi.warmup import warm_templates  # noqa: E402
+
+warm_templates()
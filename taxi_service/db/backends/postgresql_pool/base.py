@@ -0,0 +1,67 @@
+"""PostgreSQL backend that borrows connections from a per-process pool.
+
+Django "closes" the connection at the end of every request when
+``CONN_MAX_AGE`` is 0; here that returns it to the pool instead, so a
+worker keeps at most ``POOL["MAX_SIZE"]`` connections open to the server.
+"""
+from django.db.backends.postgresql import base
+from psycopg2 import extensions
+
+from taxi_service.db.pool import PoolTimeout, get_pool
+
+Database = base.Database
+
+
+def check(connection):
+    if connection.closed:
+        return False
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Database.Error:
+        return False
+    return True
+
+
+def reset(connection):
+    """Roll back whatever a request left open; ``False`` if that fails."""
+    if connection.closed:
+        return False
+    try:
+        if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+    except Database.Error:
+        return False
+    return connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pool(self):
+        options = self.settings_dict.get("POOL", {})
+        return get_pool(
+            self.alias,
+            max_size=options.get("MAX_SIZE", 10),
+            timeout=options.get("TIMEOUT", 10.0),
+            max_lifetime=options.get("MAX_LIFETIME", 1800.0),
+            check_idle=options.get("CHECK_IDLE", 10.0),
+            check=check,
+            reset=reset,
+        )
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.pool.acquire(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+            )
+        except PoolTimeout as error:
+            raise Database.OperationalError(str(error)) from error
+        self.isolation_level = self.settings_dict["OPTIONS"].get(
+            "isolation_level", connection.isolation_level
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection, discard=bool(self.errors_occurred))
@@ -0,0 +1,196 @@
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of DB-API connections.
+
+    At most ``max_size`` connections exist at once; ``acquire`` waits up to
+    ``timeout`` seconds for one to be released and then raises
+    ``PoolTimeout``. Connections older than ``max_lifetime`` seconds are
+    closed instead of being reused. A connection idle for more than
+    ``check_idle`` seconds is passed to ``check`` before it is handed out
+    and replaced when the check fails. ``reset`` is called on release and
+    may return ``False`` to discard the connection.
+    """
+
+    def __init__(
+        self,
+        max_size=10,
+        timeout=10.0,
+        max_lifetime=1800.0,
+        check_idle=10.0,
+        check=None,
+        reset=None,
+    ):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+        self.check = check
+        self.reset = reset
+        self._idle = deque()
+        self._born = {}
+        self._connecting = 0
+        self._condition = threading.Condition()
+        self._metrics = dict.fromkeys(
+            (
+                "acquired", "created", "closed", "recycled", "failed_checks",
+                "waits", "timeouts",
+            ),
+            0,
+        )
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def acquire(self, connect):
+        """Return an idle connection, or one made by ``connect()`` if there is room."""
+        start = time.monotonic()
+        waited = False
+        with self._condition:
+            while True:
+                connection = self._take_idle()
+                if connection is not None:
+                    break
+                if len(self._born) + self._connecting < self.max_size:
+                    # Reserve the slot, connect outside the lock.
+                    self._connecting += 1
+                    break
+                remaining = start + self.timeout - time.monotonic()
+                if remaining <= 0:
+                    self._metrics["timeouts"] += 1
+                    raise PoolTimeout(
+                        f"No connection available within {self.timeout}s "
+                        f"({self.max_size} in use)"
+                    )
+                waited = True
+                self._condition.wait(remaining)
+            self._record_acquire(start, waited)
+
+        if connection is not None:
+            return connection
+        try:
+            connection = connect()
+        except BaseException:
+            with self._condition:
+                self._connecting -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._connecting -= 1
+            self._born[connection] = time.monotonic()
+            self._metrics["created"] += 1
+        return connection
+
+    def release(self, connection, discard=False):
+        """Give ``connection`` back, closing it if unusable, too old or ``discard``."""
+        if not discard and self.reset is not None:
+            discard = self.reset(connection) is False
+        with self._condition:
+            born = self._born.get(connection)
+            if born is None:
+                discard = True
+            elif time.monotonic() - born > self.max_lifetime:
+                self._metrics["recycled"] += 1
+                discard = True
+            if discard:
+                self._born.pop(connection, None)
+                self._metrics["closed"] += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+        if discard:
+            self._close(connection)
+
+    def close_all(self):
+        with self._condition:
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            for connection in idle:
+                self._born.pop(connection, None)
+            self._metrics["closed"] += len(idle)
+        for connection in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._condition:
+            in_use = len(self._born) - len(self._idle)
+            return {
+                **self._metrics,
+                "max_size": self.max_size,
+                "size": len(self._born),
+                "in_use": in_use,
+                "idle": len(self._idle),
+                "saturation": in_use / self.max_size,
+                "wait_seconds_total": self._wait_seconds,
+                "wait_seconds_max": self._max_wait_seconds,
+            }
+
+    def _take_idle(self):
+        # Called with the lock held. The health check runs under the lock
+        # too, which only happens after ``check_idle`` seconds of idleness.
+        now = time.monotonic()
+        while self._idle:
+            connection, released = self._idle.pop()
+            if now - self._born[connection] > self.max_lifetime:
+                self._metrics["recycled"] += 1
+            elif (
+                self.check is None
+                or now - released <= self.check_idle
+                or self.check(connection)
+            ):
+                return connection
+            else:
+                self._metrics["failed_checks"] += 1
+            del self._born[connection]
+            self._metrics["closed"] += 1
+            self._close(connection)
+        return None
+
+    def _record_acquire(self, start, waited):
+        elapsed = time.monotonic() - start
+        self._metrics["acquired"] += 1
+        if waited:
+            self._metrics["waits"] += 1
+        self._wait_seconds += elapsed
+        self._max_wait_seconds = max(self._max_wait_seconds, elapsed)
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, **options):
+    """Return the process-wide pool for ``alias``, creating it on first use.
+
+    Pools are dropped after a fork, so gunicorn workers never share
+    connections opened by the master.
+    """
+    key = (alias, os.getpid())
+    with _pools_lock:
+        if key not in _pools:
+            for stale in [stale for stale in _pools if stale[1] != key[1]]:
+                del _pools[stale]
+            _pools[key] = ConnectionPool(**options)
+        return _pools[key]
+
+
+def pool_stats():
+    """Return the metrics of every pool in this process, by database alias."""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = {alias: pool for (alias, owner), pool in _pools.items() if owner == pid}
+    return {alias: pool.stats() for alias, pool in pools.items()}
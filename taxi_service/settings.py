@@ -42,15 +42,15 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     'crispy_forms',
     "taxi",
 ]
 
 MIDDLEWARE = [
+    "taxi.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
+    "taxi.middleware.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -59,11 +59,26 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The debug toolbar is for development only
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("whitenoise.middleware.WhiteNoiseMiddleware") + 1,
+        "debug_toolbar.middleware.DebugToolbarMiddleware",
+    )
+
+# Share of requests measured by taxi.middleware.PerformanceMiddleware
+TAXI_PERF_SAMPLE_RATE = float(os.environ.get("TAXI_PERF_SAMPLE_RATE", 0.1))
+
+# Bearer token a scraper sends to read /metrics/; staff can always read it
+TAXI_METRICS_TOKEN = os.environ.get("TAXI_METRICS_TOKEN", "")
+
 ROOT_URLCONF = "taxi_service.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "taxi.perf.TimedDjangoTemplates",
+        "NAME": "django",
         "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -77,6 +92,19 @@ TEMPLATES = [
     },
 ]
 
+# Outside DEBUG each template is read and compiled once per process
+if not DEBUG:
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 CRISPY_TEMPLATE_PACK = 'bootstrap4'
 
 WSGI_APPLICATION = "taxi_service.wsgi.application"
@@ -95,6 +123,115 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=600)
 DATABASES["default"].update(db_from_env)
 
+# Pool PostgreSQL connections per process instead of keeping one per thread
+# for CONN_MAX_AGE. Connections go back to the pool after every request.
+if (
+    os.environ.get("DATABASE_POOL", "") not in ("", "0", "False")
+    and DATABASES["default"]["ENGINE"].startswith("django.db.backends.postgresql")
+):
+    DATABASES["default"].update({
+        "ENGINE": "taxi_service.db.backends.postgresql_pool",
+        "CONN_MAX_AGE": 0,
+        "POOL": {
+            "MAX_SIZE": int(os.environ.get("DATABASE_POOL_MAX_SIZE", 10)),
+            "TIMEOUT": float(os.environ.get("DATABASE_POOL_TIMEOUT", 10)),
+            "MAX_LIFETIME": float(os.environ.get("DATABASE_POOL_MAX_LIFETIME", 1800)),
+            "CHECK_IDLE": float(os.environ.get("DATABASE_POOL_CHECK_IDLE", 10)),
+        },
+    })
+
+# Read replicas, as comma separated database URLs. Tests run against the
+# primary only, so replicas mirror it there.
+TAXI_DATABASE_REPLICAS = []
+
+for index, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), start=1
+):
+    alias = f"replica{index}"
+    DATABASES[alias] = dj_database_url.parse(url.strip(), conn_max_age=600)
+    DATABASES[alias]["TEST"] = {"MIRROR": "default"}
+    TAXI_DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["taxi.routers.PrimaryReplicaRouter"]
+
+# "round_robin" or "least_loaded" (fewest requests in flight in this process)
+TAXI_REPLICA_POLICY = os.environ.get("TAXI_REPLICA_POLICY", "round_robin")
+
+# Seconds a client reads from the primary after one of its requests wrote
+TAXI_REPLICA_PIN_SECONDS = int(os.environ.get("TAXI_REPLICA_PIN_SECONDS", 5))
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+if os.environ.get("REDIS_URL"):
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ["REDIS_URL"],
+    }
+
+# Sessions
+# https://docs.djangoproject.com/en/4.0/topics/http/sessions/
+
+# "cached_db" reads sessions from the cache, so it is only the default when
+# every process shares the Redis cache: with the per-process LocMemCache a
+# logout would not reach the other workers. "signed_cookies" keeps sessions
+# in the browser and never touches the database.
+SESSION_ENGINE = os.environ.get(
+    "SESSION_ENGINE",
+    "django.contrib.sessions.backends.cached_db"
+    if os.environ.get("REDIS_URL")
+    else "django.contrib.sessions.backends.db",
+)
+
+# Home page visits are buffered in the shared cache, when there is one, and
+# written to the session every TAXI_VISITS_FLUSH_EVERY visits or
+# TAXI_VISITS_FLUSH_SECONDS seconds
+TAXI_VISITS_BUFFERED = bool(os.environ.get("REDIS_URL"))
+TAXI_VISITS_FLUSH_EVERY = int(os.environ.get("TAXI_VISITS_FLUSH_EVERY", 10))
+TAXI_VISITS_FLUSH_SECONDS = int(os.environ.get("TAXI_VISITS_FLUSH_SECONDS", 300))
+
+# Rows per list page by model, unless the client asks for ?page_size=
+TAXI_PAGE_SIZES = {
+    "manufacturer": int(os.environ.get("TAXI_MANUFACTURER_PAGE_SIZE", 2)),
+    "car": int(os.environ.get("TAXI_CAR_PAGE_SIZE", 2)),
+    "driver": int(os.environ.get("TAXI_DRIVER_PAGE_SIZE", 2)),
+}
+
+# Largest ?page_size= a client may ask for
+TAXI_MAX_PAGE_SIZE = int(os.environ.get("TAXI_MAX_PAGE_SIZE", 100))
+
+# Seconds the cached home page totals live before being recounted
+TAXI_COUNTERS_TIMEOUT = int(os.environ.get("TAXI_COUNTERS_TIMEOUT", 300))
+
+# Seconds a rendered car/driver detail fragment is kept
+TAXI_FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("TAXI_FRAGMENT_CACHE_TIMEOUT", 600))
+
+# Seconds the fleet analytics report is served from the cache
+TAXI_ANALYTICS_TIMEOUT = int(os.environ.get("TAXI_ANALYTICS_TIMEOUT", 300))
+
+# Dispatch: drivers are indexed in cells of TAXI_DISPATCH_CELL_DEGREES,
+# pings are written every TAXI_DISPATCH_FLUSH_SIZE pings or
+# TAXI_DISPATCH_FLUSH_SECONDS seconds and each process reads the others'
+# every TAXI_DISPATCH_SYNC_SECONDS. Drivers silent for
+# TAXI_DISPATCH_STALE_SECONDS are no longer dispatched.
+TAXI_DISPATCH_CELL_DEGREES = float(os.environ.get("TAXI_DISPATCH_CELL_DEGREES", 0.01))
+TAXI_DISPATCH_FLUSH_SIZE = int(os.environ.get("TAXI_DISPATCH_FLUSH_SIZE", 500))
+TAXI_DISPATCH_FLUSH_SECONDS = float(os.environ.get("TAXI_DISPATCH_FLUSH_SECONDS", 2))
+TAXI_DISPATCH_SYNC_SECONDS = float(os.environ.get("TAXI_DISPATCH_SYNC_SECONDS", 2))
+TAXI_DISPATCH_STALE_SECONDS = int(os.environ.get("TAXI_DISPATCH_STALE_SECONDS", 120))
+
+# Default search radius of nearest driver queries, at most 100 km
+TAXI_DISPATCH_MAX_KM = float(os.environ.get("TAXI_DISPATCH_MAX_KM", 50))
+
+# Most driver/car pairs one bulk assignment request may change
+TAXI_ASSIGNMENT_MAX_CHANGES = int(os.environ.get("TAXI_ASSIGNMENT_MAX_CHANGES", 10000))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 